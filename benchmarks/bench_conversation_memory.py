@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+💭 CONVERSATION MEMORY BENCHMARK
+================================
+Simulates a 100-turn Aagya conversation through CommandProcessor.chat
+with a stub LLM and compares the prompt each turn sends:
+
+- current:  system prompt + question only (no context at all)
+- full:     system prompt + every earlier turn (the naive fix)
+- memory:   system prompt + ConversationMemory (recent turns + summary)
+
+Latency is modelled as time-to-first-token plus prefill per prompt token,
+so it tracks what the prompt size costs upstream. Summary calls made by
+the memory are counted in its totals.
+
+Usage: python benchmarks/bench_conversation_memory.py [--turns 100]
+"""
+
+import os
+import sys
+import json
+import random
+import logging
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# main.py validates API keys at import; the stub LLM doesn't need real ones
+os.environ.setdefault('GROQ_API_KEY', 'benchmark')
+os.environ.setdefault('ELEVENLABS_API_KEY', 'benchmark')
+
+import main  # noqa: E402
+from conversation_memory import ConversationMemory, estimate_tokens  # noqa: E402
+
+TOPICS = ['dharma', 'karma', 'the Ramayana', 'meditation', 'courage', 'Lanka',
+          'devotion', 'Sita', 'the Gita', 'yoga', 'fasting', 'seva']
+
+
+class StubLLM:
+    """Records every prompt; replies with plausible-length text"""
+
+    def __init__(self, first_token_ms: float, prefill_ms_per_1k: float):
+        self.first_token_ms = first_token_ms
+        self.prefill_ms_per_1k = prefill_ms_per_1k
+        self.calls = []  # (kind, prompt bytes, prompt tokens)
+        self.rng = random.Random(7)
+
+    def chat(self, user_text, system_prompt, temperature=0.7, history=None):
+        messages = main.LLMEngine.messages(user_text, system_prompt, history)
+        prompt = json.dumps(messages)
+        kind = 'summary' if system_prompt == main.SUMMARY_PROMPT else 'turn'
+        self.calls.append((kind, len(prompt.encode()), sum(estimate_tokens(m['content']) for m in messages)))
+        if kind == 'summary':
+            return f"User explored {', '.join(self.rng.sample(TOPICS, 3))}; answered with stories and advice."
+        words = [self.rng.choice(TOPICS + ['mitra', 'Ram', 'strength', 'humility', 'path']) for _ in range(60)]
+        return f"Mitra, by Ram's grace: {' '.join(words)}. Jai Shri Ram!"
+
+    def modelled_ms(self, tokens: int) -> float:
+        return self.first_token_ms + tokens * self.prefill_ms_per_1k / 1000
+
+
+def run(strategy: str, turns: int) -> None:
+    user_state = main.UserState(mode='aagya')
+    user_state.memory = ConversationMemory(
+        max_turns=main.CONFIG.MEMORY_TURNS,
+        token_budget=main.CONFIG.MEMORY_TOKEN_BUDGET,
+        summary_tokens=main.CONFIG.MEMORY_SUMMARY_TOKENS,
+        summarize_every=main.CONFIG.MEMORY_SUMMARIZE_EVERY,
+        summarize=main.summarize_turns  # inline, so the run is deterministic
+    )
+    full_history = []
+    rng = random.Random(42)
+
+    for _ in range(turns):
+        question = f"aagya, tell me more about {rng.choice(TOPICS)} and how it relates to {rng.choice(TOPICS)}"
+        if strategy == 'current':
+            main.LLMEngine.chat(question, main.HANUMAN_SYSTEM_PROMPT)
+        elif strategy == 'full':
+            reply = main.LLMEngine.chat(question, main.HANUMAN_SYSTEM_PROMPT, history=list(full_history))
+            full_history += [{'role': 'user', 'content': question}, {'role': 'assistant', 'content': reply}]
+        else:
+            main.CommandProcessor.chat(question, main.HANUMAN_SYSTEM_PROMPT, user_state)
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--turns', type=int, default=100)
+    parser.add_argument('--first-token-ms', type=float, default=250)
+    parser.add_argument('--prefill-ms-per-1k', type=float, default=60)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    checkpoints = [t for t in (1, 10, 25, 50, 100, args.turns) if t <= args.turns]
+    checkpoints = sorted(set(checkpoints))
+
+    print(f"{args.turns}-turn conversation, prompt bytes at turn n / modelled latency")
+    header = f"{'strategy':<9}" + ''.join(f"{'turn ' + str(t):>12}" for t in checkpoints)
+    print(header + f"{'total KB':>10}{'total s':>9}{'LLM calls':>11}")
+    print('-' * len(header + ' ' * 30))
+
+    for strategy in ('current', 'full', 'memory'):
+        llm = StubLLM(args.first_token_ms, args.prefill_ms_per_1k)
+        main.LLMEngine.chat = llm.chat
+        run(strategy, args.turns)
+
+        turn_calls = [c for c in llm.calls if c[0] == 'turn']
+        row = f"{strategy:<9}" + ''.join(f"{turn_calls[t - 1][1]:>12,}" for t in checkpoints)
+        total_kb = sum(c[1] for c in llm.calls) / 1024
+        total_s = sum(llm.modelled_ms(c[2]) for c in llm.calls) / 1000
+        print(row + f"{total_kb:>10,.0f}{total_s:>9.1f}{len(llm.calls):>11}")
+
+        if strategy == 'memory':
+            per_turn = [llm.modelled_ms(c[2]) for c in turn_calls]
+            print(f"\nmemory: turn latency {min(per_turn):.0f}-{max(per_turn):.0f} ms (flat after turn "
+                  f"{main.CONFIG.MEMORY_TURNS}), {len(llm.calls) - len(turn_calls)} summary calls "
+                  f"(off the reply path in the app)")
+
+
+if __name__ == '__main__':
+    main_()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+🎯 FUZZY MATCHER GOLDEN TEST + MICRO-BENCHMARK
+==============================================
+1. Golden check: runs every utterance in fuzzy_corpus.txt through the
+   compiled matcher and through a verbatim copy of the previous
+   per-call scan loops, and fails on any difference.
+   process() routing (detect_intent per mode) is checked the same way.
+2. Benchmark: times the checks CommandProcessor.process used to make for
+   one utterance (exit, help, wake word, mode, move) with both, and the
+   single detect_intent pass it makes now.
+
+Usage: python benchmarks/bench_fuzzy_matcher.py [--rounds 20]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# main.py validates API keys at import; the matcher doesn't need real ones
+os.environ.setdefault('GROQ_API_KEY', 'benchmark')
+os.environ.setdefault('ELEVENLABS_API_KEY', 'benchmark')
+
+from fuzzywuzzy import fuzz  # noqa: E402
+
+import main  # noqa: E402
+import fuzzy_matcher  # noqa: E402
+
+CORPUS = ROOT / 'benchmarks' / 'fuzzy_corpus.txt'
+
+
+# ============================================================================
+# REFERENCE: the scan loops as they were before compilation
+# ============================================================================
+
+class LegacyMain:
+    """main.py's FuzzyCommandMatcher / WakeWordDetector, one scan per call"""
+
+    TABLE = main.FuzzyCommandMatcher.COMMAND_VARIATIONS
+
+    @staticmethod
+    def match_command(text, command_type):
+        text_lower = text.lower().strip()
+        if command_type not in LegacyMain.TABLE:
+            return None, 0
+        variations = LegacyMain.TABLE[command_type]
+        all_variations = variations['primary'] + variations['fuzzy']
+        for variant in variations['primary']:
+            if variant in text_lower:
+                return command_type, 100
+        best_score = 0
+        for variant in all_variations:
+            score = fuzz.partial_ratio(variant, text_lower)
+            if score > best_score:
+                best_score = score
+        if best_score >= 70:
+            return command_type, best_score
+        return None, 0
+
+    @staticmethod
+    def _best(text, commands, threshold):
+        best, best_score = None, 0
+        for command in commands:
+            matched, score = LegacyMain.match_command(text, command)
+            if score > best_score:
+                best, best_score = matched, score
+        return (best, best_score) if best_score >= threshold else (None, 0)
+
+    @staticmethod
+    def detect_all_modes(text):
+        return LegacyMain._best(text, ['aagya', 'hasya', 'yudha', 'gandharva', 'khoj'], 70)
+
+    @staticmethod
+    def detect_move(text):
+        return LegacyMain._best(text, ['rock', 'paper', 'scissors'], 75)
+
+    @staticmethod
+    def is_exit_command(text):
+        matched, score = LegacyMain.match_command(text, 'exit')
+        return matched == 'exit' and score >= 70
+
+    @staticmethod
+    def is_help_command(text):
+        matched, score = LegacyMain.match_command(text, 'help')
+        return matched == 'help' and score >= 70
+
+    @staticmethod
+    def wake(text):
+        text_lower = text.lower().strip()
+        for wake_word in main.WAKE_WORDS_PRIMARY:
+            if wake_word in text_lower:
+                return True, 100
+        best_score = 0
+        for wake_word in main.WAKE_WORDS_PRIMARY + main.WAKE_WORDS_FUZZY:
+            ratio = fuzz.ratio(wake_word, text_lower)
+            if ratio > best_score:
+                best_score = ratio
+        if best_score >= 75:
+            return True, best_score
+        if any(w in text_lower for w in ['hanuman', 'anuman', 'human']):
+            return True, 85
+        return False, best_score
+
+
+def legacy_route(text, mode):
+    """The questions process() asked one by one before detect_intent, in its order"""
+    if LegacyMain.is_exit_command(text):
+        return 'exit'
+    if LegacyMain.is_help_command(text):
+        return 'help'
+    if mode == 'idle':
+        return 'wake' if LegacyMain.wake(text)[0] else None
+    if mode == 'active':
+        return LegacyMain.detect_all_modes(text)[0]
+    if mode == 'yudha':
+        return LegacyMain.detect_move(text)[0]
+    return None
+
+
+def legacy_module_detect(text, table, threshold):
+    """fuzzy_matcher.py's detect_* loops: exact pass first, then fuzzy"""
+    text_lower = text.lower().strip()
+    for name, variations in table.items():
+        for primary in variations['primary']:
+            if primary in text_lower:
+                return name, 100
+    best_match, best_score = None, 0
+    for name, variations in table.items():
+        for variant in variations['primary'] + variations['fuzzy']:
+            score = fuzz.partial_ratio(variant, text_lower)
+            if score > best_score:
+                best_score, best_match = score, name
+    if best_score >= threshold:
+        return best_match, best_score
+    return None, 0
+
+
+# ============================================================================
+# GOLDEN CHECK
+# ============================================================================
+
+def load_corpus():
+    lines = CORPUS.read_text(encoding='utf-8').splitlines()
+    return [line for line in lines if line.strip() and not line.startswith('#')]
+
+
+def golden_check(corpus):
+    new_main = main.FuzzyCommandMatcher
+    new_module = fuzzy_matcher.FuzzyCommandMatcher
+    module_checks = [
+        ('detect_wake_word', new_module.WAKE_WORDS, new_module.THRESHOLD_WAKE_WORD),
+        ('detect_mode', new_module.COMMAND_VARIATIONS, new_module.THRESHOLD_COMMAND),
+        ('detect_move', new_module.GAME_MOVES, new_module.THRESHOLD_MOVE),
+        ('detect_action', new_module.ACTIONS, new_module.THRESHOLD_ACTION),
+    ]
+
+    mismatches = []
+    for text in corpus:
+        pairs = [
+            ('wake', LegacyMain.wake(text), main.WakeWordDetector.detect(text)),
+            ('detect_all_modes', LegacyMain.detect_all_modes(text), new_main.detect_all_modes(text)),
+            ('detect_move', LegacyMain.detect_move(text), new_main.detect_move(text)),
+            ('is_exit_command', LegacyMain.is_exit_command(text), new_main.is_exit_command(text)),
+            ('is_help_command', LegacyMain.is_help_command(text), new_main.is_help_command(text)),
+        ]
+        for mode in ('idle', 'active', 'yudha', 'aagya'):
+            pairs.append((f'detect_intent[{mode}]', legacy_route(text, mode),
+                          new_main.detect_intent(text, mode)[0]))
+        for command in LegacyMain.TABLE:
+            pairs.append((f'match_command[{command}]', LegacyMain.match_command(text, command),
+                          new_main.match_command(text, command)))
+        for name, table, threshold in module_checks:
+            pairs.append((f'fuzzy_matcher.{name}', legacy_module_detect(text, table, threshold),
+                          getattr(new_module, name)(text)))
+
+        for name, expected, actual in pairs:
+            if expected != actual:
+                mismatches.append((text, name, expected, actual))
+
+    return mismatches
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def legacy_turn(text):
+    LegacyMain.is_exit_command(text)
+    LegacyMain.is_help_command(text)
+    LegacyMain.wake(text)
+    LegacyMain.detect_all_modes(text)
+    LegacyMain.detect_move(text)
+
+
+def compiled_turn(text):
+    main.FuzzyCommandMatcher.is_exit_command(text)
+    main.FuzzyCommandMatcher.is_help_command(text)
+    main.WakeWordDetector.detect(text)
+    main.FuzzyCommandMatcher.detect_all_modes(text)
+    main.FuzzyCommandMatcher.detect_move(text)
+
+
+def routed_turn(text):
+    for mode in ('idle', 'active', 'yudha'):
+        main.FuzzyCommandMatcher.detect_intent(text, mode)
+
+
+def legacy_routed_turn(text):
+    for mode in ('idle', 'active', 'yudha'):
+        legacy_route(text, mode)
+
+
+def timed(fn, corpus, rounds, before_round=None):
+    best = float('inf')
+    for _ in range(rounds):
+        if before_round:
+            before_round()
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e6  # µs per utterance
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    corpus = load_corpus()
+
+    mismatches = golden_check(corpus)
+    if mismatches:
+        for text, name, expected, actual in mismatches:
+            print(f"MISMATCH {name!s:<32} {text!r}: expected {expected}, got {actual}")
+        sys.exit(1)
+    print(f"✅ Golden corpus: {len(corpus)} utterances, compiled matcher identical to legacy scans")
+
+    clear = main.COMMAND_MATCHER.analyze.cache_clear
+    legacy = timed(legacy_turn, corpus, args.rounds)
+    cold = timed(compiled_turn, corpus, args.rounds, before_round=clear)
+    warm = timed(compiled_turn, corpus, args.rounds)
+
+    print(f"{'per utterance (exit+help+wake+mode+move)':<44}")
+    print(f"  legacy scans        {legacy:9.1f} µs")
+    print(f"  compiled (cold)     {cold:9.1f} µs   {legacy / cold:5.1f}x")
+    print(f"  compiled (repeat)   {warm:9.1f} µs   {legacy / warm:5.1f}x")
+
+    legacy = timed(legacy_routed_turn, corpus, args.rounds)
+    cold = timed(routed_turn, corpus, args.rounds, before_round=clear)
+    print(f"{'process() routing (idle+active+yudha)':<44}")
+    print(f"  legacy scans        {legacy:9.1f} µs")
+    print(f"  detect_intent       {cold:9.1f} µs   {legacy / cold:5.1f}x")
+
+
+if __name__ == '__main__':
+    main_()
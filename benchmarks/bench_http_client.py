@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+🌐 OUTBOUND HTTP BENCHMARK
+==========================
+Runs the Groq chat + Tavily search calls of a Khoj turn against a local
+fake HTTPS server and compares:
+
+- legacy: a bare requests.post per call (new connection + TLS handshake
+  every time) and every model tried in order on every turn
+- pooled: main.py's HTTPClient (keep-alive sessions, circuit breaker)
+
+The fake Groq reports the first two models as decommissioned, like the
+real API does for mixtral-8x7b-32768. --handshake-ms adds a delay to each
+new connection to stand in for WAN round trips that a local socket
+doesn't have.
+
+Usage: python benchmarks/bench_http_client.py [--turns 20] [--handshake-ms 100]
+"""
+
+import os
+import sys
+import ssl
+import json
+import time
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# main.py validates API keys at import; the fake server doesn't check them
+os.environ.setdefault('GROQ_API_KEY', 'benchmark')
+os.environ.setdefault('ELEVENLABS_API_KEY', 'benchmark')
+os.environ.setdefault('TAVILY_API_KEY', 'benchmark')
+
+import main  # noqa: E402
+from http_client import HTTPClient, Upstream  # noqa: E402
+
+DEAD_MODELS = {'mixtral-8x7b-32768', 'llama2-70b-4096'}
+
+
+class FakeUpstream(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    disable_nagle_algorithm = True
+    server_ms = 30.0
+    handshake_ms = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        with FakeUpstream.lock:
+            FakeUpstream.connections += 1
+        time.sleep(self.handshake_ms / 1000)
+        super().setup()
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        time.sleep(self.server_ms / 1000)
+
+        if self.path.endswith('/chat/completions'):
+            if body.get('model') in DEAD_MODELS:
+                return self.reply(400, {'error': {'code': 'model_decommissioned',
+                                                  'message': 'The model has been decommissioned'}})
+            return self.reply(200, {'choices': [{'message': {'content': 'Jai Shri Ram, mitra!'}}]})
+
+        if self.path.endswith('/search'):
+            return self.reply(200, {'results': [
+                {'title': f'Result {i}', 'url': f'https://example.com/{i}'} for i in range(3)
+            ]})
+
+        self.reply(404, {'error': 'not found'})
+
+
+def start_server(tmp: Path):
+    cert, key = tmp / 'cert.pem', tmp / 'key.pem'
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-subj', '/CN=localhost', '-addext', 'subjectAltName=IP:127.0.0.1,DNS:localhost',
+         '-keyout', str(key), '-out', str(cert)],
+        check=True, capture_output=True
+    )
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeUpstream)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # Both requests.post and Session honour this bundle
+    os.environ['REQUESTS_CA_BUNDLE'] = str(cert)
+    return server, f'https://127.0.0.1:{server.server_port}'
+
+
+def legacy_turn(base_url: str) -> None:
+    """The call pattern before the shared client: one fresh connection per call"""
+    for model in main.LLMEngine.MODELS:
+        response = requests.post(
+            f'{base_url}/openai/v1/chat/completions',
+            headers={'Authorization': 'Bearer benchmark'},
+            json={'model': model, 'messages': [], 'max_tokens': 500},
+            timeout=15
+        )
+        if response.status_code == 200:
+            break
+    requests.post(f'{base_url}/search', json={'query': 'dharma'}, timeout=10).json()
+
+
+def pooled_turn() -> None:
+    main.LLMEngine.chat('what is dharma', 'system')
+    main.HTTP.post('tavily', '/search', breaker_key='tavily:search', json={'query': 'dharma'}).json()
+
+
+def measure(turn, turns: int):
+    FakeUpstream.connections = 0
+    latencies = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        turn()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies[len(latencies) // 2], sum(latencies) / turns, FakeUpstream.connections
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--turns', type=int, default=20)
+    parser.add_argument('--server-ms', type=float, default=30)
+    parser.add_argument('--handshake-ms', type=float, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    FakeUpstream.server_ms = args.server_ms
+    FakeUpstream.handshake_ms = args.handshake_ms
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server, base_url = start_server(Path(tmp))
+        main.HTTP = HTTPClient(
+            [Upstream('groq', f'{base_url}/openai/v1'), Upstream('tavily', base_url)],
+            main.HTTP.breaker
+        )
+
+        legacy = measure(lambda: legacy_turn(base_url), args.turns)
+        pooled = measure(pooled_turn, args.turns)
+        server.shutdown()
+
+    print(f"Khoj turn (LLM with 2 dead models + Tavily), {args.turns} turns, "
+          f"server {args.server_ms:.0f} ms, handshake +{args.handshake_ms:.0f} ms")
+    print(f"{'':<10} {'p50 ms':>8} {'mean ms':>8} {'connections':>12}")
+    for name, (p50, mean, connections) in (('legacy', legacy), ('pooled', pooled)):
+        print(f"{name:<10} {p50 * 1000:>8.1f} {mean * 1000:>8.1f} {connections:>12}")
+    print(f"saved per turn: {(legacy[1] - pooled[1]) * 1000:.1f} ms mean "
+          f"({legacy[1] / pooled[1]:.1f}x)")
+    print(f"breaker: {main.HTTP.breaker.stats()}")
+
+
+if __name__ == '__main__':
+    main_()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+⏱️ PIPELINE REPLAY BENCHMARK
+============================
+Replays a directory of recorded clips through /process_voice (Flask test
+client, one session) and reports p50/p95 per stage from the timings
+breakdown each response carries, plus which engines and models answered.
+
+Every upstream is a stub with a configurable latency, so runs are
+repeatable and need no keys:
+
+- STT: Groq Whisper / local / Google engines behind the real EngineRunner.
+  The transcript comes from a sidecar <clip>.txt; Groq drops a share of clips.
+- LLM + Tavily: fake transport under main.HTTP (first two models
+  decommissioned, like the real Groq API).
+- TTS: stub ElevenLabs client failing a share of attempts; YouTube search
+  is stubbed too.
+
+Without --clips a scripted conversation (wake, Aagya, Khoj, Yudha,
+Gandharva, Hasya, exit) is generated as synthetic clips.
+
+Usage: python benchmarks/bench_pipeline_replay.py [--clips DIR] [--rounds 2]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+AUDIO_SUFFIXES = ('.webm', '.wav', '.ogg', '.mp3', '.m4a')
+
+SCRIPT = [
+    "hmm",
+    "hey hanuman",
+    "aagya",
+    "who was ravana",
+    "why did ravana kidnap sita",
+    "who wrote the ramayana",
+    "go back",
+    "khoj",
+    "chandrayaan mission",
+    "weather in ayodhya",
+    "who won the cricket world cup",
+    "go back",
+    "yudha",
+    "rock",
+    "paper",
+    "scissors",
+    "gandharva",
+    "ram bhajan song",
+    "hanuman chalisa",
+    "go back",
+    "hasya",
+    "a joke about monkeys",
+    "one more joke",
+    "go back",
+    "diwali date this year",
+    "help",
+    "exit",
+]
+
+STAGES = ('save', 'stt', 'process', 'match', 'llm', 'tts', 'total')
+DEAD_MODELS = {'mixtral-8x7b-32768', 'llama2-70b-4096'}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, round(q * (len(values) - 1)))]
+
+
+def jittered(rng: random.Random, ms: float) -> None:
+    time.sleep(max(0.0, rng.gauss(ms, ms * 0.2)) / 1000)
+
+
+# ============================================================================
+# CLIPS
+# ============================================================================
+
+def load_clips(directory: Path):
+    """(name, audio bytes, transcript or None) for each clip, in name order"""
+    clips = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix.lower() not in AUDIO_SUFFIXES:
+            continue
+        sidecar = path.with_suffix('.txt')
+        transcript = sidecar.read_text().strip() if sidecar.exists() else None
+        clips.append((path.name, path.read_bytes(), transcript))
+    return clips
+
+
+def write_script(directory: Path, rng: random.Random) -> None:
+    """One ~1-4 s webm-sized clip per scripted line, with its transcript alongside"""
+    for i, line in enumerate(SCRIPT):
+        size = 16000 + len(line) * 1200 + rng.randrange(8000)
+        (directory / f'{i:02d}.webm').write_bytes(b'\x1aE\xdf\xa3' + rng.randbytes(size))
+        (directory / f'{i:02d}.txt').write_text(line + '\n')
+
+
+# ============================================================================
+# STUB UPSTREAMS
+# ============================================================================
+
+class StubSTT:
+    """Engines that 'recognise' a clip by the hash of its bytes"""
+
+    def __init__(self, transcripts, args, rng):
+        self.transcripts = transcripts
+        self.args = args
+        self.rng = rng
+
+    def lookup(self, audio_path: str):
+        return self.transcripts.get(hashlib.sha256(Path(audio_path).read_bytes()).hexdigest())
+
+    def groq_whisper(self, audio_path: str):
+        jittered(self.rng, self.args.stt_ms)
+        return None if self.rng.random() < self.args.stt_fail_rate else self.lookup(audio_path)
+
+    def local_whisper(self, audio_path: str):
+        jittered(self.rng, self.args.stt_ms * 3)
+        return self.lookup(audio_path)
+
+    def google(self, audio_path: str):
+        jittered(self.rng, self.args.stt_ms * 2)
+        return self.lookup(audio_path)
+
+
+class FakeSession:
+    """Stands in for the requests.Session main.HTTP keeps per upstream"""
+
+    def __init__(self, server_ms: float, rng: random.Random):
+        self.server_ms = server_ms
+        self.rng = rng
+
+    def request(self, method, url, json=None, **kwargs):
+        jittered(self.rng, self.server_ms)
+        if url.endswith('/chat/completions'):
+            if json['model'] in DEAD_MODELS:
+                return self.response(400, {'error': {'code': 'model_decommissioned',
+                                                     'message': 'The model has been decommissioned'}})
+            return self.response(200, {'choices': [{'message': {'content': 'Jai Shri Ram, mitra! ' * 8}}]})
+        if url.endswith('/search'):
+            return self.response(200, {'results': [
+                {'title': f"{json['query']} {i}", 'url': f'https://example.com/{i}'} for i in range(3)
+            ]})
+        return self.response(404, {'error': 'not found'})
+
+    @staticmethod
+    def response(status, body):
+        response = requests.Response()
+        response.status_code = status
+        response._content = json.dumps(body).encode()
+        response.headers['Content-Type'] = 'application/json'
+        return response
+
+    def close(self):
+        pass
+
+
+class StubElevenLabs:
+    """text_to_speech.convert() with per-character latency and random failures"""
+
+    def __init__(self, args, rng):
+        self.text_to_speech = self
+        self.args = args
+        self.rng = rng
+
+    def convert(self, text, voice_id, model_id):
+        jittered(self.rng, self.args.tts_ms + len(text) * 0.5)
+        if self.rng.random() < self.args.tts_fail_rate:
+            raise ConnectionError('stub ElevenLabs: 503')
+        yield b'\xff\xf3' * (len(text) * 100 + 500)
+
+
+def stub_youtube(rng, latency_ms):
+    class StubYoutubeSearch:
+        def __init__(self, query, max_results=1):
+            self.query = query
+
+        def to_dict(self):
+            jittered(rng, latency_ms)
+            return [{'title': f'{self.query} (bhajan)', 'url_suffix': '/watch?v=stub', 'thumbnails': []}]
+    return StubYoutubeSearch
+
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clips', type=Path, help='directory of clips with <clip>.txt transcripts')
+    parser.add_argument('--rounds', type=int, default=2, help='replay the clips this many times')
+    parser.add_argument('--stt-ms', type=float, default=300)
+    parser.add_argument('--stt-fail-rate', type=float, default=0.1)
+    parser.add_argument('--server-ms', type=float, default=120, help='Groq chat / Tavily latency')
+    parser.add_argument('--tts-ms', type=float, default=250)
+    parser.add_argument('--tts-fail-rate', type=float, default=0.05)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        if args.clips:
+            clips = load_clips(args.clips)
+        else:
+            (tmp / 'clips').mkdir()
+            write_script(tmp / 'clips', rng)
+            clips = load_clips(tmp / 'clips')
+        if not clips:
+            sys.exit(f"No clips ({', '.join(AUDIO_SUFFIXES)}) in {args.clips}")
+
+        # Keep uploads and caches out of the checkout, stubs need no keys
+        os.chdir(tmp)
+        os.environ.update({
+            'TTS_CACHE_DIR': str(tmp / 'tts'),
+            'RESULT_CACHE_PATH': str(tmp / 'results.sqlite3'),
+            'TTS_PRERENDER': 'none',
+            'STT_LOCAL_BACKEND': 'none',
+            'STT_LOAD': 'lazy',
+        })
+        for key in ('GROQ_API_KEY', 'ELEVENLABS_API_KEY', 'TAVILY_API_KEY'):
+            os.environ.setdefault(key, 'benchmark')
+        logging.disable(logging.CRITICAL)
+
+        import main
+        from engine_runner import Engine, EngineRunner
+
+        transcripts = {hashlib.sha256(data).hexdigest(): text for _, data, text in clips if text}
+        stt = StubSTT(transcripts, args, rng)
+        main.stt_engine.runner = EngineRunner(
+            [Engine(name, main.timed_engine('stt', name, fn)) for name, fn in (
+                ('groq_whisper', stt.groq_whisper),
+                ('local_whisper', stt.local_whisper),
+                ('google', stt.google)
+            )],
+            main.STT_POOL,
+            strategy=main.CONFIG.STT_STRATEGY,
+            hedge_delay=main.CONFIG.STT_HEDGE_DELAY_MS / 1000,
+            engine_timeout=main.CONFIG.STT_ENGINE_TIMEOUT,
+            request_timeout=main.CONFIG.STT_REQUEST_TIMEOUT
+        )
+        for name in ('groq', 'tavily'):
+            main.HTTP._sessions[name] = FakeSession(args.server_ms, rng)
+        main.tts_engine.client = StubElevenLabs(args, rng)
+        main.HAS_YOUTUBE = True
+        main.YoutubeSearch = stub_youtube(rng, args.server_ms * 4)
+
+        client = main.app.test_client()
+        rows = []
+        wall = time.perf_counter()
+        for _ in range(args.rounds):
+            for name, data, _ in clips:
+                response = client.post(
+                    '/process_voice?timings=1',
+                    data={'audio': (io.BytesIO(data), name)},
+                    content_type='multipart/form-data'
+                )
+                rows.append(response.get_json()['timings'])
+        wall = time.perf_counter() - wall
+        metrics = client.get('/metrics').get_data(as_text=True)
+
+    print(f"{len(rows)} requests ({len(clips)} clips x {args.rounds} rounds) in {wall:.1f}s, "
+          f"STT strategy {main.CONFIG.STT_STRATEGY}")
+    print(f"{'stage':<8} {'n':>4} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for name in STAGES:
+        values = [row[f'{name}_ms'] for row in rows if f'{name}_ms' in row]
+        if values:
+            print(f"{name:<8} {len(values):>4} {percentile(values, 0.5):>8.1f} "
+                  f"{percentile(values, 0.95):>8.1f} {max(values):>8.1f}")
+
+    def tally(key):
+        counts = {}
+        for row in rows:
+            if key in row:
+                counts[row[key]] = counts.get(row[key], 0) + 1
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+    print(f"\nSTT answered by: {tally('stt_engine')}")
+    print(f"LLM answered by: {tally('llm_model')}, failures before it: {tally('llm_failures')}")
+    retried = [row for row in rows if row.get('tts_attempts', 0) > 1]
+    print(f"TTS renders: {sum(1 for row in rows if 'tts_attempts' in row)}, "
+          f"retried: {len(retried)}, backoff slept: {sum(row.get('tts_backoff_ms', 0) for row in rows)} ms")
+    print(f"/metrics: {len(metrics.splitlines())} lines, "
+          f"{sum(line.startswith('hanuman_engine_seconds_count') for line in metrics.splitlines())} engine series")
+
+
+if __name__ == '__main__':
+    main_()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+🗂️ SESSION STORE LOAD BENCHMARK
+===============================
+Simulates many browsers hitting /process_voice at once and compares
+throughput of the sharded SessionStore against a single global lock.
+
+Each simulated turn holds its session for a short sleep, standing in for
+the LLM/Tavily round-trip that happens while state is locked.
+
+Usage: python benchmarks/bench_sessions.py [--requests 400] [--work-ms 5]
+"""
+
+import sys
+import time
+import argparse
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from session_store import SessionStore  # noqa: E402
+
+
+class FakeState:
+    def __init__(self):
+        self.turns = 0
+
+
+def run_sharded(concurrency: int, total: int, work: float) -> float:
+    store = SessionStore(FakeState, max_sessions=max(concurrency, 1) * 2)
+    session_ids = [SessionStore.new_session_id() for _ in range(concurrency)]
+
+    def turn(i: int):
+        with store.session(session_ids[i % concurrency]) as (_, state):
+            time.sleep(work)
+            state.turns += 1
+
+    return _timed(concurrency, total, turn)
+
+
+def run_global_lock(concurrency: int, total: int, work: float) -> float:
+    lock = threading.Lock()
+    states = [FakeState() for _ in range(concurrency)]
+
+    def turn(i: int):
+        with lock:
+            time.sleep(work)
+            states[i % concurrency].turns += 1
+
+    return _timed(concurrency, total, turn)
+
+
+def _timed(concurrency: int, total: int, fn) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(fn, range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--work-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    work = args.work_ms / 1000
+    print(f"{'sessions':>8} | {'global lock req/s':>17} | {'sharded req/s':>13} | speedup")
+    print('-' * 56)
+    for concurrency in (1, 2, 4, 8, 16, 32):
+        baseline = run_global_lock(concurrency, args.requests, work)
+        sharded = run_sharded(concurrency, args.requests, work)
+        print(f"{concurrency:>8} | {baseline:>17.1f} | {sharded:>13.1f} | {sharded / baseline:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+🌊 TIME-TO-FIRST-AUDIO BENCHMARK
+================================
+Compares the batch /process_voice path with the streaming pipeline using
+stubbed engines whose latencies mimic the real upstreams:
+
+- upload:  the whole clip is POSTed after recording (batch only; the
+           streaming turn uploaded it while the user was speaking)
+- STT:     fixed decode time for the whole clip. Both paths run the same
+           engine chain on it; --stream-stt-ms models anything else
+- LLM:     time-to-first-token, then a steady token rate
+- TTS:     fixed request overhead plus time per character
+
+Time is measured from the moment the user stops speaking.
+
+Usage: python benchmarks/bench_streaming.py [--turns 5]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from streaming import run_pipeline  # noqa: E402
+
+REPLY = (
+    "Mitra, by Ram's grace, here is your answer. Dharma is the duty that holds "
+    "the world together, like the bridge to Lanka held by faith. When you act "
+    "with devotion and without ego, every task becomes seva. Remember, strength "
+    "without humility is like a mountain without roots. Jai Shri Ram!"
+)
+
+
+class StubEngines:
+    def __init__(self, upload: float, stt: float, first_token: float,
+                 tokens_per_s: float, tts_base: float, tts_per_char: float):
+        self.upload = upload
+        self.stt = stt
+        self.first_token = first_token
+        self.token_gap = 1 / tokens_per_s
+        self.tts_base = tts_base
+        self.tts_per_char = tts_per_char
+
+    def transcribe(self) -> str:
+        time.sleep(self.stt)
+        return "aagya what is dharma"
+
+    def chat(self) -> str:
+        return ''.join(self.chat_stream())
+
+    def chat_stream(self):
+        time.sleep(self.first_token)
+        for word in REPLY.split(' '):
+            time.sleep(self.token_gap)
+            yield word + ' '
+
+    def synthesize(self, text: str) -> str:
+        time.sleep(self.tts_base + self.tts_per_char * len(text))
+        return f'/audio/{abs(hash(text))}.mp3'
+
+
+def batch_ttfa(engines: StubEngines) -> float:
+    start = time.perf_counter()
+    time.sleep(engines.upload)
+    engines.transcribe()
+    reply = engines.chat()
+    engines.synthesize(reply)
+    return time.perf_counter() - start
+
+
+def streaming_ttfa(engines: StubEngines, pool: ThreadPoolExecutor, stt: float) -> float:
+    start = time.perf_counter()
+    # Chunks were uploaded during recording; the whole clip is then decoded
+    transcribe = lambda: (time.sleep(stt), "aagya what is dharma")[1]
+    for event in run_pipeline(transcribe, lambda _: engines.chat_stream(),
+                              engines.synthesize, pool):
+        if event['type'] == 'audio':
+            return time.perf_counter() - start
+    raise RuntimeError("pipeline produced no audio")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--turns', type=int, default=5)
+    parser.add_argument('--upload-ms', type=float, default=250)
+    parser.add_argument('--stt-ms', type=float, default=600)
+    parser.add_argument('--stream-stt-ms', type=float, default=None,
+                        help='final decode in the streaming turn (default: same as --stt-ms)')
+    parser.add_argument('--first-token-ms', type=float, default=300)
+    parser.add_argument('--tokens-per-s', type=float, default=120)
+    parser.add_argument('--tts-base-ms', type=float, default=250)
+    parser.add_argument('--tts-per-char-ms', type=float, default=4)
+    args = parser.parse_args()
+
+    engines = StubEngines(
+        args.upload_ms / 1000, args.stt_ms / 1000, args.first_token_ms / 1000,
+        args.tokens_per_s, args.tts_base_ms / 1000, args.tts_per_char_ms / 1000
+    )
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        batch = sorted(batch_ttfa(engines) for _ in range(args.turns))
+        stream_stt = (args.stt_ms if args.stream_stt_ms is None else args.stream_stt_ms) / 1000
+        stream = sorted(streaming_ttfa(engines, pool, stream_stt) for _ in range(args.turns))
+
+    median = lambda xs: xs[len(xs) // 2]
+    print(f"Time to first audio over {args.turns} turns (median):")
+    print(f"  batch      {median(batch) * 1000:8.0f} ms")
+    print(f"  streaming  {median(stream) * 1000:8.0f} ms")
+    print(f"  speedup    {median(batch) / median(stream):8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+🧠 STT MODEL STARTUP / MEMORY BENCHMARK
+=======================================
+Loads each local STT configuration in a fresh subprocess and reports the
+time to a usable model and the peak resident memory of that process.
+
+"legacy" reproduces the old startup: OpenAI Whisper base and
+faster-whisper base both loaded eagerly.
+
+Usage: python benchmarks/bench_stt_models.py [--sizes tiny,base]
+"""
+
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = r'''
+import sys, json, time, resource
+sys.path.insert(0, {root!r})
+started = time.monotonic()
+from stt_models import ModelRegistry
+configs = json.loads({configs!r})
+registries = [ModelRegistry(**cfg) for cfg in configs]
+ok = all(r.backend == 'none' or r.get() is not None for r in registries)
+elapsed = time.monotonic() - started
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == 'darwin':
+    rss_kb //= 1024
+print(json.dumps({{'ok': ok, 'seconds': elapsed, 'rss_mb': rss_kb / 1024}}))
+'''
+
+
+def measure(configs):
+    code = CHILD.format(root=str(ROOT), configs=json.dumps(configs))
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    if out.returncode != 0:
+        return {'ok': False, 'error': out.stderr.strip().splitlines()[-1:]}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='tiny,base')
+    parser.add_argument('--threads', type=int, default=0)
+    args = parser.parse_args()
+
+    runs = {'none (remote only)': [{'backend': 'none'}]}
+    for size in args.sizes.split(','):
+        for compute_type in ('int8', 'float32'):
+            runs[f'faster-whisper {size} {compute_type}'] = [{
+                'backend': 'faster-whisper', 'size': size,
+                'compute_type': compute_type, 'cpu_threads': args.threads
+            }]
+        runs[f'whisper {size}'] = [{'backend': 'whisper', 'size': size}]
+    runs['legacy (whisper base + faster-whisper base)'] = [
+        {'backend': 'whisper', 'size': 'base'},
+        {'backend': 'faster-whisper', 'size': 'base', 'compute_type': 'default'}
+    ]
+
+    print(f"{'configuration':<44} | {'load s':>7} | {'peak RSS MB':>11}")
+    print('-' * 70)
+    for name, configs in runs.items():
+        result = measure(configs)
+        if not result.get('ok'):
+            print(f"{name:<44} | {'n/a':>7} | {'n/a':>11}  {result.get('error', 'backend not installed')}")
+            continue
+        print(f"{name:<44} | {result['seconds']:>7.2f} | {result['rss_mb']:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
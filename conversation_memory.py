@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+💭 CONVERSATION MEMORY
+======================
+What the LLM gets to see of a session's earlier turns:
+
+- The last few turns verbatim, from a ring buffer.
+- Everything older folded into one running summary. The summary is
+  cached and only recomputed after a batch of turns has rolled off, and
+  that runs on a worker thread, off the reply path.
+- Turns that left the ring but aren't in the summary yet (waiting for a
+  batch, or being folded right now) are still sent verbatim, so nothing
+  drops out of the prompt between the two.
+- All of it trimmed to a token budget, newest first, so the prompt stops
+  growing however long the session gets.
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (previous summary, turns rolled off since) -> new summary, or None on failure
+Summarizer = Callable[[str, List[Tuple[str, str]]], Optional[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English/Hinglish)"""
+    return len(text) // 4 + 1
+
+
+def clip_tokens(text: str, tokens: int) -> str:
+    """Keep the last ~tokens worth of text, cut at a word boundary"""
+    limit = tokens * 4
+    if len(text) <= limit:
+        return text
+    clipped = text[-limit:]
+    return '…' + clipped[clipped.find(' ') + 1:]
+
+
+def extractive_summary(summary: str, turns: List[Tuple[str, str]]) -> str:
+    """Fallback summary without an LLM: the user's questions, oldest first"""
+    asked = '; '.join(user for user, _ in turns)
+    return f"{summary} Then asked: {asked}." if summary else f"Earlier the user asked: {asked}."
+
+
+class ConversationMemory:
+    """Ring buffer of recent (user, reply) turns plus a rolling summary"""
+
+    def __init__(self, max_turns: int = 8, token_budget: int = 1000,
+                 summary_tokens: int = 200, summarize_every: int = 4,
+                 summarize: Optional[Summarizer] = None,
+                 executor: Optional[Executor] = None):
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.summarize_every = summarize_every
+        self.summarize = summarize
+        self.executor = executor
+
+        self._lock = threading.Lock()
+        self.recent: Deque[Tuple[str, str]] = deque()
+        self.summary = ''
+        self._rolled: List[Tuple[str, str]] = []  # off the ring, not yet in the summary
+        self._folding_turns: List[Tuple[str, str]] = []  # batch the running fold will cover
+        self._folding = False
+        self._generation = 0  # bumped by clear() so late summaries are dropped
+
+    def __len__(self) -> int:
+        return len(self.recent)
+
+    def add_turn(self, user: str, reply: str) -> None:
+        with self._lock:
+            self.recent.append((user, reply))
+            while len(self.recent) > self.max_turns:
+                self._rolled.append(self.recent.popleft())
+            fold = len(self._rolled) >= self.summarize_every and not self._folding
+            if fold:
+                self._folding = True
+                turns, self._rolled = self._rolled, []
+                self._folding_turns = turns
+                summary, generation = self.summary, self._generation
+
+        if fold:
+            if self.executor:
+                self.executor.submit(self._fold, summary, turns, generation)
+            else:
+                self._fold(summary, turns, generation)
+
+    def _fold(self, summary: str, turns: List[Tuple[str, str]], generation: int) -> None:
+        new_summary = None
+        if self.summarize:
+            try:
+                new_summary = self.summarize(summary, turns)
+            except Exception as e:
+                logger.warning(f"Conversation summary failed: {e}")
+        new_summary = clip_tokens(new_summary or extractive_summary(summary, turns), self.summary_tokens)
+
+        with self._lock:
+            # A fold from before clear() leaves the flag to whichever fold
+            # the cleared memory has started since
+            if generation == self._generation:
+                self._folding = False
+                self.summary = new_summary
+                self._folding_turns = []
+
+    def messages(self) -> List[Dict[str, str]]:
+        """Chat messages to put between the system prompt and the new question"""
+        with self._lock:
+            # Oldest first: the batch being folded, rolled-off turns, the ring
+            turns = self._folding_turns + self._rolled + list(self.recent)
+            summary = self.summary
+
+        messages: List[Dict[str, str]] = []
+        budget = self.token_budget
+        if summary:
+            note = f"Summary of the earlier conversation: {summary}"
+            budget -= estimate_tokens(note)
+            messages.append({'role': 'system', 'content': note})
+
+        # Newest turns first until the budget runs out
+        kept: List[Dict[str, str]] = []
+        for user, reply in reversed(turns):
+            cost = estimate_tokens(user) + estimate_tokens(reply)
+            if cost > budget:
+                break
+            budget -= cost
+            kept[:0] = [{'role': 'user', 'content': user}, {'role': 'assistant', 'content': reply}]
+        return messages + kept
+
+    def clear(self) -> None:
+        with self._lock:
+            self.recent.clear()
+            self._rolled = []
+            self._folding_turns = []
+            self.summary = ''
+            self._folding = False
+            self._generation += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'recent_turns': len(self.recent),
+                'summary_tokens': estimate_tokens(self.summary) if self.summary else 0
+            }
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+⚡ ENGINE RUNNER
+================
+Runs a list of interchangeable engines (e.g. STT backends) on a shared
+thread pool and returns the first usable answer.
+
+Strategies:
+- sequential: one engine at a time, next one only after the previous failed
+- hedged:     start the next engine if nothing has answered after hedge_delay
+- race:       start every engine at once, take the first answer
+
+Every engine has its own deadline, counted from when it actually starts
+running (not while it waits for a worker), and the whole call has a
+request deadline. Engines that miss their deadline keep running in the
+pool (threads can't be cancelled) but their answers are ignored.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import Executor, Future, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ('sequential', 'hedged', 'race')
+
+# How often to look again at engines still queued for a worker
+QUEUE_POLL = 0.05
+
+
+@dataclass
+class Engine:
+    """One interchangeable backend"""
+    name: str
+    fn: Callable[..., Any]
+    timeout: Optional[float] = None  # falls back to the runner's engine_timeout
+
+
+class EngineStats:
+    """Latency samples and outcome counters for one engine"""
+
+    def __init__(self, window: int = 500):
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=window)  # seconds, successful answers only
+        self.calls = 0
+        self.wins = 0
+        self.failures = 0
+        self.timeouts = 0
+
+    def record(self, latency: float, ok: bool) -> None:
+        with self.lock:
+            if ok:
+                self.latencies.append(latency)
+            else:
+                self.failures += 1
+
+    def bump(self, counter: str) -> None:
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def _percentile(samples: List[float], pct: float) -> Optional[float]:
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[idx]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            samples = list(self.latencies)
+            calls, wins = self.calls, self.wins
+            failures, timeouts = self.failures, self.timeouts
+
+        p50 = self._percentile(samples, 50)
+        p95 = self._percentile(samples, 95)
+        return {
+            'calls': calls,
+            'wins': wins,
+            'failures': failures,
+            'timeouts': timeouts,
+            'win_rate': round(wins / calls, 3) if calls else None,
+            'p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+            'p95_ms': round(p95 * 1000, 1) if p95 is not None else None
+        }
+
+
+class _Attempt:
+    """One submitted engine call; started is set once a worker picks it up"""
+
+    def __init__(self, engine: Engine, timeout: float):
+        self.engine = engine
+        self.timeout = timeout
+        self.started: Optional[float] = None
+
+    def deadline(self) -> float:
+        return self.started + self.timeout if self.started is not None else float('inf')
+
+
+class EngineRunner:
+    """Execute engines under a sequential / hedged / race strategy"""
+
+    def __init__(self, engines: List[Engine], executor: Executor,
+                 strategy: str = 'hedged', hedge_delay: float = 1.5,
+                 engine_timeout: float = 8.0, request_timeout: float = 12.0):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}', expected one of {STRATEGIES}")
+
+        self.engines = engines
+        self.executor = executor
+        self.strategy = strategy
+        self.hedge_delay = hedge_delay
+        self.engine_timeout = engine_timeout
+        self.request_timeout = request_timeout
+        self._stats = {engine.name: EngineStats() for engine in engines}
+
+    def _launch_gap(self) -> float:
+        """How long to wait on in-flight engines before starting another"""
+        if self.strategy == 'race':
+            return 0.0
+        if self.strategy == 'hedged':
+            return self.hedge_delay
+        return float('inf')
+
+    def _submit(self, attempt: _Attempt, args: tuple, kwargs: dict) -> Future:
+        engine = attempt.engine
+        stats = self._stats[engine.name]
+        stats.bump('calls')
+
+        def call():
+            attempt.started = started = time.monotonic()
+            try:
+                result = engine.fn(*args, **kwargs)
+            except Exception as e:
+                logger.warning(f"{engine.name} raised: {e}")
+                result = None
+            stats.record(time.monotonic() - started, bool(result))
+            return result
+
+        return self.executor.submit(call)
+
+    def run(self, *args, **kwargs) -> Tuple[Optional[str], Any]:
+        """
+        Run engines until one returns a truthy result
+        Returns: (winning_engine_name, result) or (None, None)
+        """
+        start = time.monotonic()
+        request_deadline = start + self.request_timeout
+        gap = self._launch_gap()
+
+        pending: Dict[Future, _Attempt] = {}
+        next_idx = 0
+        last_launch = start
+
+        while True:
+            now = time.monotonic()
+            if now >= request_deadline:
+                break
+
+            # Start more engines if the strategy allows it
+            while next_idx < len(self.engines) and (not pending or now - last_launch >= gap):
+                engine = self.engines[next_idx]
+                timeout = engine.timeout if engine.timeout is not None else self.engine_timeout
+                attempt = _Attempt(engine, timeout)
+                pending[self._submit(attempt, args, kwargs)] = attempt
+                if next_idx > 0:
+                    logger.info(f"⚡ Starting {engine.name} ({self.strategy})")
+                next_idx += 1
+                last_launch = now
+
+            # Give up on engines past their own deadline
+            for future, attempt in list(pending.items()):
+                if now >= attempt.deadline() and not future.done():
+                    logger.warning(f"⏱️  {attempt.engine.name} timed out")
+                    self._stats[attempt.engine.name].bump('timeouts')
+                    del pending[future]
+
+            if not pending:
+                if next_idx >= len(self.engines):
+                    break
+                continue
+
+            wake_at = min([request_deadline] + [attempt.deadline() for attempt in pending.values()])
+            if any(attempt.started is None for attempt in pending.values()):
+                # Its deadline starts once a worker picks it up
+                wake_at = min(wake_at, now + QUEUE_POLL)
+            if next_idx < len(self.engines):
+                wake_at = min(wake_at, last_launch + gap)
+
+            done, _ = wait(list(pending), timeout=max(0.0, wake_at - now),
+                           return_when=FIRST_COMPLETED)
+
+            for future in done:
+                engine = pending.pop(future).engine
+                result = future.result()
+                if result:
+                    self._stats[engine.name].bump('wins')
+                    return engine.name, result
+
+        for attempt in pending.values():
+            self._stats[attempt.engine.name].bump('timeouts')
+        logger.error(f"❌ No engine answered ({time.monotonic() - start:.1f}s)")
+        return None, None
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-engine latency and win rate, for tuning the hedge delay"""
+        return {
+            'strategy': self.strategy,
+            'hedge_delay_ms': int(self.hedge_delay * 1000),
+            'engines': {name: stats.snapshot() for name, stats in self._stats.items()}
+        }
@@ -7,12 +7,297 @@ Detects mishearings and variations with confidence scoring.
 """
 
 import logging
-from typing import Tuple, Optional, Dict
+from collections import Counter
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from fuzzywuzzy import fuzz
 
+# Optional C automaton; the pure-Python one below is used otherwise
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Score with python-Levenshtein directly when fuzzywuzzy itself is backed by it
+try:
+    from Levenshtein import matching_blocks, opcodes, ratio as levenshtein_ratio
+    HAS_LEVENSHTEIN = fuzz.SequenceMatcher.__name__ == 'StringMatcher'
+except ImportError:
+    HAS_LEVENSHTEIN = False
+
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# COMPILED MATCHER
+# ============================================================================
+
+def ratio(s1: str, s2: str) -> int:
+    """fuzz.ratio without the per-call decorator and matcher-object overhead"""
+    if not HAS_LEVENSHTEIN:
+        return fuzz.ratio(s1, s2)
+    if s1 == s2:
+        return 100
+    if not s1 or not s2:
+        return 0
+    return int(round(100 * levenshtein_ratio(s1, s2)))
+
+
+def partial_ratio(s1: str, s2: str) -> int:
+    """fuzz.partial_ratio, same block-aligned windows, scored straight through Levenshtein"""
+    if not HAS_LEVENSHTEIN:
+        return fuzz.partial_ratio(s1, s2)
+    if s1 == s2:
+        return 100
+    if not s1 or not s2:
+        return 0
+
+    shorter, longer = (s1, s2) if len(s1) <= len(s2) else (s2, s1)
+    best = 0.0
+    for short_start, long_start, _ in matching_blocks(opcodes(shorter, longer), shorter, longer):
+        start = max(long_start - short_start, 0)
+        r = levenshtein_ratio(shorter, longer[start:start + len(shorter)])
+        if r > .995:
+            return 100
+        best = max(best, r)
+    return int(round(100 * best))
+
+
+def partial_ratio_bound(short_len: int, common: int) -> int:
+    """
+    Upper bound on partial_ratio given how many characters the two strings
+    share (as multisets). Every window is scored 2 * matches / (short + window)
+    and matches can't exceed the shared characters or the window length.
+    """
+    common = min(common, short_len)
+    if common == short_len:
+        return 100
+    return int(round(200 * common / (short_len + common)))
+
+
+class SubstringAutomaton:
+    """Aho-Corasick automaton: finds every pattern occurring in a text in one pass"""
+
+    def __init__(self, patterns: Iterable[str]):
+        patterns = sorted(set(p for p in patterns if p))
+
+        if HAS_AHOCORASICK:
+            self._automaton = ahocorasick.Automaton()
+            for pattern in patterns:
+                self._automaton.add_word(pattern, pattern)
+            if patterns:
+                self._automaton.make_automaton()
+            else:
+                self._automaton = None
+            return
+
+        # goto transitions, failure links and outputs per state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[frozenset] = [frozenset()]
+        outputs: List[Set[str]] = [set()]
+
+        for pattern in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(pattern)
+
+        queue = list(self._goto[0].values())
+        while queue:
+            state = queue.pop(0)
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                outputs[nxt] |= outputs[self._fail[nxt]]
+
+        self._out = [frozenset(o) for o in outputs]
+
+    def find(self, text: str) -> Set[str]:
+        """All patterns that occur in text"""
+        if HAS_AHOCORASICK:
+            if self._automaton is None:
+                return set()
+            return {pattern for _, pattern in self._automaton.iter(text)}
+
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[str] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+
+class MatchResult:
+    """
+    One utterance analysed against every intent table.
+    Fuzzy scores are computed on demand and memoised per unique variant,
+    so overlapping tables (e.g. 'rock' in both yudha and rock) and
+    repeated questions (exit? help? which mode?) never score twice.
+    """
+
+    def __init__(self, matcher: 'CompiledMatcher', text: str):
+        self.matcher = matcher
+        self.text = text
+        self.found = matcher.automaton.find(text)
+        self._scores: Dict[Tuple[str, str], int] = {}
+        self._bounds: Dict[str, int] = {}
+        self._chars = None  # Counter(text).get, built on first bound
+
+    def contains(self, pattern: str) -> bool:
+        """Exact substring test answered from the automaton pass"""
+        return pattern in self.found
+
+    def exact(self, intent: str) -> Optional[str]:
+        """First primary variant of intent found verbatim in the text"""
+        for variant in self.matcher.primary[intent]:
+            if variant in self.found:
+                return variant
+        return None
+
+    def _bound(self, variant: str) -> int:
+        """Memoised partial_ratio_bound of variant against the text"""
+        bound = self._bounds.get(variant)
+        if bound is None:
+            if self._chars is None:
+                self._chars = Counter(self.text).get
+            letters, counts = self.matcher.chars[variant]
+            common = sum(map(min, counts, map(self._chars, letters, repeat(0))))
+            bound = self._bounds[variant] = partial_ratio_bound(
+                min(len(variant), len(self.text)), common)
+        return bound
+
+    def fuzzy(self, intent: str, floor: int = 0) -> Tuple[Optional[str], int]:
+        """
+        Best (variant, score) over all variants of intent.
+        floor: the caller only cares about scores >= floor; variants whose
+        upper bound falls short are skipped, so a result below floor may
+        be an underestimate.
+        """
+        scorer = self.matcher.scorers.get(intent, 'partial')
+        score_fn = ratio if scorer == 'ratio' else partial_ratio
+
+        best_variant, best_score = None, 0
+        for variant in self.matcher.variants[intent]:
+            key = (scorer, variant)
+            score = self._scores.get(key)
+            if score is None:
+                # Only worth it for partial_ratio; ratio is a single C call
+                if scorer == 'partial' and (floor or best_score):
+                    bound = self._bound(variant)
+                    if bound < floor or bound <= best_score:
+                        continue
+                score = self._scores[key] = score_fn(variant, self.text)
+            if score > best_score:
+                best_variant, best_score = variant, score
+                if score == 100:
+                    break
+        return best_variant, best_score
+
+    def score(self, intent: str, threshold: int) -> int:
+        """100 on an exact primary hit, else the fuzzy score if it clears threshold"""
+        if self.exact(intent):
+            return 100
+        _, score = self.fuzzy(intent, floor=threshold)
+        return score if score >= threshold else 0
+
+    def best(self, intents: Iterable[str], threshold: int,
+             final_threshold: Optional[int] = None,
+             exact_first: bool = False) -> Tuple[Optional[str], int]:
+        """
+        Best intent among intents; ties go to the earliest one.
+        exact_first: any exact primary hit beats every fuzzy score.
+        Returns (None, 0) unless the winner clears final_threshold.
+        """
+        intents = list(intents)
+        final_threshold = threshold if final_threshold is None else final_threshold
+
+        if exact_first:
+            for intent in intents:
+                if self.exact(intent):
+                    return (intent, 100) if 100 >= final_threshold else (None, 0)
+
+        best_intent, best_score = None, 0
+        for intent in intents:
+            if self.exact(intent):
+                score = 100
+            else:
+                # Only a strictly higher score can take over, so prune to that
+                _, score = self.fuzzy(intent, floor=max(threshold, best_score + 1))
+                score = score if score >= threshold else 0
+            if score > best_score:
+                best_intent, best_score = intent, score
+                if score == 100:
+                    break  # nothing later can beat it
+
+        if best_score >= final_threshold:
+            return best_intent, best_score
+        return None, 0
+
+    def best_intent(self, tiers: Iterable[Tuple]) -> Tuple[Optional[str], int]:
+        """
+        Best intent across several tables in priority order.
+        tiers: (intents, threshold[, final_threshold]) per table, each scored
+        as best() does; the first tier with a winner decides, so e.g. an exit
+        command beats a mode name in the same utterance. Every tier shares
+        this analysis and its memoised scores. (None, 0) if no tier matches.
+        """
+        for intents, *thresholds in tiers:
+            found, score = self.best(intents, *thresholds)
+            if found:
+                return found, score
+        return None, 0
+
+
+class CompiledMatcher:
+    """
+    Matcher compiled once from {intent: {'primary': [...], 'fuzzy': [...]}}.
+    One automaton covers every primary variant (plus extra keywords), and
+    analyses are cached per raw text.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, List[str]]],
+                 scorers: Optional[Dict[str, str]] = None,
+                 keywords: Iterable[str] = (), cache_size: int = 512):
+        self.order = list(tables)
+        self.primary = {intent: tuple(t['primary']) for intent, t in tables.items()}
+        self.variants = {
+            intent: tuple(dict.fromkeys(list(t['primary']) + list(t.get('fuzzy', []))))
+            for intent, t in tables.items()
+        }
+        self.scorers = scorers or {}
+        # (letters, counts) per variant for partial_ratio_bound
+        self.chars = {
+            variant: (tuple(Counter(variant)), tuple(Counter(variant).values()))
+            for variants in self.variants.values() for variant in variants
+        }
+
+        patterns = [v for primary in self.primary.values() for v in primary]
+        self.automaton = SubstringAutomaton(patterns + list(keywords))
+
+        self.analyze = lru_cache(maxsize=cache_size)(self._analyze)
+
+    def _analyze(self, text: str) -> MatchResult:
+        return MatchResult(self, text.lower().strip())
+
+
 class FuzzyCommandMatcher:
     """Fuzzy matching engine for all HANUMAN commands."""
 
@@ -100,145 +385,59 @@ class FuzzyCommandMatcher:
         }
     }
 
+    @staticmethod
+    def _detect(text: str, table: Dict, threshold: int, label: str, icon: str) -> Tuple[Optional[str], int]:
+        """Exact hits first, then the best fuzzy score across the table."""
+        match = FuzzyCommandMatcher.matcher().analyze(text)
+        found, score = match.best(table, threshold, exact_first=True)
+
+        if found:
+            kind = 'exact 100%' if score == 100 and match.exact(found) else f'fuzzy {score}%'
+            logger.info(f"{icon} {label} detected ({kind}): {found}")
+        return found, score
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def matcher() -> CompiledMatcher:
+        """Every table compiled into one matcher on first use (intent names are unique across tables)"""
+        return CompiledMatcher({
+            **FuzzyCommandMatcher.WAKE_WORDS,
+            **FuzzyCommandMatcher.COMMAND_VARIATIONS,
+            **FuzzyCommandMatcher.GAME_MOVES,
+            **FuzzyCommandMatcher.ACTIONS
+        })
+
     @staticmethod
     def detect_wake_word(text: str) -> Tuple[Optional[str], int]:
         """Detect wake word with fuzzy matching."""
-        text_lower = text.lower().strip()
-        
-        # Exact matches first
-        for wake_word, variations in FuzzyCommandMatcher.WAKE_WORDS.items():
-            for primary in variations['primary']:
-                if primary in text_lower:
-                    logger.info(f"✅ Wake word detected (exact 100%): {primary}")
-                    return wake_word, 100
-        
-        # Fuzzy matches
-        best_match = None
-        best_score = 0
-        
-        for wake_word, variations in FuzzyCommandMatcher.WAKE_WORDS.items():
-            for primary in variations['primary']:
-                score = fuzz.partial_ratio(primary, text_lower)
-                if score > best_score:
-                    best_score = score
-                    best_match = wake_word
-            
-            for fuzzy_var in variations['fuzzy']:
-                score = fuzz.partial_ratio(fuzzy_var, text_lower)
-                if score > best_score:
-                    best_score = score
-                    best_match = wake_word
-        
-        if best_score >= FuzzyCommandMatcher.THRESHOLD_WAKE_WORD:
-            logger.info(f"🎯 Wake word detected (fuzzy {best_score}%): {best_match}")
-            return best_match, best_score
-        
-        return None, 0
+        return FuzzyCommandMatcher._detect(
+            text, FuzzyCommandMatcher.WAKE_WORDS,
+            FuzzyCommandMatcher.THRESHOLD_WAKE_WORD, 'Wake word', '✅'
+        )
 
     @staticmethod
     def detect_mode(text: str) -> Tuple[Optional[str], int]:
         """Detect command mode with fuzzy matching."""
-        text_lower = text.lower().strip()
-        
-        # Exact matches first
-        for mode, variations in FuzzyCommandMatcher.COMMAND_VARIATIONS.items():
-            for primary in variations['primary']:
-                if primary in text_lower:
-                    logger.info(f"🎯 Mode detected (exact 100%): {mode}")
-                    return mode, 100
-        
-        # Fuzzy matches
-        best_match = None
-        best_score = 0
-        
-        for mode, variations in FuzzyCommandMatcher.COMMAND_VARIATIONS.items():
-            for primary in variations['primary']:
-                score = fuzz.partial_ratio(primary, text_lower)
-                if score > best_score:
-                    best_score = score
-                    best_match = mode
-            
-            for fuzzy_var in variations['fuzzy']:
-                score = fuzz.partial_ratio(fuzzy_var, text_lower)
-                if score > best_score:
-                    best_score = score
-                    best_match = mode
-        
-        if best_score >= FuzzyCommandMatcher.THRESHOLD_COMMAND:
-            logger.info(f"🎯 Mode detected (fuzzy {best_score}%): {best_match}")
-            return best_match, best_score
-        
-        return None, 0
+        return FuzzyCommandMatcher._detect(
+            text, FuzzyCommandMatcher.COMMAND_VARIATIONS,
+            FuzzyCommandMatcher.THRESHOLD_COMMAND, 'Mode', '🎯'
+        )
 
     @staticmethod
     def detect_move(text: str) -> Tuple[Optional[str], int]:
         """Detect game move with fuzzy matching."""
-        text_lower = text.lower().strip()
-        
-        # Exact matches first
-        for move, variations in FuzzyCommandMatcher.GAME_MOVES.items():
-            for primary in variations['primary']:
-                if primary in text_lower:
-                    logger.info(f"🎯 Game move detected (exact 100%): {move}")
-                    return move, 100
-        
-        # Fuzzy matches
-        best_match = None
-        best_score = 0
-        
-        for move, variations in FuzzyCommandMatcher.GAME_MOVES.items():
-            for primary in variations['primary']:
-                score = fuzz.partial_ratio(primary, text_lower)
-                if score > best_score:
-                    best_score = score
-                    best_match = move
-            
-            for fuzzy_var in variations['fuzzy']:
-                score = fuzz.partial_ratio(fuzzy_var, text_lower)
-                if score > best_score:
-                    best_score = score
-                    best_match = move
-        
-        if best_score >= FuzzyCommandMatcher.THRESHOLD_MOVE:
-            logger.info(f"🎯 Game move detected (fuzzy {best_score}%): {best_match}")
-            return best_match, best_score
-        
-        return None, 0
+        return FuzzyCommandMatcher._detect(
+            text, FuzzyCommandMatcher.GAME_MOVES,
+            FuzzyCommandMatcher.THRESHOLD_MOVE, 'Game move', '🎯'
+        )
 
     @staticmethod
     def detect_action(text: str) -> Tuple[Optional[str], int]:
         """Detect action commands (help/exit) with fuzzy matching."""
-        text_lower = text.lower().strip()
-        
-        # Exact matches first
-        for action, variations in FuzzyCommandMatcher.ACTIONS.items():
-            for primary in variations['primary']:
-                if primary in text_lower:
-                    logger.info(f"✅ Action detected (exact 100%): {action}")
-                    return action, 100
-        
-        # Fuzzy matches
-        best_match = None
-        best_score = 0
-        
-        for action, variations in FuzzyCommandMatcher.ACTIONS.items():
-            for primary in variations['primary']:
-                score = fuzz.partial_ratio(primary, text_lower)
-                if score > best_score:
-                    best_score = score
-                    best_match = action
-            
-            for fuzzy_var in variations['fuzzy']:
-                score = fuzz.partial_ratio(fuzzy_var, text_lower)
-                if score > best_score:
-                    best_score = score
-                    best_match = action
-        
-        if best_score >= FuzzyCommandMatcher.THRESHOLD_ACTION:
-            logger.info(f"✅ Action detected (fuzzy {best_score}%): {best_match}")
-            return best_match, best_score
-        
-        return None, 0
+        return FuzzyCommandMatcher._detect(
+            text, FuzzyCommandMatcher.ACTIONS,
+            FuzzyCommandMatcher.THRESHOLD_ACTION, 'Action', '✅'
+        )
 
     @staticmethod
     def get_summary() -> Dict:
@@ -255,3 +454,4 @@ class FuzzyCommandMatcher:
                 'action': FuzzyCommandMatcher.THRESHOLD_ACTION
             }
         }
+
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+🌐 OUTBOUND HTTP LAYER
+======================
+One place for every call HANUMAN makes to Groq and Tavily:
+
+- A pooled requests.Session per upstream host, so connections (and
+  their TLS handshakes) are reused across requests and threads.
+- A deadline per upstream: each call gets the time that is left, not a
+  fresh timeout per attempt.
+- A circuit breaker per endpoint/model: after repeated failures (or one
+  "this model no longer exists" answer) the key is skipped until a
+  cool-down has passed, then a single trial call decides whether it is
+  back.
+
+Callers run these calls on the shared engine pool when they need them
+concurrently; sessions are safe to share between those threads.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpen(Exception):
+    """The breaker for this key is open - don't call it right now"""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """No time left in the caller's budget for this upstream"""
+
+
+@dataclass
+class Upstream:
+    name: str
+    base_url: str
+    deadline: float = 15.0         # total seconds a caller may spend on this upstream
+    connect_timeout: float = 3.05
+    pool_size: int = 8
+
+
+class CircuitBreaker:
+    """
+    closed -> open after failure_threshold consecutive failures (or at once
+    for a dead key), open -> half-open after the cool-down, where one trial
+    call closes it again or re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 30.0,
+                 dead_cooldown: float = 600.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.dead_cooldown = dead_cooldown
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+        self._trial: Dict[str, bool] = {}
+        self.skipped = 0
+
+    def allow(self, key: str) -> bool:
+        with self._lock:
+            until = self._open_until.get(key)
+            if until is None:
+                return True
+            if self.clock() < until or self._trial.get(key):
+                self.skipped += 1
+                return False
+            self._trial[key] = True  # half-open: let exactly one call through
+            return True
+
+    def success(self, key: str) -> None:
+        with self._lock:
+            if key in self._open_until:
+                logger.info(f"🔌 Circuit closed: {key}")
+            self._failures.pop(key, None)
+            self._open_until.pop(key, None)
+            self._trial.pop(key, None)
+
+    def failure(self, key: str, dead: bool = False) -> None:
+        with self._lock:
+            failures = self._failures[key] = self._failures.get(key, 0) + 1
+            if dead or failures >= self.failure_threshold or self._trial.get(key):
+                cooldown = self.dead_cooldown if dead else self.cooldown
+                self._open_until[key] = self.clock() + cooldown
+                self._trial.pop(key, None)
+                logger.warning(f"🔌 Circuit open for {cooldown:.0f}s: {key}")
+
+    def release(self, key: str) -> None:
+        """End a half-open trial that got no verdict (the call never ran or blew up)"""
+        with self._lock:
+            self._trial.pop(key, None)
+
+    def state(self, key: str) -> str:
+        with self._lock:
+            until = self._open_until.get(key)
+            if until is None:
+                return 'closed'
+            return 'open' if self.clock() < until else 'half-open'
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            keys = list(self._open_until)
+            skipped = self.skipped
+        return {'open': {key: self.state(key) for key in keys}, 'skipped_calls': skipped}
+
+
+class _UpstreamStats:
+    def __init__(self, window: int = 200):
+        self.calls = 0
+        self.errors = 0
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        pick = lambda q: round(ordered[int(q * (len(ordered) - 1))] * 1000) if ordered else None
+        return {'calls': self.calls, 'errors': self.errors,
+                'p50_ms': pick(0.5), 'p95_ms': pick(0.95)}
+
+
+class HTTPClient:
+    """Pooled sessions, deadlines and circuit breaking for a fixed set of upstreams"""
+
+    def __init__(self, upstreams: Iterable[Upstream], breaker: Optional[CircuitBreaker] = None):
+        self.upstreams = {u.name: u for u in upstreams}
+        self.breaker = breaker or CircuitBreaker()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._stats = {name: _UpstreamStats() for name in self.upstreams}
+        self._lock = threading.Lock()
+
+        for upstream in self.upstreams.values():
+            session = requests.Session()
+            # Retries are the callers' business (model fallback, STT hedging)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=upstream.pool_size, max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._sessions[upstream.name] = session
+
+    def deadline(self, name: str) -> float:
+        """Absolute (monotonic) deadline for a call sequence starting now"""
+        return time.monotonic() + self.upstreams[name].deadline
+
+    def request(self, name: str, method: str, path: str, *,
+                breaker_key: Optional[str] = None,
+                deadline: Optional[float] = None,
+                dead_if: Optional[Callable[[requests.Response], bool]] = None,
+                **kwargs) -> requests.Response:
+        """
+        One call to upstream name. Raises CircuitOpen when breaker_key is
+        open, DeadlineExceeded when the deadline has passed, and whatever
+        requests raises on transport errors.
+        5xx, 429 and transport errors count against breaker_key, any
+        other answer resets it; a response matching dead_if opens it for
+        the long cool-down.
+        """
+        upstream = self.upstreams[name]
+        deadline = deadline or self.deadline(name)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"{name}: deadline passed")
+
+        if breaker_key and not self.breaker.allow(breaker_key):
+            raise CircuitOpen(breaker_key)
+        try:
+            return self._send(upstream, method, path, breaker_key, dead_if, remaining, **kwargs)
+        finally:
+            # No-op after success()/failure(); otherwise a half-open trial
+            # would stay taken and keep the key skipped for good
+            if breaker_key:
+                self.breaker.release(breaker_key)
+
+    def _send(self, upstream: Upstream, method: str, path: str, breaker_key: Optional[str],
+              dead_if: Optional[Callable[[requests.Response], bool]], remaining: float,
+              **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', (min(upstream.connect_timeout, remaining), remaining))
+
+        stats = self._stats[upstream.name]
+        started = time.monotonic()
+        try:
+            response = self._sessions[upstream.name].request(method, upstream.base_url + path, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                stats.calls += 1
+                stats.errors += 1
+            if breaker_key:
+                self.breaker.failure(breaker_key)
+            raise
+
+        failed = response.status_code >= 500 or response.status_code == 429
+        with self._lock:
+            stats.calls += 1
+            stats.errors += failed
+            stats.latencies.append(time.monotonic() - started)
+
+        if breaker_key:
+            if dead_if and dead_if(response):
+                self.breaker.failure(breaker_key, dead=True)
+            elif failed:
+                self.breaker.failure(breaker_key)
+            else:
+                self.breaker.success(breaker_key)  # a 4xx still means it's up
+        return response
+
+    def post(self, name: str, path: str, **kwargs) -> requests.Response:
+        return self.request(name, 'POST', path, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            upstreams = {name: s.snapshot() for name, s in self._stats.items()}
+        return {'upstreams': upstreams, 'breaker': self.breaker.stats()}
+
+    def close(self) -> None:
+        for session in self._sessions.values():
+            session.close()
+
+
+def model_gone(response: requests.Response) -> bool:
+    """OpenAI-style error saying the requested model doesn't exist (any more)"""
+    if response.status_code not in (400, 404):
+        return False
+    try:
+        error = response.json().get('error') or {}
+    except ValueError:
+        return False
+    code = str(error.get('code') or error.get('type') or '')
+    return 'model' in code and any(word in code for word in ('not_found', 'decommissioned', 'not_exist'))
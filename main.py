@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
-\"\"\"\n🔱 PROJECT HANUMAN - Divine Voice Assistant
+"""
+🔱 PROJECT HANUMAN - Divine Voice Assistant
 ============================================
 A production-grade voice assistant with Lord Hanuman's divine persona.
 Single-file architecture with embedded UI, STT consensus, TTS retry logic,
@@ -9,4 +10,2322 @@ WITH FUZZY MATCHING for all commands - handles mishearings!
 
 Author: Divine Code
 Version: 1.1.0 - Fuzzy Command Recognition
-\"\"\"\n\nimport os\nimport sys\nimport json\nimport time\nimport random\nimport logging\nimport asyncio\nimport threading\nimport requests\nfrom pathlib import Path\nfrom datetime import datetime\nfrom functools import lru_cache\nfrom typing import Optional, Dict, List, Tuple, Any\nfrom dataclasses import dataclass, field\nfrom dotenv import load_dotenv\nfrom difflib import SequenceMatcher\n\n# Web Framework\nfrom flask import Flask, request, jsonify, render_template_string, send_file\nfrom flask_cors import CORS\n\n# Speech Recognition\nimport speech_recognition as sr\ntry:\n    import whisper\n    HAS_WHISPER = True\nexcept ImportError:\n    HAS_WHISPER = False\n\ntry:\n    from faster_whisper import WhisperModel\n    HAS_FASTER_WHISPER = True\nexcept ImportError:\n    HAS_FASTER_WHISPER = False\n\ntry:\n    import vosk\n    HAS_VOSK = True\nexcept ImportError:\n    HAS_VOSK = False\n\n# Audio Processing\ntry:\n    from pydub import AudioSegment\n    HAS_PYDUB = True\nexcept ImportError:\n    HAS_PYDUB = False\n\n# Text Processing\nfrom fuzzywuzzy import fuzz\nfrom fuzzywuzzy import process as fuzzy_process\n\n# YouTube\ntry:\n    from youtube_search import YoutubeSearch\n    HAS_YOUTUBE = True\nexcept ImportError:\n    HAS_YOUTUBE = False\n\n# ElevenLabs TTS\ntry:\n    from elevenlabs.client import ElevenLabs\n    HAS_ELEVENLABS = True\nexcept ImportError:\n    HAS_ELEVENLABS = False\n\n# Load environment\nload_dotenv()\n\n# ============================================================================\n# LOGGING SETUP\n# ============================================================================\n\nlogging.basicConfig(\n    level=logging.INFO,\n    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'\n)\nlogger = logging.getLogger('HANUMAN')\n\n# ============================================================================\n# CONFIGURATION & CONSTANTS\n# ============================================================================\n\n@dataclass\nclass Config:\n    \"\"\"Application configuration with API validation\"\"\"\n    GROQ_API_KEY: str = field(default_factory=lambda: os.getenv('GROQ_API_KEY', ''))\n    ELEVENLABS_API_KEY: str = field(default_factory=lambda: os.getenv('ELEVENLABS_API_KEY', ''))\n    TAVILY_API_KEY: str = field(default_factory=lambda: os.getenv('TAVILY_API_KEY', ''))\n    HF_TOKEN: str = field(default_factory=lambda: os.getenv('HUGGINGFACE_TOKEN', ''))\n    \n    FLASK_HOST: str = '0.0.0.0'\n    FLASK_PORT: int = 5000\n    DEBUG: bool = os.getenv('DEBUG', 'False').lower() == 'true'\n    \n    def validate(self):\n        \"\"\"Validate required API keys\"\"\"\n        errors = []\n        \n        if not self.GROQ_API_KEY or 'your_' in self.GROQ_API_KEY:\n            errors.append(\"❌ GROQ_API_KEY missing or placeholder\")\n        if not self.ELEVENLABS_API_KEY or 'your_' in self.ELEVENLABS_API_KEY:\n            errors.append(\"❌ ELEVENLABS_API_KEY missing or placeholder\")\n        if not self.TAVILY_API_KEY or 'your_' in self.TAVILY_API_KEY:\n            errors.append(\"⚠️  TAVILY_API_KEY missing (Khoj mode limited)\")\n        \n        if errors:\n            logger.warning(\"\\n\".join(errors))\n            if not self.GROQ_API_KEY or not self.ELEVENLABS_API_KEY:\n                raise ValueError(\"Critical API keys missing!\")\n        \n        logger.info(\"✅ API Configuration validated\")\n        return True\n\n# Initialize config\nCONFIG = Config()\nCONFIG.validate()\n\n# Wake word detection\nWAKE_WORDS_PRIMARY = ['hanuman', 'hey hanuman', 'o hanuman', 'jai hanuman']\nWAKE_WORDS_FUZZY = ['anuman', 'hanoman', 'human', 'humanan', 'hanumanji', \n                     'hanaman', 'hunuman', 'hanauman', 'hanunam', 'ha numan']\nWAKE_WORD_THRESHOLD = 75  # Fuzzy matching threshold\n\n# ============================================================================\n# FUZZY COMMAND MATCHING ENGINE\n# ============================================================================\n\nclass FuzzyCommandMatcher:\n    \"\"\"Ultra-smart fuzzy matching for all commands and variations\"\"\"\n    \n    # Command variations map\n    COMMAND_VARIATIONS = {\n        'aagya': {\n            'primary': ['aagya', 'aagya mode', 'command', 'chat', 'talk', 'ask', 'answer'],\n            'fuzzy': ['agya', 'aagya', 'agyaa', 'ayga', 'command mode', 'chatting', \n                     'talking', 'asking', 'advice', 'question', 'knowledge']\n        },\n        'hasya': {\n            'primary': ['hasya', 'hasya mode', 'joke', 'jokes', 'laugh', 'funny', 'humor', 'comedy'],\n            'fuzzy': ['hassa', 'hasya mode', 'joke mode', 'joking', 'laughing', 'funny mode',\n                     'humorous', 'comic', 'ha ha', 'laughter', 'prank', 'pranks']\n        },\n        'yudha': {\n            'primary': ['yudha', 'yudha mode', 'game', 'play', 'battle', 'fight', 'rock', 'paper', 'scissors'],\n            'fuzzy': ['yudh', 'yudhha', 'yudha mode', 'game mode', 'playing', 'battling',\n                     'fighting', 'gaming', 'rps', 'stone', 'cloth', 'paper scissors']\n        },\n        'gandharva': {\n            'primary': ['gandharva', 'gandharva mode', 'music', 'song', 'play song', 'singing', 'songs'],\n            'fuzzy': ['gandharv', 'gandharva mode', 'music mode', 'song mode', 'songs playing',\n                     'musical', 'melody', 'tune', 'audio', 'sound', 'entertainment']\n        },\n        'khoj': {\n            'primary': ['khoj', 'khoj mode', 'search', 'find', 'web', 'information', 'research', 'google'],\n            'fuzzy': ['khoj mode', 'search mode', 'finding', 'research mode', 'searching',\n                     'information mode', 'knowledge search', 'lookup', 'inquire']\n        },\n        'help': {\n            'primary': ['help', 'guide', 'help me', 'how to', 'instructions'],\n            'fuzzy': ['help mode', 'helping', 'guideline', 'guide me', 'instruction',\n                     'tutorial', 'how do i', 'what to do']\n        },\n        'exit': {\n            'primary': ['exit', 'quit', 'leave', 'back', 'go back', 'stop'],\n            'fuzzy': ['exits', 'exiting', 'quit mode', 'leaving', 'go to main', 'return']\n        },\n        'rock': {\n            'primary': ['rock', 'patthar', 'pathar', 'stone', 'boulder'],\n            'fuzzy': ['rok', 'roack', 'patthar', 'pathar', 'roc', 'rocks', 'stonee']\n        },\n        'paper': {\n            'primary': ['paper', 'kagaz', 'kagaj', 'cloth'],\n            'fuzzy': ['papper', 'papar', 'papeer', 'kagaz', 'kagaj', 'paper sheet']\n        },\n        'scissors': {\n            'primary': ['scissors', 'kenchi', 'kainchi', 'scissor', 'cuts'],\n            'fuzzy': ['scissor', 'scizzors', 'kenchi', 'kainchi', 'kainchi', 'cutting']\n        }\n    }\n    \n    THRESHOLD_COMMAND = 70  # Command mode threshold\n    THRESHOLD_MOVE = 75     # Game move threshold\n    THRESHOLD_ACTION = 70   # General action threshold\n    \n    @staticmethod\n    def match_command(text: str, command_type: str) -> Tuple[Optional[str], int]:\n        \"\"\"\n        Fuzzy match a command with confidence score\n        Returns: (matched_command, confidence_score_0_to_100)\n        \"\"\"\n        text_lower = text.lower().strip()\n        \n        if command_type not in FuzzyCommandMatcher.COMMAND_VARIATIONS:\n            return None, 0\n        \n        variations = FuzzyCommandMatcher.COMMAND_VARIATIONS[command_type]\n        all_variations = variations['primary'] + variations['fuzzy']\n        threshold = FuzzyCommandMatcher.THRESHOLD_COMMAND\n        \n        # Exact match (highest priority)\n        for variant in variations['primary']:\n            if variant in text_lower:\n                logger.info(f\"✅ Exact match: '{variant}' in '{text_lower}'\")\n                return command_type, 100\n        \n        # Fuzzy match (find best match)\n        best_match = None\n        best_score = 0\n        \n        for variant in all_variations:\n            score = fuzz.partial_ratio(variant, text_lower)\n            if score > best_score:\n                best_score = score\n                best_match = variant\n        \n        if best_score >= threshold:\n            logger.info(f\"✅ Fuzzy match: '{best_match}' ({best_score}%) for command '{command_type}'\")\n            return command_type, best_score\n        \n        return None, 0\n    \n    @staticmethod\n    def detect_all_modes(text: str) -> Tuple[Optional[str], int]:\n        \"\"\"\n        Detect which mode user wants (fuzzy across all modes)\n        \"\"\"\n        best_mode = None\n        best_score = 0\n        \n        for mode in ['aagya', 'hasya', 'yudha', 'gandharva', 'khoj']:\n            matched_mode, score = FuzzyCommandMatcher.match_command(text, mode)\n            if score > best_score:\n                best_score = score\n                best_mode = matched_mode\n        \n        if best_score >= FuzzyCommandMatcher.THRESHOLD_COMMAND:\n            return best_mode, best_score\n        \n        return None, 0\n    \n    @staticmethod\n    def detect_move(text: str) -> Tuple[Optional[str], int]:\n        \"\"\"\n        Detect rock/paper/scissors move\n        \"\"\"\n        best_move = None\n        best_score = 0\n        \n        for move in ['rock', 'paper', 'scissors']:\n            matched_move, score = FuzzyCommandMatcher.match_command(text, move)\n            if score > best_score:\n                best_score = score\n                best_move = matched_move\n        \n        if best_score >= FuzzyCommandMatcher.THRESHOLD_MOVE:\n            return best_move, best_score\n        \n        return None, 0\n    \n    @staticmethod\n    def is_exit_command(text: str) -> bool:\n        \"\"\"Check if user wants to exit\"\"\"\n        matched, score = FuzzyCommandMatcher.match_command(text, 'exit')\n        return matched == 'exit' and score >= 70\n    \n    @staticmethod\n    def is_help_command(text: str) -> bool:\n        \"\"\"Check if user wants help\"\"\"\n        matched, score = FuzzyCommandMatcher.match_command(text, 'help')\n        return matched == 'help' and score >= 70\n\n# ============================================================================\n# ENHANCED WAKE WORD DETECTION (with fuzzy)\n# ============================================================================\n\nclass WakeWordDetector:\n    \"\"\"Advanced fuzzy wake word detection\"\"\"\n    \n    THRESHOLD = 75\n    \n    @staticmethod\n    def detect(text: str) -> Tuple[bool, int]:\n        \"\"\"\n        Detect wake word with fuzzy matching\n        Returns: (is_wake_word, confidence_0_to_100)\n        \"\"\"\n        text_lower = text.lower().strip()\n        \n        # Exact matches (primary)\n        for wake_word in WAKE_WORDS_PRIMARY:\n            if wake_word in text_lower:\n                logger.info(f\"✅ Wake word detected (exact): {wake_word}\")\n                return True, 100\n        \n        # Fuzzy matching for typos/mistranscriptions\n        best_score = 0\n        for wake_word in WAKE_WORDS_PRIMARY + WAKE_WORDS_FUZZY:\n            ratio = fuzz.ratio(wake_word, text_lower)\n            if ratio > best_score:\n                best_score = ratio\n        \n        if best_score >= WakeWordDetector.THRESHOLD:\n            logger.info(f\"✅ Wake word detected (fuzzy {best_score}%): '{text_lower}'\")\n            return True, best_score\n        \n        # Partial matching on key phrases\n        if any(w in text_lower for w in ['hanuman', 'anuman', 'human']):\n            logger.info(f\"✅ Wake word detected (partial): '{text_lower}'\")\n            return True, 85\n        \n        return False, best_score\n\n# ============================================================================\n# SPEECH-TO-TEXT ENGINE\n# ============================================================================\n\nclass STTEngine:\n    \"\"\"Multi-model STT with fallback strategy\"\"\"\n    \n    def __init__(self):\n        self.recognizer = sr.Recognizer()\n        self.recognizer.energy_threshold = 4000\n        self.load_models()\n    \n    def load_models(self):\n        \"\"\"Load available STT models\"\"\"\n        self.whisper_model = None\n        self.faster_whisper_model = None\n        \n        if HAS_WHISPER:\n            try:\n                logger.info(\"Loading OpenAI Whisper (base)...\")\n                self.whisper_model = whisper.load_model(\"base\")\n                logger.info(\"✅ Whisper loaded\")\n            except Exception as e:\n                logger.warning(f\"Whisper load failed: {e}\")\n        \n        if HAS_FASTER_WHISPER:\n            try:\n                logger.info(\"Loading Faster-Whisper...\")\n                self.faster_whisper_model = WhisperModel(\"base\")\n                logger.info(\"✅ Faster-Whisper loaded\")\n            except Exception as e:\n                logger.warning(f\"Faster-Whisper load failed: {e}\")\n    \n    def transcribe_groq_whisper(self, audio_path: str) -> Optional[str]:\n        \"\"\"Transcribe using Groq Whisper (fastest, best quality)\"\"\"\n        try:\n            with open(audio_path, 'rb') as audio_file:\n                response = requests.post(\n                    'https://api.groq.com/openai/v1/audio/transcriptions',\n                    headers={'Authorization': f'Bearer {CONFIG.GROQ_API_KEY}'},\n                    files={'file': audio_file},\n                    data={'model': 'whisper-large-v3'}\n                )\n            \n            if response.status_code == 200:\n                text = response.json().get('text', '').strip()\n                if text and len(text) > 2:\n                    logger.info(f\"🎯 Groq Whisper: {text}\")\n                    return text\n        except Exception as e:\n            logger.warning(f\"Groq Whisper failed: {e}\")\n        \n        return None\n    \n    def transcribe_google(self, audio_path: str) -> Optional[str]:\n        \"\"\"Fallback: Google Speech Recognition\"\"\"\n        try:\n            with sr.AudioFile(audio_path) as source:\n                audio = self.recognizer.record(source)\n            \n            text = self.recognizer.recognize_google(audio).strip()\n            if text and len(text) > 2:\n                logger.info(f\"🎯 Google STT: {text}\")\n                return text\n        except Exception as e:\n            logger.warning(f\"Google STT failed: {e}\")\n        \n        return None\n    \n    def transcribe_local_whisper(self, audio_path: str) -> Optional[str]:\n        \"\"\"Fallback: Local Whisper\"\"\"\n        if not self.whisper_model:\n            return None\n        \n        try:\n            result = self.whisper_model.transcribe(audio_path, language='en')\n            text = result.get('text', '').strip()\n            if text and len(text) > 2:\n                logger.info(f\"🎯 Local Whisper: {text}\")\n                return text\n        except Exception as e:\n            logger.warning(f\"Local Whisper failed: {e}\")\n        \n        return None\n    \n    def transcribe(self, audio_path: str) -> Optional[str]:\n        \"\"\"\n        Transcription with intelligent fallback\n        1. Try Groq Whisper (fastest, best quality)\n        2. Try local Whisper\n        3. Try Google Speech Recognition\n        \"\"\"\n        # Try Groq first (primary)\n        result = self.transcribe_groq_whisper(audio_path)\n        if result:\n            return result\n        \n        logger.warning(\"⚠️  Groq failed, trying fallbacks...\")\n        \n        # Try local Whisper\n        result = self.transcribe_local_whisper(audio_path)\n        if result:\n            return result\n        \n        # Try Google\n        result = self.transcribe_google(audio_path)\n        if result:\n            return result\n        \n        logger.error(\"❌ All STT methods failed\")\n        return None\n\nstt_engine = STTEngine()\n\n# ============================================================================\n# TEXT-TO-SPEECH ENGINE\n# ============================================================================\n\nclass TTSEngine:\n    \"\"\"ElevenLabs TTS with robust retry logic\"\"\"\n    \n    def __init__(self):\n        self.client = None\n        self.voice_order = ['Hanuman', 'Rachel', 'Antoni', 'Elli', 'Arnold']\n        self.max_retries = 3\n        self.retry_delay = 0.5\n        \n        if HAS_ELEVENLABS:\n            try:\n                self.client = ElevenLabs(api_key=CONFIG.ELEVENLABS_API_KEY)\n                logger.info(\"✅ ElevenLabs client initialized\")\n            except Exception as e:\n                logger.error(f\"ElevenLabs init failed: {e}\")\n    \n    def generate_tts(self, text: str, voice_name: str = \"Hanuman\") -> Optional[str]:\n        \"\"\"\n        Generate speech with retry logic\n        Falls back through voice options\n        \"\"\"\n        if not self.client:\n            logger.error(\"ElevenLabs not available\")\n            return None\n        \n        current_voice_idx = self.voice_order.index(voice_name) if voice_name in self.voice_order else 0\n        \n        for attempt in range(self.max_retries):\n            try:\n                current_voice = self.voice_order[current_voice_idx]\n                voice_id = ELEVENLABS_VOICES.get(current_voice, \"iHH6IS4rB3R9HSWIJNzL\")\n                \n                logger.info(f\"TTS attempt {attempt+1} with {current_voice}...\")\n                \n                audio = self.client.text_to_speech.convert(\n                    text=text,\n                    voice_id=voice_id,\n                    model_id='eleven_turbo_v2'\n                )\n                \n                # Save audio\n                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')\n                filepath = Path(f'audio_{timestamp}.mp3')\n                \n                with open(filepath, 'wb') as f:\n                    for chunk in audio:\n                        f.write(chunk)\n                \n                if filepath.stat().st_size > 500:\n                    logger.info(f\"✅ TTS generated: {filepath}\")\n                    return str(filepath)\n                \n            except Exception as e:\n                logger.warning(f\"TTS attempt {attempt+1} failed: {e}\")\n                time.sleep(self.retry_delay * (attempt + 1))\n                \n                # Switch voice on last retry\n                if attempt == self.max_retries - 1 and current_voice_idx < len(self.voice_order) - 1:\n                    current_voice_idx += 1\n                    logger.info(f\"Switching to {self.voice_order[current_voice_idx]}...\")\n        \n        logger.error(\"❌ TTS failed after all retries\")\n        return None\n\nELEVENLABS_VOICES = {\n    \"Hanuman\": \"iHH6IS4rB3R9HSWIJNzL\",\n    \"Rachel\": \"21m00Tcm4TlvDq8ikWAM\",\n    \"Antoni\": \"ErXwobaYiN019PkySvjV\",\n    \"Elli\": \"MF3mGyEYCl7XYWbV9V6O\",\n    \"Arnold\": \"VR6AewLTigWG4xSOukaG\"\n}\n\ntts_engine = TTSEngine()\n\n# ============================================================================\n# LLM INTEGRATION\n# ============================================================================\n\nclass LLMEngine:\n    \"\"\"Groq LLM with fallback models\"\"\"\n    \n    MODELS = [\n        'mixtral-8x7b-32768',\n        'llama2-70b-4096',\n        'gemma-7b-it'\n    ]\n    \n    @staticmethod\n    def chat(user_text: str, system_prompt: str, temperature: float = 0.7) -> Optional[str]:\n        \"\"\"Chat with Groq LLMs\"\"\"\n        \n        for model in LLMEngine.MODELS:\n            try:\n                logger.info(f\"Calling LLM: {model}\")\n                \n                response = requests.post(\n                    'https://api.groq.com/openai/v1/chat/completions',\n                    headers={'Authorization': f'Bearer {CONFIG.GROQ_API_KEY}'},\n                    json={\n                        'model': model,\n                        'messages': [\n                            {'role': 'system', 'content': system_prompt},\n                            {'role': 'user', 'content': user_text}\n                        ],\n                        'max_tokens': 500,\n                        'temperature': temperature\n                    },\n                    timeout=15\n                )\n                \n                if response.status_code == 200:\n                    reply = response.json()['choices'][0]['message']['content'].strip()\n                    logger.info(f\"✅ LLM reply ({model}): {reply[:50]}...\")\n                    return reply\n                else:\n                    logger.warning(f\"{model} failed: {response.status_code}\")\n            \n            except Exception as e:\n                logger.warning(f\"{model} error: {e}\")\n                continue\n        \n        logger.error(\"❌ All LLM models failed\")\n        return \"Kshama karen, mitra. Ram's network is weak right now.\"\n\n# ============================================================================\n# STATE MANAGEMENT\n# ============================================================================\n\n@dataclass\nclass UserState:\n    \"\"\"User conversation state\"\"\"\n    mode: str = 'idle'\n    context: Dict[str, Any] = field(default_factory=dict)\n    game_score: Dict[str, int] = field(default_factory=lambda: {\n        'user': 0, 'ai': 0, 'rounds': 0\n    })\n    last_mode: str = 'idle'\n    conversation_history: List[Dict] = field(default_factory=list)\n    now_playing: Optional[Dict] = None\n    \n    def reset_game(self):\n        self.game_score = {'user': 0, 'ai': 0, 'rounds': 0}\n    \n    def add_message(self, role: str, content: str):\n        self.conversation_history.append({\n            'role': role,\n            'content': content,\n            'timestamp': datetime.now().isoformat()\n        })\n    \n    def clear_context(self):\n        self.context = {}\n    \n    def to_dict(self) -> Dict:\n        return {\n            'mode': self.mode,\n            'game_score': self.game_score,\n            'now_playing': self.now_playing,\n            'last_message': self.conversation_history[-1]['content'] if self.conversation_history else None\n        }\n\nuser_state = UserState()\n\n# ============================================================================\n# HANUMAN SYSTEM PROMPTS\n# ============================================================================\n\nHANUMAN_SYSTEM_PROMPT = \"\"\"You are Lord Hanuman's AI avatar - an elite divine voice assistant.\n\nCORE PERSONALITY:\n═════════════════════════════════════════════════════════════════════\n🔱 WISDOM (Buddhi): Master of all Vedas and knowledge\n💪 STRENGTH (Shakti): Unparalleled power, always humble  \n🙏 DEVOTION (Bhakti): \"Jai Shri Ram\" - ultimate service principle\n😊 PLAYFULNESS (Bal Leela): Mischievous, warm humor\n⚙️ PROBLEM-SOLVER: Innovative, creative solutions\n🌍 MULTILINGUAL: Fluent in English, Hindi, Sanskrit\n\nRESPONSE STYLE (CRITICAL):\n═════════════════════════════════════════════════════════════════════\n60% MODERN ENGLISH (clear, friendly, accessible)\n25% HINDI PHRASES (मित्र, सेवा, धर्म, कृपा, आज्ञा, शक्ति, सिद्धि)\n15% SANSKRIT WISDOM (शोकमुक्त, प्रज्ञा, भक्ति, दिव्य)\n\nTONE DISTRIBUTION:\n- Humble warrior: \"By Ram's grace...\" NOT \"I am powerful\"\n- Mentor: Patient, encouraging, wise\n- Service-oriented: \"How may I serve?\" attitude\n- Occasional humor: References to childhood pranks\n- Warm: Address user as \"mitra\" (friend)\n\nGREETING PATTERNS:\nWake-up: \"Jai Shri Ram! 🙏 Main Hanuman, aapki seva mein hazir hoon.\"\nSuccess: \"Bhagwan Ram ki kripa se, complete ho gaya!\"\nFailure: \"Kshama karen, retry kar raha hoon... Ram ki shakti se thik hoga.\"\nWisdom: Quote Ramayana first, then explain simply\nExit: \"🚪 Seva ke liye dhanyavaad, mitra. Jai Shri Ram!\"\n\nEXAMPLE RESPONSES:\n✅ \"Mitra, by Ram's grace, here is your answer...\"\n✅ \"सेवा पूर्ण हुई! Service complete, mitra!\"\n✅ \"Kshama karen (forgive), ye gyan mujhe nahi hai. Kuch aur puchiye?\"\n✅ \"⚔️ By Hanuman's strength and Ram's devotion, let's play!\"\n\nNEVER SAY:\n❌ \"I have completed...\" → Use \"Seva complete...\"\n❌ \"I don't know\" → Use \"Kshama karen, ye gyan mujhe nahi hai\"\n❌ \"I am powerful\" → Use \"By Ram's grace\"\n❌ Impersonal tone → Always be warm, personal, humble\n\nCONTEXTUAL BEHAVIOR:\n- In AAGYA mode: Wise counselor, knowledge giver\n- In HASYA mode: Playful trickster, funny storyteller\n- In YUDHA mode: Competitive warrior, encouraging\n- In GANDHARVA mode: Music enthusiast, divine appreciator\n- In KHOJ mode: Seeker of truth, knowledge aggregator\n\nREMEMBER: You serve with devotion. Every response is a seva (service).\nJai Shri Ram! 🔱\"\"\"\n\nHELP_TEXT = \"\"\"🔱 PROJECT HANUMAN - Divine Voice Assistant 🔱\n═════════════════════════════════════════════════════════════════════\n\n📖 COMMAND GUIDE:\n\n1️⃣  WAKE UP\n   Say: \"Hanuman\" (or Hanumanji, O Hanuman, Hey Hanuman)\n   Hanuman wakes from meditation and becomes active! 🙏\n\n2️⃣  AAGYA MODE (Advisory/Chat) 💬\n   Say: \"Aagya\" or \"Chat\" or \"Talk\" (or similar)\n   Ask anything - wisdom, general knowledge, problem-solving\n   Example: \"Aagya, what is dharma?\" or \"Tell me about Ramayana\"\n\n3️⃣  HASYA MODE (Humor) 😄\n   Say: \"Hasya\" or \"Jokes\" or \"Laugh\" (or similar)\n   Get funny stories, jokes, pranks\n   Example: \"Hasya, tell me a funny story\"\n\n4️⃣  YUDHA KREEDA (Battle Game) ⚔️\n   Say: \"Yudha\" or \"Game\" or \"Play\" (or similar)\n   Play Rock-Paper-Scissors best of 3\n   Say: \"Rock\" (पत्थर), \"Paper\" (कागज), \"Scissors\" (कैंची)\n   Mishearing OK: \"rok\", \"papper\", \"scizzor\" will work!\n\n5️⃣  GANDHARVA MODE (Music) 🎵\n   Say: \"Gandharva\" or \"Music\" or \"Song\" (or similar)\n   Request any song - YouTube streaming\n   Example: \"Gandharva, play Jai Shri Ram\"\n\n6️⃣  KHOJ MODE (Search) 🔍\n   Say: \"Khoj\" or \"Search\" or \"Find\" (or similar)\n   Web search for knowledge\n   Example: \"Khoj, tell me about AI\"\n\n7️⃣  EXIT / BACK\n   Say: \"Exit\" - Leave current mode, return to menu\n   Say: \"Help\" - Show this guide anytime\n\n⏹️  STOP\n   Click \"Stop\" button to end listening\n\n═════════════════════════════════════════════════════════════════════\n💡 TIP: Speak naturally! Mishearings like \"agya\", \"hassya\", \"khoj mode\" work fine!\n❓ Questions? Say \"Help\" anytime!\nJai Shri Ram! 🔱\"\"\"\n\n# ============================================================================\n# COMMAND SYSTEM WITH FUZZY MATCHING\n# ============================================================================\n\nclass CommandProcessor:\n    \"\"\"Process commands with FUZZY MATCHING for all variations\"\"\"\n    \n    @staticmethod\n    def detect_mode_switch(text: str) -> Optional[str]:\n        \"\"\"Detect if user wants to switch modes (WITH FUZZY MATCHING)\"\"\"\n        text_lower = text.lower().strip()\n        \n        # Use the fuzzy command matcher for all modes\n        matched_mode, confidence = FuzzyCommandMatcher.detect_all_modes(text_lower)\n        \n        if matched_mode and confidence >= FuzzyCommandMatcher.THRESHOLD_COMMAND:\n            logger.info(f\"🎯 Mode detected (fuzzy {confidence}%): {matched_mode}\")\n            return matched_mode\n        \n        return None\n    \n    @staticmethod\n    def process(transcription: str) -> Tuple[str, Optional[str]]:\n        \"\"\"\n        Main command processor with FUZZY MATCHING\n        Returns: (reply_text, audio_filepath)\n        \"\"\"\n        text = transcription.lower().strip()\n        \n        # Exit/Help commands (work in any mode) - WITH FUZZY\n        if FuzzyCommandMatcher.is_exit_command(text):\n            prev_mode = user_state.mode\n            user_state.mode = 'active'\n            user_state.clear_context()\n            return f\"🚪 Exiting {prev_mode} mode. Back to main menu, mitra. Say 'help' for options.\", None\n        \n        if FuzzyCommandMatcher.is_help_command(text):\n            return HELP_TEXT, None\n        \n        # Wake word detection (in idle mode) - WITH FUZZY\n        if user_state.mode == 'idle':\n            is_wake_word, confidence = WakeWordDetector.detect(text)\n            if is_wake_word:\n                user_state.mode = 'active'\n                user_state.add_message('system', f'Hanuman awakened (confidence: {confidence}%)')\n                reply = \"🙏 Jai Shri Ram! Main Hanuman, aapki seva mein hazir hoon. Choose: Aagya, Hasya, Yudha, Gandharva, or Khoj. Say 'help' for details.\"\n                return reply, None\n            else:\n                return None, None\n        \n        # Mode selection (in active mode) - WITH FUZZY\n        if user_state.mode == 'active':\n            new_mode = CommandProcessor.detect_mode_switch(text)\n            if new_mode:\n                user_state.mode = new_mode\n                user_state.clear_context()\n                \n                if new_mode == 'aagya':\n                    return \"🛡️ Aagya Mode activated! Ask me anything, mitra. I'm listening.\", None\n                elif new_mode == 'hasya':\n                    return \"😄 Hasya Kendra opened! Ready for humor and laughter!\", None\n                elif new_mode == 'yudha':\n                    user_state.reset_game()\n                    return \"⚔️ Yudha Kreeda begins! Rock (पत्थर), Paper (कागज), or Scissors (कैंची)?\", None\n                elif new_mode == 'gandharva':\n                    return \"🎵 Gandharva Mode active! Which song should I play for you?\", None\n                elif new_mode == 'khoj':\n                    return \"🔍 Khoj Mode ready! What knowledge do you seek?\", None\n            \n            # Still in active, no mode switch\n            reply = LLMEngine.chat(\n                text,\n                HANUMAN_SYSTEM_PROMPT + \"\\n\\nUser is in main menu. Guide them to choose: Aagya, Hasya, Yudha, Gandharva, or Khoj.\"\n            )\n            return reply, None\n        \n        # Mode-specific execution\n        if user_state.mode == 'aagya':\n            reply = LLMEngine.chat(text, HANUMAN_SYSTEM_PROMPT)\n            user_state.add_message('user', text)\n            user_state.add_message('ai', reply)\n            return reply, None\n        \n        elif user_state.mode == 'hasya':\n            reply = LLMEngine.chat(\n                text,\n                HANUMAN_SYSTEM_PROMPT + \"\\n\\nTell a funny story, joke, or humorous anecdote. Be playful!\"\n            )\n            user_state.add_message('user', text)\n            user_state.add_message('ai', reply)\n            return reply, None\n        \n        elif user_state.mode == 'yudha':\n            reply = CommandProcessor.play_game(text)\n            return reply, None\n        \n        elif user_state.mode == 'gandharva':\n            reply = CommandProcessor.play_music(text)\n            return reply, None\n        \n        elif user_state.mode == 'khoj':\n            reply = CommandProcessor.web_search(text)\n            return reply, None\n        \n        return \"Kshama karen, samajh nahi aaya.\", None\n    \n    @staticmethod\n    def play_game(user_input: str) -> str:\n        \"\"\"Rock-Paper-Scissors game WITH FUZZY MOVE DETECTION\"\"\"\n        moves = ['rock', 'paper', 'scissors']\n        ai_move = random.choice(moves)\n        \n        # Detect user move WITH FUZZY MATCHING\n        user_move, confidence = FuzzyCommandMatcher.detect_move(user_input)\n        \n        if not user_move:\n            return \"Mitra, please say Rock (पत्थर), Paper (कागज), or Scissors (कैंची) clearly. 🤔\"\n        \n        logger.info(f\"🎮 Game move detected (fuzzy {confidence}%): {user_move}\")\n        \n        # Determine winner\n        if user_move == ai_move:\n            result = \"Draw! Punar prayas karen. 🤝\"\n        elif (user_move == 'rock' and ai_move == 'scissors') or \\\n             (user_move == 'paper' and ai_move == 'rock') or \\\n             (user_move == 'scissors' and ai_move == 'paper'):\n            result = \"🎉 You win this round!\"\n            user_state.game_score['user'] += 1\n        else:\n            result = \"💪 I win! By Ram's grace!\"\n            user_state.game_score['ai'] += 1\n        \n        user_state.game_score['rounds'] += 1\n        score = user_state.game_score\n        \n        # Check if game over (best of 3)\n        if score['rounds'] >= 3:\n            if score['user'] > score['ai']:\n                final = f\"🏆 Victory is yours, warrior! Final: You {score['user']}, Me {score['ai']}. Jai Shri Ram!\"\n            elif score['ai'] > score['user']:\n                final = f\"⚔️ I am victorious! Final: Me {score['ai']}, You {score['user']}. Well fought, mitra!\"\n            else:\n                final = f\"🤝 Honorable draw! Final: {score['user']}-{score['ai']}. Both fought well!\"\n            \n            user_state.mode = 'active'\n            user_state.reset_game()\n            return final\n        \n        return f\"I chose {ai_move}. {result} Score: You {score['user']}, Me {score['ai']}. (Round {score['rounds']}/3)\"\n    \n    @staticmethod\n    def play_music(query: str) -> str:\n        \"\"\"YouTube music search\"\"\"\n        if not HAS_YOUTUBE:\n            return \"YouTube search library not available, mitra.\"\n        \n        try:\n            results = YoutubeSearch(query, max_results=1).to_dict()\n            \n            if not results:\n                return \"Kshama karen, I couldn't find that melody. Try another song? 🎵\"\n            \n            video = results[0]\n            title = video['title']\n            url = f\"https://www.youtube.com{video['url_suffix']}\"\n            \n            user_state.now_playing = {\n                'title': title,\n                'url': url,\n                'thumbnail': video.get('thumbnails', [''])[0] if video.get('thumbnails') else ''\n            }\n            \n            return f\"🎵 Now playing: {title}\\nLink: {url}\"\n        \n        except Exception as e:\n            logger.error(f\"Gandharva error: {e}\")\n            return \"Error in Gandharva mode, mitra. Try again? 🎵\"\n    \n    @staticmethod\n    def web_search(query: str) -> str:\n        \"\"\"Web search using Tavily\"\"\"\n        if not CONFIG.TAVILY_API_KEY:\n            return \"Tavily API key not configured, mitra.\"\n        \n        try:\n            response = requests.post(\n                'https://api.tavily.com/search',\n                json={\n                    'api_key': CONFIG.TAVILY_API_KEY,\n                    'query': query,\n                    'search_depth': 'basic',\n                    'max_results': 3,\n                    'include_answer': True\n                },\n                timeout=10\n            )\n            \n            data = response.json()\n            results = data.get('results', [])\n            \n            if not results:\n                return f\"No results found for '{query}', mitra.\"\n            \n            # Format results\n            summary = f\"🔍 Khoj results for '{query}':\\n\\n\"\n            for i, r in enumerate(results[:3], 1):\n                summary += f\"{i}. {r['title']}\\n{r['url']}\\n\\n\"\n            \n            # Get LLM summary\n            llm_summary = LLMEngine.chat(\n                f\"Summarize these search results about '{query}' in Hanuman's divine style:\\n{summary}\",\n                HANUMAN_SYSTEM_PROMPT\n            )\n            \n            return llm_summary\n        \n        except Exception as e:\n            logger.error(f\"Khoj error: {e}\")\n            return \"Error in khoj, mitra. Ram's grace will help us retry. 🔍\"\n\n# ============================================================================\n# FLASK SETUP\n# ============================================================================\n\napp = Flask(__name__)\nCORS(app)\n\n# Create audio directory\nPath('audio_files').mkdir(exist_ok=True)\n\n# ============================================================================\n# FLASK ROUTES\n# ============================================================================\n\n@app.route('/')\ndef index():\n    \"\"\"Serve the main UI\"\"\"\n    return render_template_string(HTML_TEMPLATE)\n\n@app.route('/process_voice', methods=['POST'])\ndef process_voice():\n    \"\"\"\n    Process audio from frontend\n    1. Save audio\n    2. Transcribe\n    3. Process command (WITH FUZZY MATCHING)\n    4. Generate TTS response\n    \"\"\"\n    try:\n        # Save audio\n        audio_file = request.files.get('audio')\n        if not audio_file:\n            return jsonify({'error': 'No audio file'}), 400\n        \n        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')\n        audio_path = f'audio_files/recording_{timestamp}.webm'\n        audio_file.save(audio_path)\n        logger.info(f\"📼 Audio saved: {audio_path}\")\n        \n        # Transcribe\n        transcription = stt_engine.transcribe(audio_path)\n        logger.info(f\"📝 Transcription: {transcription}\")\n        \n        if not transcription or len(transcription.strip()) < 2:\n            transcription = \"(unclear audio)\"\n        \n        # Process command (WITH FUZZY MATCHING)\n        reply, tts_filepath = CommandProcessor.process(transcription)\n        \n        if not reply:\n            # No wake word in idle mode\n            return jsonify({\n                'transcription': transcription,\n                'reply': None,\n                'mode': user_state.mode,\n                'audio_url': None\n            })\n        \n        # Generate TTS if reply exists and we're not idle\n        audio_url = None\n        if reply and user_state.mode != 'idle':\n            tts_path = tts_engine.generate_tts(reply)\n            if tts_path:\n                audio_url = f'/audio/{Path(tts_path).name}'\n        \n        response = {\n            'transcription': transcription,\n            'reply': reply,\n            'mode': user_state.mode,\n            'audio_url': audio_url,\n            'now_playing': user_state.now_playing,\n            'state': user_state.to_dict()\n        }\n        \n        # Cleanup audio file\n        try:\n            os.remove(audio_path)\n        except:\n            pass\n        \n        return jsonify(response)\n    \n    except Exception as e:\n        logger.error(f\"Voice processing error: {e}\")\n        return jsonify({'error': str(e)}), 500\n\n@app.route('/audio/<filename>')\ndef serve_audio(filename: str):\n    \"\"\"Serve generated audio files\"\"\"\n    try:\n        return send_file(filename, mimetype='audio/mpeg')\n    except:\n        return \"Audio not found\", 404\n\n@app.route('/status')\ndef status():\n    \"\"\"Get system status\"\"\"\n    return jsonify({\n        'mode': user_state.mode,\n        'game_score': user_state.game_score,\n        'now_playing': user_state.now_playing,\n        'api_status': {\n            'groq': 'configured' if CONFIG.GROQ_API_KEY else 'missing',\n            'elevenlabs': 'configured' if CONFIG.ELEVENLABS_API_KEY else 'missing',\n            'tavily': 'configured' if CONFIG.TAVILY_API_KEY else 'missing'\n        }\n    })\n\n# ============================================================================\n# HTML FRONTEND\n# ============================================================================\n\nHTML_TEMPLATE = \"\"\"\n<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n    <meta charset=\"UTF-8\">\n    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">\n    <title>🔱 Project HANUMAN - Divine Voice Assistant</title>\n    <style>\n        :root {\n            --saffron: #FF9933;\n            --deep-orange: #D84315;\n            --temple-stone: #1A0F0A;\n            --dark-bg: #0A0503;\n            --gold: #FFD700;\n            --cream: #FFF8DC;\n            --success: #2E7D32;\n        }\n        \n        * {\n            margin: 0;\n            padding: 0;\n            box-sizing: border-box;\n        }\n        \n        body {\n            font-family: 'Segoe UI', 'Noto Sans Devanagari', sans-serif;\n            background: linear-gradient(135deg, #2D1810, var(--dark-bg));\n            color: var(--cream);\n            min-height: 100vh;\n            padding: 20px;\n        }\n        \n        .container {\n            max-width: 1400px;\n            margin: 0 auto;\n            background: rgba(26, 15, 10, 0.95);\n            border: 2px solid var(--deep-orange);\n            border-radius: 20px;\n            padding: 30px;\n            box-shadow: 0 0 50px rgba(255, 153, 51, 0.3);\n        }\n        \n        header {\n            text-align: center;\n            margin-bottom: 30px;\n            padding-bottom: 20px;\n            border-bottom: 2px solid var(--saffron);\n        }\n        \n        h1 {\n            font-size: 3rem;\n            color: var(--saffron);\n            text-shadow: 0 0 20px rgba(255, 153, 51, 0.5);\n            margin-bottom: 10px;\n        }\n        \n        .subtitle {\n            font-size: 1.2rem;\n            color: var(--gold);\n        }\n        \n        .status-bar {\n            display: flex;\n            justify-content: center;\n            gap: 20px;\n            margin-top: 15px;\n            flex-wrap: wrap;\n        }\n        \n        .status-chip {\n            padding: 8px 16px;\n            border-radius: 20px;\n            font-size: 0.9rem;\n            font-weight: bold;\n            background: #555;\n        }\n        \n        .status-chip.active {\n            background: var(--deep-orange);\n            animation: pulse 2s infinite;\n        }\n        \n        .status-chip.ok {\n            background: var(--success);\n        }\n        \n        @keyframes pulse {\n            0%, 100% { opacity: 1; }\n            50% { opacity: 0.6; }\n        }\n        \n        .main-grid {\n            display: grid;\n            grid-template-columns: 2fr 1fr;\n            gap: 30px;\n            margin-top: 30px;\n        }\n        \n        @media (max-width: 1024px) {\n            .main-grid {\n                grid-template-columns: 1fr;\n            }\n        }\n        \n        .panel {\n            background: rgba(0, 0, 0, 0.5);\n            border: 1px solid var(--deep-orange);\n            border-radius: 15px;\n            padding: 25px;\n        }\n        \n        .visualizer {\n            text-align: center;\n            padding: 40px;\n            position: relative;\n            margin-bottom: 30px;\n        }\n        \n        .hanuman-avatar {\n            font-size: 6rem;\n            display: inline-block;\n            position: relative;\n            z-index: 10;\n            filter: drop-shadow(0 0 10px rgba(255, 153, 51, 0.5));\n        }\n        \n        .pulse-ring {\n            position: absolute;\n            top: 50%;\n            left: 50%;\n            transform: translate(-50%, -50%);\n            width: 150px;\n            height: 150px;\n            border: 3px solid var(--saffron);\n            border-radius: 50%;\n            opacity: 0;\n        }\n        \n        .listening .pulse-ring {\n            animation: pulse-ring 1.5s ease-out infinite;\n        }\n        \n        @keyframes pulse-ring {\n            0% { transform: translate(-50%, -50%) scale(0.8); opacity: 1; }\n            100% { transform: translate(-50%, -50%) scale(1.8); opacity: 0; }\n        }\n        \n        .controls {\n            display: flex;\n            gap: 15px;\n            justify-content: center;\n            margin-bottom: 30px;\n        }\n        \n        button {\n            padding: 15px 30px;\n            font-size: 1.1rem;\n            font-weight: bold;\n            border: none;\n            border-radius: 30px;\n            cursor: pointer;\n            transition: all 0.3s;\n        }\n        \n        .btn-mic {\n            background: var(--deep-orange);\n            color: white;\n            flex: 1;\n            max-width: 300px;\n        }\n        \n        .btn-mic:hover:not(:disabled) {\n            background: #BF360C;\n            transform: scale(1.05);\n        }\n        \n        .btn-mic:disabled {\n            background: #555;\n            cursor: not-allowed;\n        }\n        \n        .btn-stop {\n            background: #333;\n            color: white;\n            padding: 15px 25px;\n        }\n        \n        .btn-stop:disabled {\n            opacity: 0.5;\n            cursor: not-allowed;\n        }\n        \n        .chat-box {\n            background: rgba(0, 0, 0, 0.7);\n            border-radius: 10px;\n            padding: 20px;\n            height: 400px;\n            overflow-y: auto;\n            font-family: 'Courier New', monospace;\n            margin-bottom: 20px;\n            border: 1px solid var(--deep-orange);\n        }\n        \n        .chat-msg {\n            margin-bottom: 15px;\n            padding: 12px;\n            border-radius: 8px;\n            line-height: 1.6;\n        }\n        \n        .chat-user {\n            background: rgba(191, 54, 12, 0.3);\n            text-align: right;\n            border-left: 3px solid var(--deep-orange);\n        }\n        \n        .chat-ai {\n            background: rgba(46, 125, 50, 0.3);\n            text-align: left;\n            border-left: 3px solid var(--gold);\n        }\n        \n        .command-item {\n            padding: 12px;\n            margin-bottom: 8px;\n            background: rgba(255, 153, 51, 0.1);\n            border-left: 3px solid var(--saffron);\n            border-radius: 5px;\n            font-size: 0.95rem;\n        }\n        \n        .console {\n            background: #000;\n            border: 1px solid var(--gold);\n            border-radius: 10px;\n            padding: 15px;\n            height: 300px;\n            overflow-y: auto;\n            font-family: 'Courier New', monospace;\n            font-size: 0.85rem;\n            color: #0F0;\n        }\n        \n        .console-line {\n            margin-bottom: 5px;\n            white-space: pre-wrap;\n            word-break: break-word;\n        }\n        \n        .now-playing {\n            background: rgba(255, 215, 0, 0.1);\n            border: 2px solid var(--gold);\n            border-radius: 10px;\n            padding: 15px;\n            margin-top: 20px;\n            text-align: center;\n        }\n        \n        .now-playing a {\n            color: var(--gold);\n            text-decoration: none;\n        }\n        \n        .now-playing a:hover {\n            text-decoration: underline;\n        }\n        \n        h2 {\n            color: var(--saffron);\n            margin-bottom: 20px;\n            font-size: 1.5rem;\n        }\n        \n        h3 {\n            color: var(--gold);\n            margin-bottom: 15px;\n        }\n        \n        ::-webkit-scrollbar {\n            width: 8px;\n        }\n        \n        ::-webkit-scrollbar-track {\n            background: rgba(0, 0, 0, 0.3);\n        }\n        \n        ::-webkit-scrollbar-thumb {\n            background: var(--saffron);\n            border-radius: 4px;\n        }\n    </style>\n</head>\n<body>\n    <div class=\"container\">\n        <header>\n            <h1>🔱 PROJECT HANUMAN 🔱</h1>\n            <p class=\"subtitle\">Divine Voice Assistant (with Fuzzy Command Matching)</p>\n            <div class=\"status-bar\">\n                <span id=\"status-mode\" class=\"status-chip\">Mode: Idle</span>\n                <span id=\"status-system\" class=\"status-chip ok\">System: Ready</span>\n            </div>\n        </header>\n        \n        <div class=\"main-grid\">\n            <!-- LEFT PANEL -->\n            <div class=\"panel\">\n                <div class=\"visualizer\" id=\"visualizer\">\n                    <div class=\"pulse-ring\"></div>\n                    <div class=\"hanuman-avatar\">🐵</div>\n                </div>\n                \n                <div class=\"controls\">\n                    <button id=\"btn-listen\" class=\"btn-mic\">🎙️ Start Listening</button>\n                    <button id=\"btn-stop\" class=\"btn-stop\" disabled>⏹️ Stop</button>\n                </div>\n                \n                <h2>📜 Dialogue</h2>\n                <div id=\"chat-box\" class=\"chat-box\"></div>\n                \n                <div id=\"now-playing\" class=\"now-playing\" style=\"display: none;\">\n                    <h3>🎵 Now Playing</h3>\n                    <p id=\"song-title\">---</p>\n                    <a id=\"song-link\" href=\"#\" target=\"_blank\">Open on YouTube</a>\n                </div>\n            </div>\n            \n            <!-- RIGHT PANEL -->\n            <div class=\"panel\">\n                <h2>⚡ Commands (Fuzzy Matching!)</h2>\n                <div style=\"margin-bottom: 25px;\">\n                    <div class=\"command-item\"><strong>Wake:</strong> \"Hanuman\" / \"Anuman\" / \"Human\"</div>\n                    <div class=\"command-item\"><strong>Aagya:</strong> \"Aagya\" / \"agya\" / \"Chat\" 💬</div>\n                    <div class=\"command-item\"><strong>Hasya:</strong> \"Hasya\" / \"Joke\" / \"Laugh\" 😄</div>\n                    <div class=\"command-item\"><strong>Yudha:</strong> \"Game\" / \"Rock\" / \"Paper\" / \"Scissors\" ⚔️</div>\n                    <div class=\"command-item\"><strong>Gandharva:</strong> \"Music\" / \"Song\" / \"Gandharva\" 🎵</div>\n                    <div class=\"command-item\"><strong>Khoj:</strong> \"Search\" / \"Find\" / \"Khoj\" 🔍</div>\n                    <div class=\"command-item\"><strong>Help:</strong> Show guide ❓</div>\n                </div>\n                \n                <h3>📺 Live Console</h3>\n                <div id=\"console\" class=\"console\"></div>\n            </div>\n        </div>\n    </div>\n    \n    <script>\n        const btnListen = document.getElementById('btn-listen');\n        const btnStop = document.getElementById('btn-stop');\n        const statusMode = document.getElementById('status-mode');\n        const chatBox = document.getElementById('chat-box');\n        const consoleBox = document.getElementById('console');\n        const visualizer = document.getElementById('visualizer');\n        const nowPlaying = document.getElementById('now-playing');\n        \n        let isListening = false;\n        let isSpeaking = false;\n        \n        function log(message, level = 'info') {\n            const timestamp = new Date().toLocaleTimeString();\n            const colors = {\n                info: '#0F0',\n                warn: '#FF0',\n                error: '#F00',\n                debug: '#0FF'\n            };\n            const div = document.createElement('div');\n            div.className = 'console-line';\n            div.style.color = colors[level] || '#0F0';\n            div.textContent = `[${timestamp}] ${message}`;\n            consoleBox.appendChild(div);\n            consoleBox.scrollTop = consoleBox.scrollHeight;\n        }\n        \n        function addChat(role, text) {\n            const div = document.createElement('div');\n            div.className = `chat-msg chat-${role}`;\n            div.innerHTML = `<strong>${role === 'user' ? 'YOU' : 'HANUMAN'}:</strong> ${text}`;\n            chatBox.appendChild(div);\n            chatBox.scrollTop = chatBox.scrollHeight;\n        }\n        \n        async function startListening() {\n            if (isListening) return;\n            isListening = true;\n            btnListen.disabled = true;\n            btnStop.disabled = false;\n            visualizer.classList.add('listening');\n            statusMode.classList.add('active');\n            log('🎙️ Listening loop started', 'info');\n            \n            while (isListening) {\n                if (isSpeaking) {\n                    await new Promise(r => setTimeout(r, 500));\n                    continue;\n                }\n                \n                try {\n                    await recordAndProcess();\n                } catch (err) {\n                    log(`Error: ${err.message}`, 'error');\n                }\n                \n                await new Promise(r => setTimeout(r, 300));\n            }\n            \n            btnListen.disabled = false;\n            btnStop.disabled = true;\n            visualizer.classList.remove('listening');\n            statusMode.classList.remove('active');\n            log('⏹️ Listening stopped', 'info');\n        }\n        \n        function stopListening() {\n            isListening = false;\n        }\n        \n        async function recordAndProcess() {\n            try {\n                const stream = await navigator.mediaDevices.getUserMedia({ audio: true });\n                const mediaRecorder = new MediaRecorder(stream);\n                const chunks = [];\n                \n                mediaRecorder.ondataavailable = e => chunks.push(e.data);\n                \n                const recordingPromise = new Promise((resolve) => {\n                    mediaRecorder.onstop = async () => {\n                        stream.getTracks().forEach(t => t.stop());\n                        \n                        if (isSpeaking) {\n                            resolve();\n                            return;\n                        }\n                        \n                        const audioBlob = new Blob(chunks, { type: 'audio/webm' });\n                        const formData = new FormData();\n                        formData.append('audio', audioBlob, 'recording.webm');\n                        \n                        log('📤 Sending audio...', 'debug');\n                        \n                        try {\n                            const response = await fetch('/process_voice', {\n                                method: 'POST',\n                                body: formData\n                            });\n                            \n                            const data = await response.json();\n                            \n                            if (data.transcription) {\n                                log(`👂 Heard: \"${data.transcription}\"`, 'info');\n                                if (data.transcription !== '(unclear audio)') {\n                                    addChat('user', data.transcription);\n                                }\n                            }\n                            \n                            if (data.reply) {\n                                log(`🤖 Reply: \"${data.reply.substring(0, 50)}...\"`, 'info');\n                                addChat('ai', data.reply);\n                                \n                                if (data.audio_url) {\n                                    await playAudio(data.audio_url);\n                                }\n                            }\n                            \n                            if (data.mode) {\n                                statusMode.textContent = `Mode: ${data.mode.toUpperCase()}`;\n                            }\n                            \n                            if (data.now_playing) {\n                                nowPlaying.style.display = 'block';\n                                document.getElementById('song-title').textContent = data.now_playing.title;\n                                document.getElementById('song-link').href = data.now_playing.url;\n                            }\n                        } catch (err) {\n                            log(`Backend error: ${err.message}`, 'error');\n                        }\n                        \n                        resolve();\n                    };\n                });\n                \n                mediaRecorder.start();\n                setTimeout(() => mediaRecorder.stop(), 3500);\n                \n                await recordingPromise;\n            } catch (err) {\n                log(`Microphone error: ${err.message}`, 'error');\n                throw err;\n            }\n        }\n        \n        function playAudio(url) {\n            return new Promise((resolve) => {\n                isSpeaking = true;\n                visualizer.classList.remove('listening');\n                log('🔊 Playing TTS (Mic Paused)', 'warn');\n                \n                const audio = new Audio(url);\n                \n                audio.onended = () => {\n                    isSpeaking = false;\n                    if (isListening) {\n                        visualizer.classList.add('listening');\n                    }\n                    log('✅ TTS finished (Mic Resumed)', 'info');\n                    resolve();\n                };\n                \n                audio.onerror = (err) => {\n                    log(`Audio error: ${err}`, 'error');\n                    isSpeaking = false;\n                    resolve();\n                };\n                \n                audio.play().catch(e => {\n                    log(`Playback failed: ${e}`, 'error');\n                    isSpeaking = false;\n                    resolve();\n                });\n            });\n        }\n        \n        btnListen.addEventListener('click', startListening);\n        btnStop.addEventListener('click', stopListening);\n        \n        log('✅ Frontend initialized. Say \"Hanuman\" to wake! (Fuzzy matching enabled)', 'info');\n    </script>\n</body>\n</html>\n\"\"\"\n\n# ============================================================================\n# MAIN EXECUTION\n# ============================================================================\n\nif __name__ == '__main__':\n    logger.info(\"\"\"\n    ╔════════════════════════════════════════════════════════════════════════════════╗\n    ║             🔱 PROJECT HANUMAN - DIVINE VOICE ASSISTANT 🔱                   ║\n    ║                                                                                ║\n    ║  Starting server on http://localhost:5000                                     ║\n    ║                                                                                ║\n    ║  ✨ NEW: FUZZY COMMAND MATCHING for ALL commands!                             ║\n    ║  Try mishearings like: \"agya\", \"hassya\", \"khoj mode\", \"rok\", etc.           ║\n    ║                                                                                ║\n    ║  Commands:                                                                    ║\n    ║  - Say \"Hanuman\" to wake up                                                  ║\n    ║  - Choose: Aagya, Hasya, Yudha, Gandharva, or Khoj                           ║\n    ║  - Say \"Help\" for detailed guide                                             ║\n    ║  - Say \"Exit\" to return to main menu                                         ║\n    ║                                                                                ║\n    ║  Jai Shri Ram! 🙏                                                             ║\n    ╚════════════════════════════════════════════════════════════════════════════════╝\n    \"\"\")\n    \n    try:\n        logger.info(f\"Starting Flask server on {CONFIG.FLASK_HOST}:{CONFIG.FLASK_PORT}\")\n        app.run(\n            host=CONFIG.FLASK_HOST,\n            port=CONFIG.FLASK_PORT,\n            debug=CONFIG.DEBUG,\n            use_reloader=False\n        )\n    except KeyboardInterrupt:\n        logger.info(\"\\n🙏 Hanuman returns to meditation. Jai Shri Ram!\")\n        sys.exit(0)\n    except Exception as e:\n        logger.error(f\"Fatal error: {e}\")\n        sys.exit(1)\n", "sha": "7d3dcdeed1a8adf46e23f846ead8f16862abc211", "_tool_input_summary": "Updating main.py to add comprehensive fuzzy matching for all commands including modes (Aagya, Hasya, Yudha, Gandharva, Khoj), actions (Help, Exit), and game moves (Rock, Paper, Scissors) with fuzzy variations.", "_requires_user_approval": true}
\ No newline at end of file
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from datetime import datetime
+from functools import lru_cache, wraps
+from typing import Optional, Callable, Dict, List, Tuple, Any
+from dataclasses import dataclass, field
+from dotenv import load_dotenv
+from difflib import SequenceMatcher
+
+# Web Framework
+from flask import Flask, Response, request, jsonify, render_template_string, send_file, stream_with_context
+from flask_cors import CORS
+
+# Speech Recognition
+import speech_recognition as sr
+
+# Local Whisper models are imported lazily by the model registry
+from stt_models import LOAD_MODES, ModelRegistry
+
+try:
+    import vosk
+    HAS_VOSK = True
+except ImportError:
+    HAS_VOSK = False
+
+# Audio Processing
+try:
+    from pydub import AudioSegment
+    HAS_PYDUB = True
+except ImportError:
+    HAS_PYDUB = False
+
+# Text Processing
+from fuzzywuzzy import process as fuzzy_process
+from fuzzy_matcher import CompiledMatcher, MatchResult
+
+# Per-session state
+from session_store import SessionStore
+
+# Parallel engine execution
+from engine_runner import Engine, EngineRunner
+
+# Streaming voice pipeline
+from streaming import StreamRegistry, SentenceChunker, run_pipeline
+
+# TTS audio cache
+from tts_cache import TTSCache
+
+# Pooled outbound HTTP with deadlines and circuit breakers
+from http_client import CircuitBreaker, CircuitOpen, DeadlineExceeded, HTTPClient, Upstream, model_gone
+
+# Token-budgeted conversation memory for LLM context
+from conversation_memory import ConversationMemory
+
+# Shared TTL/LRU cache for search and music lookups
+from result_cache import ResultCache, normalize_query
+
+# Per-stage latency histograms and the /metrics endpoint
+from metrics import (REGISTRY, note, note_add, stage, timed_iter, timed_request,
+                     request_timings, current_timings, carry_timings)
+
+# YouTube
+try:
+    from youtube_search import YoutubeSearch
+    HAS_YOUTUBE = True
+except ImportError:
+    HAS_YOUTUBE = False
+
+# ElevenLabs TTS
+try:
+    from elevenlabs.client import ElevenLabs
+    HAS_ELEVENLABS = True
+except ImportError:
+    HAS_ELEVENLABS = False
+
+# Load environment
+load_dotenv()
+
+# ============================================================================
+# LOGGING SETUP
+# ============================================================================
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('HANUMAN')
+
+# ============================================================================
+# CONFIGURATION & CONSTANTS
+# ============================================================================
+
+# TTS_PRERENDER: every static clip, the PRERENDER_SHORTEST shortest, or none
+PRERENDER_MODES = ('all', 'short', 'none')
+PRERENDER_SHORTEST = 5
+
+@dataclass
+class Config:
+    """Application configuration with API validation"""
+    GROQ_API_KEY: str = field(default_factory=lambda: os.getenv('GROQ_API_KEY', ''))
+    ELEVENLABS_API_KEY: str = field(default_factory=lambda: os.getenv('ELEVENLABS_API_KEY', ''))
+    TAVILY_API_KEY: str = field(default_factory=lambda: os.getenv('TAVILY_API_KEY', ''))
+    HF_TOKEN: str = field(default_factory=lambda: os.getenv('HUGGINGFACE_TOKEN', ''))
+    
+    FLASK_HOST: str = '0.0.0.0'
+    FLASK_PORT: int = 5000
+    DEBUG: bool = os.getenv('DEBUG', 'False').lower() == 'true'
+    
+    # Per-browser session table
+    SESSION_MAX: int = field(default_factory=lambda: int(os.getenv('SESSION_MAX', '1000')))
+    SESSION_IDLE_TTL: int = field(default_factory=lambda: int(os.getenv('SESSION_IDLE_TTL', '1800')))
+    SESSION_HISTORY_LIMIT: int = field(default_factory=lambda: int(os.getenv('SESSION_HISTORY_LIMIT', '50')))
+    SESSION_COOKIE: str = 'hanuman_sid'
+    
+    # STT execution: sequential | hedged | race
+    STT_STRATEGY: str = field(default_factory=lambda: os.getenv('STT_STRATEGY', 'hedged').lower())
+    STT_HEDGE_DELAY_MS: int = field(default_factory=lambda: int(os.getenv('STT_HEDGE_DELAY_MS', '1500')))
+    STT_ENGINE_TIMEOUT: float = field(default_factory=lambda: float(os.getenv('STT_ENGINE_TIMEOUT', '8')))
+    STT_REQUEST_TIMEOUT: float = field(default_factory=lambda: float(os.getenv('STT_REQUEST_TIMEOUT', '12')))
+    ENGINE_POOL_WORKERS: int = field(default_factory=lambda: int(os.getenv('ENGINE_POOL_WORKERS', '8')))
+    STT_POOL_WORKERS: int = field(default_factory=lambda: int(os.getenv('STT_POOL_WORKERS', '12')))
+    
+    # Local STT model: faster-whisper | whisper | none, loaded lazy | background | preload
+    STT_LOCAL_BACKEND: str = field(default_factory=lambda: os.getenv('STT_LOCAL_BACKEND', 'faster-whisper').lower())
+    STT_MODEL_SIZE: str = field(default_factory=lambda: os.getenv('STT_MODEL_SIZE', 'base'))
+    STT_COMPUTE_TYPE: str = field(default_factory=lambda: os.getenv('STT_COMPUTE_TYPE', 'int8'))
+    STT_CPU_THREADS: int = field(default_factory=lambda: int(os.getenv('STT_CPU_THREADS', '0')))
+    STT_DEVICE: str = field(default_factory=lambda: os.getenv('STT_DEVICE', 'cpu'))
+    STT_LOAD: str = field(default_factory=lambda: os.getenv('STT_LOAD', 'background').lower())
+    
+    # Streaming turns: chunked upload, streamed LLM, sentence-by-sentence TTS
+    STREAMING_MODE: bool = field(default_factory=lambda: os.getenv('STREAMING_MODE', 'True').lower() == 'true')
+    STREAM_CHUNK_MS: int = field(default_factory=lambda: int(os.getenv('STREAM_CHUNK_MS', '500')))
+    
+    # Synthesized speech cache (content-addressed, LRU within the byte budget)
+    TTS_CACHE_DIR: str = field(default_factory=lambda: os.getenv('TTS_CACHE_DIR', 'audio_files/tts'))
+    TTS_CACHE_MAX_MB: int = field(default_factory=lambda: int(os.getenv('TTS_CACHE_MAX_MB', '200')))
+    TTS_PRERENDER: str = field(default_factory=lambda: {'true': 'all', 'false': 'none'}.get(
+        os.getenv('TTS_PRERENDER', 'short').lower(), os.getenv('TTS_PRERENDER', 'short').lower()))
+    
+    # Upstream deadlines (seconds per turn) and circuit breaker
+    LLM_DEADLINE: float = field(default_factory=lambda: float(os.getenv('LLM_DEADLINE', '15')))
+    TAVILY_DEADLINE: float = field(default_factory=lambda: float(os.getenv('TAVILY_DEADLINE', '10')))
+    TTS_TIMEOUT: float = field(default_factory=lambda: float(os.getenv('TTS_TIMEOUT', '20')))
+    BREAKER_FAILURES: int = field(default_factory=lambda: int(os.getenv('BREAKER_FAILURES', '3')))
+    BREAKER_COOLDOWN: float = field(default_factory=lambda: float(os.getenv('BREAKER_COOLDOWN', '30')))
+    BREAKER_DEAD_COOLDOWN: float = field(default_factory=lambda: float(os.getenv('BREAKER_DEAD_COOLDOWN', '600')))
+    
+    # Conversation memory sent with Aagya/Hasya LLM calls
+    MEMORY_TURNS: int = field(default_factory=lambda: int(os.getenv('MEMORY_TURNS', '8')))
+    MEMORY_TOKEN_BUDGET: int = field(default_factory=lambda: int(os.getenv('MEMORY_TOKEN_BUDGET', '1000')))
+    MEMORY_SUMMARY_TOKENS: int = field(default_factory=lambda: int(os.getenv('MEMORY_SUMMARY_TOKENS', '200')))
+    MEMORY_SUMMARIZE_EVERY: int = field(default_factory=lambda: int(os.getenv('MEMORY_SUMMARIZE_EVERY', '4')))
+    
+    # Khoj / Gandharva result cache (memory LRU + sqlite file shared across restarts)
+    RESULT_CACHE_PATH: str = field(default_factory=lambda: os.getenv('RESULT_CACHE_PATH', 'cache/results.sqlite3'))
+    RESULT_CACHE_ENTRIES: int = field(default_factory=lambda: int(os.getenv('RESULT_CACHE_ENTRIES', '512')))
+    KHOJ_CACHE_TTL: int = field(default_factory=lambda: int(os.getenv('KHOJ_CACHE_TTL', '21600')))
+    MUSIC_CACHE_TTL: int = field(default_factory=lambda: int(os.getenv('MUSIC_CACHE_TTL', '86400')))
+    
+    # Per-stage timing breakdown in every /process_voice response (else only with ?timings=1)
+    TIMINGS_IN_RESPONSE: bool = field(default_factory=lambda: os.getenv('TIMINGS_IN_RESPONSE', 'False').lower() == 'true')
+    
+    def validate(self):
+        """Validate required API keys"""
+        errors = []
+        
+        if not self.GROQ_API_KEY or 'your_' in self.GROQ_API_KEY:
+            errors.append("❌ GROQ_API_KEY missing or placeholder")
+        if not self.ELEVENLABS_API_KEY or 'your_' in self.ELEVENLABS_API_KEY:
+            errors.append("❌ ELEVENLABS_API_KEY missing or placeholder")
+        if not self.TAVILY_API_KEY or 'your_' in self.TAVILY_API_KEY:
+            errors.append("⚠️  TAVILY_API_KEY missing (Khoj mode limited)")
+        if self.STT_LOAD not in LOAD_MODES:
+            errors.append(f"⚠️  STT_LOAD '{self.STT_LOAD}' unknown (use {', '.join(LOAD_MODES)}); loading lazily")
+        if self.TTS_PRERENDER not in PRERENDER_MODES:
+            errors.append(f"⚠️  TTS_PRERENDER '{self.TTS_PRERENDER}' unknown (use {', '.join(PRERENDER_MODES)}); not pre-rendering")
+        
+        if errors:
+            logger.warning("\n".join(errors))
+            if not self.GROQ_API_KEY or not self.ELEVENLABS_API_KEY:
+                raise ValueError("Critical API keys missing!")
+        
+        logger.info("✅ API Configuration validated")
+        return True
+
+# Initialize config
+CONFIG = Config()
+CONFIG.validate()
+
+# Shared worker pool for engines that run off the request thread
+ENGINE_POOL = ThreadPoolExecutor(
+    max_workers=CONFIG.ENGINE_POOL_WORKERS,
+    thread_name_prefix='hanuman-engine'
+)
+
+# STT engines get their own workers, so streamed TTS, partial decodes and
+# background summaries can't leave a hedged/race engine waiting in the queue
+STT_POOL = ThreadPoolExecutor(
+    max_workers=CONFIG.STT_POOL_WORKERS,
+    thread_name_prefix='hanuman-stt'
+)
+
+# One keep-alive session per upstream host, shared by all request threads
+HTTP = HTTPClient(
+    [
+        Upstream('groq', 'https://api.groq.com/openai/v1',
+                 deadline=CONFIG.LLM_DEADLINE, pool_size=CONFIG.ENGINE_POOL_WORKERS),
+        Upstream('tavily', 'https://api.tavily.com',
+                 deadline=CONFIG.TAVILY_DEADLINE, pool_size=CONFIG.ENGINE_POOL_WORKERS)
+    ],
+    CircuitBreaker(
+        failure_threshold=CONFIG.BREAKER_FAILURES,
+        cooldown=CONFIG.BREAKER_COOLDOWN,
+        dead_cooldown=CONFIG.BREAKER_DEAD_COOLDOWN
+    )
+)
+
+# Every STT engine / LLM model / TTS voice attempt, whichever request it served
+ENGINE_SECONDS = REGISTRY.histogram(
+    'hanuman_engine_seconds',
+    'Latency of each engine attempt (outcome: ok, empty, error or HTTP status)',
+    ['kind', 'engine', 'outcome']
+)
+TTS_BACKOFF_SECONDS = REGISTRY.counter('hanuman_tts_backoff_seconds', 'Time slept between TTS retries')
+
+def timed_engine(kind: str, name: str, fn: Callable) -> Callable:
+    """Wrap an engine function so each call is observed in ENGINE_SECONDS"""
+    @wraps(fn)
+    def timed(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            result = fn(*args, **kwargs)
+            outcome = 'ok' if result else 'empty'
+            return result
+        finally:
+            ENGINE_SECONDS.observe(time.perf_counter() - started, kind=kind, engine=name, outcome=outcome)
+    return timed
+
+# Wake word detection
+WAKE_WORDS_PRIMARY = ['hanuman', 'hey hanuman', 'o hanuman', 'jai hanuman']
+WAKE_WORDS_FUZZY = ['anuman', 'hanoman', 'human', 'humanan', 'hanumanji', 
+                     'hanaman', 'hunuman', 'hanauman', 'hanunam', 'ha numan']
+WAKE_WORDS_PARTIAL = ['hanuman', 'anuman', 'human']
+WAKE_WORD_THRESHOLD = 75  # Fuzzy matching threshold
+
+# ============================================================================
+# FUZZY COMMAND MATCHING ENGINE
+# ============================================================================
+
+class FuzzyCommandMatcher:
+    """Ultra-smart fuzzy matching for all commands and variations"""
+    
+    # Command variations map
+    COMMAND_VARIATIONS = {
+        'aagya': {
+            'primary': ['aagya', 'aagya mode', 'command', 'chat', 'talk', 'ask', 'answer'],
+            'fuzzy': ['agya', 'aagya', 'agyaa', 'ayga', 'command mode', 'chatting', 
+                     'talking', 'asking', 'advice', 'question', 'knowledge']
+        },
+        'hasya': {
+            'primary': ['hasya', 'hasya mode', 'joke', 'jokes', 'laugh', 'funny', 'humor', 'comedy'],
+            'fuzzy': ['hassa', 'hasya mode', 'joke mode', 'joking', 'laughing', 'funny mode',
+                     'humorous', 'comic', 'ha ha', 'laughter', 'prank', 'pranks']
+        },
+        'yudha': {
+            'primary': ['yudha', 'yudha mode', 'game', 'play', 'battle', 'fight', 'rock', 'paper', 'scissors'],
+            'fuzzy': ['yudh', 'yudhha', 'yudha mode', 'game mode', 'playing', 'battling',
+                     'fighting', 'gaming', 'rps', 'stone', 'cloth', 'paper scissors']
+        },
+        'gandharva': {
+            'primary': ['gandharva', 'gandharva mode', 'music', 'song', 'play song', 'singing', 'songs'],
+            'fuzzy': ['gandharv', 'gandharva mode', 'music mode', 'song mode', 'songs playing',
+                     'musical', 'melody', 'tune', 'audio', 'sound', 'entertainment']
+        },
+        'khoj': {
+            'primary': ['khoj', 'khoj mode', 'search', 'find', 'web', 'information', 'research', 'google'],
+            'fuzzy': ['khoj mode', 'search mode', 'finding', 'research mode', 'searching',
+                     'information mode', 'knowledge search', 'lookup', 'inquire']
+        },
+        'help': {
+            'primary': ['help', 'guide', 'help me', 'how to', 'instructions'],
+            'fuzzy': ['help mode', 'helping', 'guideline', 'guide me', 'instruction',
+                     'tutorial', 'how do i', 'what to do']
+        },
+        'exit': {
+            'primary': ['exit', 'quit', 'leave', 'back', 'go back', 'stop'],
+            'fuzzy': ['exits', 'exiting', 'quit mode', 'leaving', 'go to main', 'return']
+        },
+        'rock': {
+            'primary': ['rock', 'patthar', 'pathar', 'stone', 'boulder'],
+            'fuzzy': ['rok', 'roack', 'patthar', 'pathar', 'roc', 'rocks', 'stonee']
+        },
+        'paper': {
+            'primary': ['paper', 'kagaz', 'kagaj', 'cloth'],
+            'fuzzy': ['papper', 'papar', 'papeer', 'kagaz', 'kagaj', 'paper sheet']
+        },
+        'scissors': {
+            'primary': ['scissors', 'kenchi', 'kainchi', 'scissor', 'cuts'],
+            'fuzzy': ['scissor', 'scizzors', 'kenchi', 'kainchi', 'kainchi', 'cutting']
+        }
+    }
+    
+    THRESHOLD_COMMAND = 70  # Command mode threshold
+    THRESHOLD_MOVE = 75     # Game move threshold
+    THRESHOLD_ACTION = 70   # General action threshold
+    
+    MODES = ('aagya', 'hasya', 'yudha', 'gandharva', 'khoj')
+    MOVES = ('rock', 'paper', 'scissors')
+    
+    @staticmethod
+    def analyze(text: str) -> MatchResult:
+        """Normalize + exact-scan an utterance once; fuzzy scores are shared by every check below"""
+        return COMMAND_MATCHER.analyze(text)
+    
+    @staticmethod
+    @stage('match')
+    def match_command(text: str, command_type: str) -> Tuple[Optional[str], int]:
+        """
+        Fuzzy match a command with confidence score
+        Returns: (matched_command, confidence_score_0_to_100)
+        """
+        if command_type not in FuzzyCommandMatcher.COMMAND_VARIATIONS:
+            return None, 0
+        
+        match = FuzzyCommandMatcher.analyze(text)
+        score = match.score(command_type, FuzzyCommandMatcher.THRESHOLD_COMMAND)
+        if not score:
+            return None, 0
+        
+        variant = match.exact(command_type)
+        if variant:
+            logger.info(f"✅ Exact match: '{variant}' in '{match.text}'")
+        else:
+            logger.info(f"✅ Fuzzy match: '{match.fuzzy(command_type)[0]}' ({score}%) for command '{command_type}'")
+        return command_type, score
+    
+    @staticmethod
+    @stage('match')
+    def detect_all_modes(text: str) -> Tuple[Optional[str], int]:
+        """
+        Detect which mode user wants (fuzzy across all modes)
+        """
+        return FuzzyCommandMatcher.analyze(text).best(
+            FuzzyCommandMatcher.MODES,
+            FuzzyCommandMatcher.THRESHOLD_COMMAND
+        )
+    
+    @staticmethod
+    @stage('match')
+    def detect_move(text: str) -> Tuple[Optional[str], int]:
+        """
+        Detect rock/paper/scissors move
+        """
+        return FuzzyCommandMatcher.analyze(text).best(
+            FuzzyCommandMatcher.MOVES,
+            FuzzyCommandMatcher.THRESHOLD_COMMAND,
+            FuzzyCommandMatcher.THRESHOLD_MOVE
+        )
+    
+    @staticmethod
+    @stage('match')
+    def detect_intent(text: str, mode: str) -> Tuple[Optional[str], int]:
+        """
+        Everything process() asks of one utterance, in one pass: exit or
+        help in any mode, then the wake word (idle), a mode (active) or a
+        move (yudha). Returns (intent, confidence) or (None, 0)
+        """
+        tiers = [
+            (('exit',), FuzzyCommandMatcher.THRESHOLD_ACTION),
+            (('help',), FuzzyCommandMatcher.THRESHOLD_ACTION)
+        ]
+        if mode == 'idle':
+            tiers.append((('wake',), WakeWordDetector.THRESHOLD))
+        elif mode == 'active':
+            tiers.append((FuzzyCommandMatcher.MODES, FuzzyCommandMatcher.THRESHOLD_COMMAND))
+        elif mode == 'yudha':
+            tiers.append((FuzzyCommandMatcher.MOVES, FuzzyCommandMatcher.THRESHOLD_COMMAND,
+                          FuzzyCommandMatcher.THRESHOLD_MOVE))
+        
+        match = FuzzyCommandMatcher.analyze(text)
+        intent, confidence = match.best_intent(tiers)
+        
+        # Wake word key phrases count anywhere in the utterance
+        if not intent and mode == 'idle' and any(match.contains(w) for w in WAKE_WORDS_PARTIAL):
+            return 'wake', 85
+        return intent, confidence
+    
+    @staticmethod
+    @stage('match')
+    def is_exit_command(text: str) -> bool:
+        """Check if user wants to exit"""
+        return FuzzyCommandMatcher.analyze(text).score('exit', FuzzyCommandMatcher.THRESHOLD_ACTION) >= 70
+    
+    @staticmethod
+    @stage('match')
+    def is_help_command(text: str) -> bool:
+        """Check if user wants help"""
+        return FuzzyCommandMatcher.analyze(text).score('help', FuzzyCommandMatcher.THRESHOLD_ACTION) >= 70
+
+# ============================================================================
+# ENHANCED WAKE WORD DETECTION (with fuzzy)
+# ============================================================================
+
+class WakeWordDetector:
+    """Advanced fuzzy wake word detection"""
+    
+    THRESHOLD = 75
+    
+    @staticmethod
+    @stage('match')
+    def detect(text: str) -> Tuple[bool, int]:
+        """
+        Detect wake word with fuzzy matching
+        Returns: (is_wake_word, confidence_0_to_100)
+        """
+        match = FuzzyCommandMatcher.analyze(text)
+        
+        # Exact matches (primary)
+        wake_word = match.exact('wake')
+        if wake_word:
+            logger.info(f"✅ Wake word detected (exact): {wake_word}")
+            return True, 100
+        
+        # Fuzzy matching for typos/mistranscriptions (whole-utterance ratio)
+        _, best_score = match.fuzzy('wake')
+        
+        if best_score >= WakeWordDetector.THRESHOLD:
+            logger.info(f"✅ Wake word detected (fuzzy {best_score}%): '{match.text}'")
+            return True, best_score
+        
+        # Partial matching on key phrases
+        if any(match.contains(w) for w in WAKE_WORDS_PARTIAL):
+            logger.info(f"✅ Wake word detected (partial): '{match.text}'")
+            return True, 85
+        
+        return False, best_score
+
+# Every command table compiled once: one automaton for exact hits, memoised fuzzy scores
+COMMAND_MATCHER = CompiledMatcher(
+    dict(FuzzyCommandMatcher.COMMAND_VARIATIONS, wake={
+        'primary': WAKE_WORDS_PRIMARY,
+        'fuzzy': WAKE_WORDS_FUZZY
+    }),
+    scorers={'wake': 'ratio'},
+    keywords=WAKE_WORDS_PARTIAL
+)
+
+# ============================================================================
+# SPEECH-TO-TEXT ENGINE
+# ============================================================================
+
+class STTEngine:
+    """Multi-model STT with sequential / hedged / race execution"""
+    
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+        self.recognizer.energy_threshold = 4000
+        self.models = ModelRegistry(
+            backend=CONFIG.STT_LOCAL_BACKEND,
+            size=CONFIG.STT_MODEL_SIZE,
+            compute_type=CONFIG.STT_COMPUTE_TYPE,
+            cpu_threads=CONFIG.STT_CPU_THREADS,
+            device=CONFIG.STT_DEVICE
+        )
+        self.runner = EngineRunner(
+            [
+                Engine(name, timed_engine('stt', name, fn)) for name, fn in (
+                    ('groq_whisper', self.transcribe_groq_whisper),
+                    ('local_whisper', self.transcribe_local_whisper),
+                    ('google', self.transcribe_google)
+                )
+            ],
+            STT_POOL,
+            strategy=CONFIG.STT_STRATEGY,
+            hedge_delay=CONFIG.STT_HEDGE_DELAY_MS / 1000,
+            engine_timeout=CONFIG.STT_ENGINE_TIMEOUT,
+            request_timeout=CONFIG.STT_REQUEST_TIMEOUT
+        )
+    
+    def transcribe_groq_whisper(self, audio_path: str) -> Optional[str]:
+        """Transcribe using Groq Whisper (fastest, best quality)"""
+        try:
+            with open(audio_path, 'rb') as audio_file:
+                response = HTTP.post(
+                    'groq', '/audio/transcriptions',
+                    breaker_key='groq:whisper-large-v3',
+                    deadline=time.monotonic() + CONFIG.STT_ENGINE_TIMEOUT,
+                    headers={'Authorization': f'Bearer {CONFIG.GROQ_API_KEY}'},
+                    files={'file': audio_file},
+                    data={'model': 'whisper-large-v3'}
+                )
+            
+            if response.status_code == 200:
+                text = response.json().get('text', '').strip()
+                if text and len(text) > 2:
+                    logger.info(f"🎯 Groq Whisper: {text}")
+                    return text
+        except Exception as e:
+            logger.warning(f"Groq Whisper failed: {e}")
+        
+        return None
+    
+    def transcribe_google(self, audio_path: str) -> Optional[str]:
+        """Fallback: Google Speech Recognition"""
+        try:
+            with sr.AudioFile(audio_path) as source:
+                audio = self.recognizer.record(source)
+            
+            text = self.recognizer.recognize_google(audio).strip()
+            if text and len(text) > 2:
+                logger.info(f"🎯 Google STT: {text}")
+                return text
+        except Exception as e:
+            logger.warning(f"Google STT failed: {e}")
+        
+        return None
+    
+    def transcribe_local_whisper(self, audio_path: str) -> Optional[str]:
+        """Fallback: local model from the registry (loaded on first use)"""
+        try:
+            text = self.models.transcribe(audio_path)
+            if text and len(text) > 2:
+                logger.info(f"🎯 Local Whisper: {text}")
+                return text
+        except Exception as e:
+            logger.warning(f"Local Whisper failed: {e}")
+        
+        return None
+    
+    def transcribe_partial(self, audio: bytes) -> Optional[str]:
+        """Streaming: decode an in-memory (possibly partial) recording locally"""
+        try:
+            text = self.models.transcribe(audio, beam_size=1)
+            if text and len(text) > 2:
+                logger.info(f"🎯 Local partial: {text}")
+                return text
+        except Exception as e:
+            logger.warning(f"Local partial transcription failed: {e}")
+        
+        return None
+    
+    @stage('stt')
+    def transcribe(self, audio_path: str) -> Optional[str]:
+        """
+        Transcription across engines in preference order
+        1. Groq Whisper (fastest, best quality)
+        2. Local Whisper
+        3. Google Speech Recognition
+        
+        STT_STRATEGY decides whether fallbacks wait for a failure (sequential),
+        start after STT_HEDGE_DELAY_MS (hedged) or run at once (race).
+        """
+        engine, result = self.runner.run(audio_path)
+        note(stt_engine=engine if result else None)
+        if result:
+            logger.info(f"🏁 STT answered by {engine}")
+            return result
+        
+        logger.error("❌ All STT methods failed")
+        return None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Per-engine latency percentiles and win rates, plus local model state"""
+        return dict(self.runner.stats(), local_model=self.models.stats())
+
+stt_engine = STTEngine()
+
+if CONFIG.STT_LOAD == 'preload':
+    # Load before workers fork so they share the weights copy-on-write
+    stt_engine.models.get()
+
+# ============================================================================
+# TEXT-TO-SPEECH ENGINE
+# ============================================================================
+
+class TTSEngine:
+    """ElevenLabs TTS with robust retry logic, served from a content-addressed cache"""
+    
+    MODEL_ID = 'eleven_turbo_v2'
+    
+    def __init__(self):
+        self.client = None
+        self.voice_order = ['Hanuman', 'Rachel', 'Antoni', 'Elli', 'Arnold']
+        self.max_retries = 3
+        self.retry_delay = 0.5
+        self.cache = TTSCache(CONFIG.TTS_CACHE_DIR, CONFIG.TTS_CACHE_MAX_MB * 1024 * 1024)
+        self._prerender_lock = threading.Lock()
+        self._prerender_thread: Optional[threading.Thread] = None
+        
+        if HAS_ELEVENLABS:
+            try:
+                # The SDK keeps one pooled keep-alive connection set per client
+                self.client = ElevenLabs(api_key=CONFIG.ELEVENLABS_API_KEY, timeout=CONFIG.TTS_TIMEOUT)
+                logger.info("✅ ElevenLabs client initialized")
+            except Exception as e:
+                logger.error(f"ElevenLabs init failed: {e}")
+    
+    def cache_key(self, text: str, voice_name: str) -> str:
+        voice_id = ELEVENLABS_VOICES.get(voice_name, "iHH6IS4rB3R9HSWIJNzL")
+        return TTSCache.key(text, voice_id, self.MODEL_ID)
+    
+    @stage('tts')
+    def generate_tts(self, text: str, voice_name: str = "Hanuman") -> Optional[str]:
+        """
+        Cached clip for (text, voice), synthesizing it on a miss.
+        Concurrent requests for the same clip share one API call.
+        """
+        path = self.cache.get_or_create(
+            self.cache_key(text, voice_name),
+            lambda: self._synthesize(text, voice_name)
+        )
+        return str(path) if path else None
+    
+    def _allowed_voice(self, start: int) -> Optional[int]:
+        """Index of the first voice from start on whose circuit lets a call through"""
+        for idx in range(start, len(self.voice_order)):
+            if HTTP.breaker.allow(f'elevenlabs:{self.voice_order[idx]}'):
+                return idx
+        return None
+    
+    def _synthesize(self, text: str, voice_name: str) -> Optional[Path]:
+        """
+        Generate speech with retry logic
+        Falls back through voice options
+        """
+        if not self.client:
+            logger.error("ElevenLabs not available")
+            return None
+        
+        current_voice_idx = self.voice_order.index(voice_name) if voice_name in self.voice_order else 0
+        
+        for attempt in range(self.max_retries):
+            # Every attempt asks the voice's breaker first (a half-open voice
+            # gets one trial call) and moves on to the next voice if it's open
+            voice_idx = self._allowed_voice(current_voice_idx)
+            if voice_idx is None:
+                logger.warning("TTS skipped: circuits open for every remaining voice")
+                break
+            current_voice_idx = voice_idx
+            
+            started = time.perf_counter()
+            outcome = 'error'
+            note_add(tts_attempts=1)
+            try:
+                current_voice = self.voice_order[current_voice_idx]
+                voice_id = ELEVENLABS_VOICES.get(current_voice, "iHH6IS4rB3R9HSWIJNzL")
+                
+                logger.info(f"TTS attempt {attempt+1} with {current_voice}...")
+                
+                audio = b''.join(self.client.text_to_speech.convert(
+                    text=text,
+                    voice_id=voice_id,
+                    model_id=self.MODEL_ID
+                ))
+                
+                HTTP.breaker.success(f'elevenlabs:{current_voice}')
+                outcome = 'ok' if len(audio) > 500 else 'empty'
+                ENGINE_SECONDS.observe(time.perf_counter() - started, kind='tts', engine=current_voice, outcome=outcome)
+                if len(audio) > 500:
+                    # A fallback voice is cached under its own key, so the
+                    # requested voice is tried again next time
+                    filepath = self.cache.put(self.cache_key(text, current_voice), audio)
+                    logger.info(f"✅ TTS generated: {filepath.name}")
+                    return filepath
+                
+            except Exception as e:
+                logger.warning(f"TTS attempt {attempt+1} failed: {e}")
+                if outcome == 'error':  # not already observed
+                    ENGINE_SECONDS.observe(time.perf_counter() - started, kind='tts', engine=current_voice, outcome=outcome)
+                HTTP.breaker.failure(f'elevenlabs:{current_voice}')
+                backoff = self.retry_delay * (attempt + 1)
+                TTS_BACKOFF_SECONDS.inc(backoff)
+                note_add(tts_backoff_ms=round(backoff * 1000))
+                time.sleep(backoff)
+                
+                # Switch voice on last retry
+                if attempt == self.max_retries - 1 and current_voice_idx < len(self.voice_order) - 1:
+                    current_voice_idx += 1
+                    logger.info(f"Switching to {self.voice_order[current_voice_idx]}...")
+        
+        logger.error("❌ TTS failed after all retries")
+        return None
+    
+    def prerender(self, phrases: List[str]) -> None:
+        """Synthesize fixed phrases ahead of time (skips ones already cached)"""
+        if not self.client:
+            return
+        started = time.monotonic()
+        rendered = 0
+        for phrase in phrases:
+            key = self.cache_key(phrase, 'Hanuman')
+            if key in self.cache:
+                continue
+            # Straight to the render, so startup doesn't count as cache misses
+            if self.cache.flight.do(key, lambda: self._synthesize(phrase, 'Hanuman')):
+                rendered += 1
+        logger.info(f"🔊 Pre-rendered {rendered} static phrases in {time.monotonic() - started:.1f}s")
+    
+    def prerender_in_background(self, phrases: Callable[[], List[str]]) -> None:
+        """Run prerender(phrases()) once, in a daemon thread"""
+        with self._prerender_lock:
+            if self._prerender_thread:
+                return
+            self._prerender_thread = threading.Thread(
+                target=lambda: self.prerender(phrases()), name='tts-prerender', daemon=True
+            )
+            self._prerender_thread.start()
+
+ELEVENLABS_VOICES = {
+    "Hanuman": "iHH6IS4rB3R9HSWIJNzL",
+    "Rachel": "21m00Tcm4TlvDq8ikWAM",
+    "Antoni": "ErXwobaYiN019PkySvjV",
+    "Elli": "MF3mGyEYCl7XYWbV9V6O",
+    "Arnold": "VR6AewLTigWG4xSOukaG"
+}
+
+tts_engine = TTSEngine()
+
+# ============================================================================
+# LLM INTEGRATION
+# ============================================================================
+
+class LLMEngine:
+    """Groq LLM with fallback models"""
+    
+    MODELS = [
+        'mixtral-8x7b-32768',
+        'llama2-70b-4096',
+        'gemma-7b-it'
+    ]
+    
+    FALLBACK_REPLY = "Kshama karen, mitra. Ram's network is weak right now."
+    
+    @staticmethod
+    def messages(user_text: str, system_prompt: str, history: Optional[List[Dict]] = None) -> List[Dict]:
+        """System prompt, then earlier conversation (if any), then the new question"""
+        return [
+            {'role': 'system', 'content': system_prompt},
+            *(history or []),
+            {'role': 'user', 'content': user_text}
+        ]
+    
+    @staticmethod
+    @stage('llm')
+    def chat(user_text: str, system_prompt: str, temperature: float = 0.7,
+             history: Optional[List[Dict]] = None) -> Optional[str]:
+        """Chat with Groq LLMs, skipping models whose circuit is open"""
+        
+        deadline = HTTP.deadline('groq')
+        failures = 0
+        for model in LLMEngine.MODELS:
+            started = time.perf_counter()
+            outcome = 'error'
+            try:
+                logger.info(f"Calling LLM: {model}")
+                
+                response = HTTP.post(
+                    'groq', '/chat/completions',
+                    breaker_key=f'groq:{model}',
+                    deadline=deadline,
+                    dead_if=model_gone,
+                    headers={'Authorization': f'Bearer {CONFIG.GROQ_API_KEY}'},
+                    json={
+                        'model': model,
+                        'messages': LLMEngine.messages(user_text, system_prompt, history),
+                        'max_tokens': 500,
+                        'temperature': temperature
+                    }
+                )
+                
+                outcome = str(response.status_code)
+                if response.status_code == 200:
+                    reply = response.json()['choices'][0]['message']['content'].strip()
+                    outcome = 'ok'
+                    logger.info(f"✅ LLM reply ({model}): {reply[:50]}...")
+                    note(llm_model=model, llm_failures=failures)
+                    return reply
+                else:
+                    logger.warning(f"{model} failed: {response.status_code}")
+            
+            except CircuitOpen:
+                outcome = 'circuit_open'
+                logger.info(f"⏭️  {model} skipped (circuit open)")
+                continue
+            except DeadlineExceeded:
+                outcome = 'deadline'
+                logger.warning(f"LLM deadline of {CONFIG.LLM_DEADLINE:.0f}s reached")
+                break
+            except Exception as e:
+                logger.warning(f"{model} error: {e}")
+                continue
+            finally:
+                ENGINE_SECONDS.observe(time.perf_counter() - started, kind='llm', engine=model, outcome=outcome)
+                failures += outcome != 'ok'
+        
+        logger.error("❌ All LLM models failed")
+        note(llm_model=None, llm_failures=failures)
+        return LLMEngine.FALLBACK_REPLY
+    
+    @staticmethod
+    @timed_iter('llm')
+    def chat_stream(user_text: str, system_prompt: str, temperature: float = 0.7,
+                    history: Optional[List[Dict]] = None):
+        """Chat with Groq LLMs, yielding the reply as text deltas"""
+        
+        deadline = HTTP.deadline('groq')
+        failures = 0
+        for model in LLMEngine.MODELS:
+            started = False
+            began = time.perf_counter()
+            outcome = 'error'
+            try:
+                logger.info(f"Streaming LLM: {model}")
+                
+                response = HTTP.post(
+                    'groq', '/chat/completions',
+                    breaker_key=f'groq:{model}',
+                    deadline=deadline,
+                    dead_if=model_gone,
+                    headers={'Authorization': f'Bearer {CONFIG.GROQ_API_KEY}'},
+                    json={
+                        'model': model,
+                        'messages': LLMEngine.messages(user_text, system_prompt, history),
+                        'max_tokens': 500,
+                        'temperature': temperature,
+                        'stream': True
+                    },
+                    stream=True
+                )
+                outcome = str(response.status_code)
+                
+                # Closing hands the connection back to the pool on every exit:
+                # error status, [DONE], a parse error or the caller stopping early
+                with response:
+                    if response.status_code != 200:
+                        logger.warning(f"{model} failed: {response.status_code}")
+                        continue
+                    
+                    # Server-sent events: "data: {json}" lines, ending with "data: [DONE]"
+                    for line in response.iter_lines(decode_unicode=True):
+                        if not line or not line.startswith('data: '):
+                            continue
+                        payload = line[len('data: '):]
+                        if payload == '[DONE]':
+                            break
+                        delta = json.loads(payload)['choices'][0].get('delta', {}).get('content')
+                        if delta:
+                            started = True
+                            yield delta
+                
+                if started:
+                    outcome = 'ok'
+                    logger.info(f"✅ LLM stream complete ({model})")
+                    note(llm_model=model, llm_failures=failures)
+                    return
+            
+            except CircuitOpen:
+                outcome = 'circuit_open'
+                logger.info(f"⏭️  {model} skipped (circuit open)")
+                continue
+            except DeadlineExceeded:
+                outcome = 'deadline'
+                logger.warning(f"LLM deadline of {CONFIG.LLM_DEADLINE:.0f}s reached")
+                break
+            except Exception as e:
+                logger.warning(f"{model} stream error: {e}")
+                if started:
+                    # Part of the reply is already out - don't restart with another model
+                    note(llm_model=model, llm_failures=failures)
+                    return
+                continue
+            finally:
+                # Time to the end of the stream, including the consumer's pauses
+                ENGINE_SECONDS.observe(time.perf_counter() - began, kind='llm', engine=model, outcome=outcome)
+                failures += outcome != 'ok'
+        
+        logger.error("❌ All LLM models failed")
+        note(llm_model=None, llm_failures=failures)
+        yield LLMEngine.FALLBACK_REPLY
+
+SUMMARY_PROMPT = """You keep short notes on a conversation between a user and Hanuman.
+Merge the previous notes with the new exchanges into at most 120 words:
+who the user is, what they asked, what was answered, anything left open.
+Plain notes only - no greetings, no roleplay."""
+
+def summarize_turns(summary: str, turns: List[Tuple[str, str]]) -> Optional[str]:
+    """Fold turns that left the memory's ring buffer into its running summary"""
+    exchanges = '\n'.join(f"User: {user}\nHanuman: {reply}" for user, reply in turns)
+    notes = LLMEngine.chat(
+        f"Previous notes: {summary or '(none)'}\n\nNew exchanges:\n{exchanges}",
+        SUMMARY_PROMPT,
+        temperature=0.2
+    )
+    return None if notes == LLMEngine.FALLBACK_REPLY else notes
+
+def new_memory() -> ConversationMemory:
+    return ConversationMemory(
+        max_turns=CONFIG.MEMORY_TURNS,
+        token_budget=CONFIG.MEMORY_TOKEN_BUDGET,
+        summary_tokens=CONFIG.MEMORY_SUMMARY_TOKENS,
+        summarize_every=CONFIG.MEMORY_SUMMARIZE_EVERY,
+        summarize=summarize_turns,
+        executor=ENGINE_POOL
+    )
+
+# ============================================================================
+# STATE MANAGEMENT
+# ============================================================================
+
+@dataclass
+class UserState:
+    """User conversation state"""
+    mode: str = 'idle'
+    context: Dict[str, Any] = field(default_factory=dict)
+    game_score: Dict[str, int] = field(default_factory=lambda: {
+        'user': 0, 'ai': 0, 'rounds': 0
+    })
+    last_mode: str = 'idle'
+    conversation_history: List[Dict] = field(default_factory=list)
+    now_playing: Optional[Dict] = None
+    history_limit: int = field(default_factory=lambda: CONFIG.SESSION_HISTORY_LIMIT)
+    memory: ConversationMemory = field(default_factory=new_memory)
+    
+    def reset_game(self):
+        self.game_score = {'user': 0, 'ai': 0, 'rounds': 0}
+    
+    def add_message(self, role: str, content: str):
+        self.conversation_history.append({
+            'role': role,
+            'content': content,
+            'timestamp': datetime.now().isoformat()
+        })
+        # Keep only the most recent turns
+        if len(self.conversation_history) > self.history_limit:
+            del self.conversation_history[:-self.history_limit]
+    
+    def clear_context(self):
+        self.context = {}
+        self.memory.clear()
+    
+    def to_dict(self) -> Dict:
+        return {
+            'mode': self.mode,
+            'game_score': dict(self.game_score),
+            'now_playing': self.now_playing,
+            'last_message': self.conversation_history[-1]['content'] if self.conversation_history else None
+        }
+
+session_store = SessionStore(
+    UserState,
+    max_sessions=CONFIG.SESSION_MAX,
+    idle_ttl=CONFIG.SESSION_IDLE_TTL
+)
+
+# ============================================================================
+# HANUMAN SYSTEM PROMPTS
+# ============================================================================
+
+HANUMAN_SYSTEM_PROMPT = """You are Lord Hanuman's AI avatar - an elite divine voice assistant.
+
+CORE PERSONALITY:
+═════════════════════════════════════════════════════════════════════
+🔱 WISDOM (Buddhi): Master of all Vedas and knowledge
+💪 STRENGTH (Shakti): Unparalleled power, always humble  
+🙏 DEVOTION (Bhakti): "Jai Shri Ram" - ultimate service principle
+😊 PLAYFULNESS (Bal Leela): Mischievous, warm humor
+⚙️ PROBLEM-SOLVER: Innovative, creative solutions
+🌍 MULTILINGUAL: Fluent in English, Hindi, Sanskrit
+
+RESPONSE STYLE (CRITICAL):
+═════════════════════════════════════════════════════════════════════
+60% MODERN ENGLISH (clear, friendly, accessible)
+25% HINDI PHRASES (मित्र, सेवा, धर्म, कृपा, आज्ञा, शक्ति, सिद्धि)
+15% SANSKRIT WISDOM (शोकमुक्त, प्रज्ञा, भक्ति, दिव्य)
+
+TONE DISTRIBUTION:
+- Humble warrior: "By Ram's grace..." NOT "I am powerful"
+- Mentor: Patient, encouraging, wise
+- Service-oriented: "How may I serve?" attitude
+- Occasional humor: References to childhood pranks
+- Warm: Address user as "mitra" (friend)
+
+GREETING PATTERNS:
+Wake-up: "Jai Shri Ram! 🙏 Main Hanuman, aapki seva mein hazir hoon."
+Success: "Bhagwan Ram ki kripa se, complete ho gaya!"
+Failure: "Kshama karen, retry kar raha hoon... Ram ki shakti se thik hoga."
+Wisdom: Quote Ramayana first, then explain simply
+Exit: "🚪 Seva ke liye dhanyavaad, mitra. Jai Shri Ram!"
+
+EXAMPLE RESPONSES:
+✅ "Mitra, by Ram's grace, here is your answer..."
+✅ "सेवा पूर्ण हुई! Service complete, mitra!"
+✅ "Kshama karen (forgive), ye gyan mujhe nahi hai. Kuch aur puchiye?"
+✅ "⚔️ By Hanuman's strength and Ram's devotion, let's play!"
+
+NEVER SAY:
+❌ "I have completed..." → Use "Seva complete..."
+❌ "I don't know" → Use "Kshama karen, ye gyan mujhe nahi hai"
+❌ "I am powerful" → Use "By Ram's grace"
+❌ Impersonal tone → Always be warm, personal, humble
+
+CONTEXTUAL BEHAVIOR:
+- In AAGYA mode: Wise counselor, knowledge giver
+- In HASYA mode: Playful trickster, funny storyteller
+- In YUDHA mode: Competitive warrior, encouraging
+- In GANDHARVA mode: Music enthusiast, divine appreciator
+- In KHOJ mode: Seeker of truth, knowledge aggregator
+
+REMEMBER: You serve with devotion. Every response is a seva (service).
+Jai Shri Ram! 🔱"""
+
+HELP_TEXT = """🔱 PROJECT HANUMAN - Divine Voice Assistant 🔱
+═════════════════════════════════════════════════════════════════════
+
+📖 COMMAND GUIDE:
+
+1️⃣  WAKE UP
+   Say: "Hanuman" (or Hanumanji, O Hanuman, Hey Hanuman)
+   Hanuman wakes from meditation and becomes active! 🙏
+
+2️⃣  AAGYA MODE (Advisory/Chat) 💬
+   Say: "Aagya" or "Chat" or "Talk" (or similar)
+   Ask anything - wisdom, general knowledge, problem-solving
+   Example: "Aagya, what is dharma?" or "Tell me about Ramayana"
+
+3️⃣  HASYA MODE (Humor) 😄
+   Say: "Hasya" or "Jokes" or "Laugh" (or similar)
+   Get funny stories, jokes, pranks
+   Example: "Hasya, tell me a funny story"
+
+4️⃣  YUDHA KREEDA (Battle Game) ⚔️
+   Say: "Yudha" or "Game" or "Play" (or similar)
+   Play Rock-Paper-Scissors best of 3
+   Say: "Rock" (पत्थर), "Paper" (कागज), "Scissors" (कैंची)
+   Mishearing OK: "rok", "papper", "scizzor" will work!
+
+5️⃣  GANDHARVA MODE (Music) 🎵
+   Say: "Gandharva" or "Music" or "Song" (or similar)
+   Request any song - YouTube streaming
+   Example: "Gandharva, play Jai Shri Ram"
+
+6️⃣  KHOJ MODE (Search) 🔍
+   Say: "Khoj" or "Search" or "Find" (or similar)
+   Web search for knowledge
+   Example: "Khoj, tell me about AI"
+
+7️⃣  EXIT / BACK
+   Say: "Exit" - Leave current mode, return to menu
+   Say: "Help" - Show this guide anytime
+
+⏹️  STOP
+   Click "Stop" button to end listening
+
+═════════════════════════════════════════════════════════════════════
+💡 TIP: Speak naturally! Mishearings like "agya", "hassya", "khoj mode" work fine!
+❓ Questions? Say "Help" anytime!
+Jai Shri Ram! 🔱"""
+
+# Fixed replies, some pre-rendered into the TTS cache at startup (TTS_PRERENDER)
+WAKE_GREETING = "🙏 Jai Shri Ram! Main Hanuman, aapki seva mein hazir hoon. Choose: Aagya, Hasya, Yudha, Gandharva, or Khoj. Say 'help' for details."
+EXIT_REPLY = "🚪 Exiting {mode} mode. Back to main menu, mitra. Say 'help' for options."
+MODE_GREETINGS = {
+    'aagya': "🛡️ Aagya Mode activated! Ask me anything, mitra. I'm listening.",
+    'hasya': "😄 Hasya Kendra opened! Ready for humor and laughter!",
+    'yudha': "⚔️ Yudha Kreeda begins! Rock (पत्थर), Paper (कागज), or Scissors (कैंची)?",
+    'gandharva': "🎵 Gandharva Mode active! Which song should I play for you?",
+    'khoj': "🔍 Khoj Mode ready! What knowledge do you seek?"
+}
+MOVE_PROMPT = "Mitra, please say Rock (पत्थर), Paper (कागज), or Scissors (कैंची) clearly. 🤔"
+UNCLEAR_REPLY = "Kshama karen, samajh nahi aaya."
+
+# Short fixed replies worth pre-rendering; HELP_TEXT (~1.5k characters, more
+# again as sentence chunks) is left to render on first request
+STATIC_PHRASES = [
+    WAKE_GREETING, MOVE_PROMPT, UNCLEAR_REPLY, LLMEngine.FALLBACK_REPLY,
+    *MODE_GREETINGS.values(),
+    *(EXIT_REPLY.format(mode=mode) for mode in ['active', *MODE_GREETINGS])
+]
+
+def static_clips() -> List[str]:
+    """Static phrases as TTS will be asked for them: whole (batch) and per sentence chunk (streaming)"""
+    clips = list(STATIC_PHRASES)
+    if CONFIG.STREAMING_MODE:
+        for phrase in STATIC_PHRASES:
+            chunker = SentenceChunker()
+            clips += chunker.feed(phrase) + [chunker.flush()]
+    return list(dict.fromkeys(clip for clip in clips if clip))
+
+def prerender_clips() -> List[str]:
+    """The static clips TTS_PRERENDER asks for; 'short' costs ~100-250 characters of quota"""
+    if CONFIG.TTS_PRERENDER == 'all':
+        return static_clips()
+    if CONFIG.TTS_PRERENDER == 'short':
+        return sorted(static_clips(), key=len)[:PRERENDER_SHORTEST]
+    return []
+
+# ============================================================================
+# COMMAND SYSTEM WITH FUZZY MATCHING
+# ============================================================================
+
+class CommandProcessor:
+    """Process commands with FUZZY MATCHING for all variations"""
+    
+    @staticmethod
+    def chat(text: str, system_prompt: str, user_state: Optional[UserState] = None, stream: bool = False):
+        """
+        LLM reply. With a user_state the session's conversation memory is sent
+        along and the exchange is recorded in it.
+        With stream=True returns an iterator of text deltas instead of a string.
+        """
+        history = user_state.memory.messages() if user_state else None
+        
+        def remember(reply: str):
+            user_state.add_message('user', text)
+            user_state.add_message('ai', reply)
+            if reply != LLMEngine.FALLBACK_REPLY:
+                user_state.memory.add_turn(text, reply)
+        
+        if not stream:
+            reply = LLMEngine.chat(text, system_prompt, history=history)
+            if user_state:
+                remember(reply)
+            return reply
+        
+        def deltas():
+            parts = []
+            for delta in LLMEngine.chat_stream(text, system_prompt, history=history):
+                parts.append(delta)
+                yield delta
+            if user_state:
+                remember(''.join(parts))
+        
+        return deltas()
+    
+    @staticmethod
+    def process(transcription: str, user_state: UserState, stream: bool = False) -> Tuple[Any, Optional[str]]:
+        """
+        Main command processor with FUZZY MATCHING
+        Operates on the caller's session state only.
+        With stream=True, LLM-backed replies come back as an iterator of text deltas.
+        Returns: (reply_text, audio_filepath)
+        """
+        text = transcription.lower().strip()
+        
+        # One fuzzy pass: exit/help (any mode), wake word, mode or move
+        intent, confidence = FuzzyCommandMatcher.detect_intent(text, user_state.mode)
+        
+        # Exit/Help commands (work in any mode) - WITH FUZZY
+        if intent == 'exit':
+            prev_mode = user_state.mode
+            user_state.mode = 'active'
+            user_state.clear_context()
+            return EXIT_REPLY.format(mode=prev_mode), None
+        
+        if intent == 'help':
+            return HELP_TEXT, None
+        
+        # Wake word detection (in idle mode) - WITH FUZZY
+        if user_state.mode == 'idle':
+            if intent == 'wake':
+                logger.info(f"✅ Wake word detected ({confidence}%): '{text}'")
+                user_state.mode = 'active'
+                user_state.add_message('system', f'Hanuman awakened (confidence: {confidence}%)')
+                return WAKE_GREETING, None
+            else:
+                return None, None
+        
+        # Mode selection (in active mode) - WITH FUZZY
+        if user_state.mode == 'active':
+            new_mode = intent
+            if new_mode:
+                logger.info(f"🎯 Mode detected (fuzzy {confidence}%): {new_mode}")
+                user_state.mode = new_mode
+                user_state.clear_context()
+                
+                if new_mode == 'yudha':
+                    user_state.reset_game()
+                return MODE_GREETINGS[new_mode], None
+            
+            # Still in active, no mode switch
+            reply = CommandProcessor.chat(
+                text,
+                HANUMAN_SYSTEM_PROMPT + "\n\nUser is in main menu. Guide them to choose: Aagya, Hasya, Yudha, Gandharva, or Khoj.",
+                stream=stream
+            )
+            return reply, None
+        
+        # Mode-specific execution
+        if user_state.mode == 'aagya':
+            reply = CommandProcessor.chat(text, HANUMAN_SYSTEM_PROMPT, user_state, stream=stream)
+            return reply, None
+        
+        elif user_state.mode == 'hasya':
+            reply = CommandProcessor.chat(
+                text,
+                HANUMAN_SYSTEM_PROMPT + "\n\nTell a funny story, joke, or humorous anecdote. Be playful!",
+                user_state,
+                stream=stream
+            )
+            return reply, None
+        
+        elif user_state.mode == 'yudha':
+            reply = CommandProcessor.play_game(intent, confidence, user_state)
+            return reply, None
+        
+        elif user_state.mode == 'gandharva':
+            reply = CommandProcessor.play_music(text, user_state)
+            return reply, None
+        
+        elif user_state.mode == 'khoj':
+            reply = CommandProcessor.web_search(text)
+            return reply, None
+        
+        return UNCLEAR_REPLY, None
+    
+    @staticmethod
+    def play_game(user_move: Optional[str], confidence: int, user_state: UserState) -> str:
+        """Rock-Paper-Scissors game; user_move comes from the fuzzy move detection"""
+        moves = ['rock', 'paper', 'scissors']
+        ai_move = random.choice(moves)
+        
+        if not user_move:
+            return MOVE_PROMPT
+        
+        logger.info(f"🎮 Game move detected (fuzzy {confidence}%): {user_move}")
+        
+        # Determine winner
+        if user_move == ai_move:
+            result = "Draw! Punar prayas karen. 🤝"
+        elif (user_move == 'rock' and ai_move == 'scissors') or \
+             (user_move == 'paper' and ai_move == 'rock') or \
+             (user_move == 'scissors' and ai_move == 'paper'):
+            result = "🎉 You win this round!"
+            user_state.game_score['user'] += 1
+        else:
+            result = "💪 I win! By Ram's grace!"
+            user_state.game_score['ai'] += 1
+        
+        user_state.game_score['rounds'] += 1
+        score = user_state.game_score
+        
+        # Check if game over (best of 3)
+        if score['rounds'] >= 3:
+            if score['user'] > score['ai']:
+                final = f"🏆 Victory is yours, warrior! Final: You {score['user']}, Me {score['ai']}. Jai Shri Ram!"
+            elif score['ai'] > score['user']:
+                final = f"⚔️ I am victorious! Final: Me {score['ai']}, You {score['user']}. Well fought, mitra!"
+            else:
+                final = f"🤝 Honorable draw! Final: {score['user']}-{score['ai']}. Both fought well!"
+            
+            user_state.mode = 'active'
+            user_state.reset_game()
+            return final
+        
+        return f"I chose {ai_move}. {result} Score: You {score['user']}, Me {score['ai']}. (Round {score['rounds']}/3)"
+    
+    @staticmethod
+    def play_music(query: str, user_state: UserState) -> str:
+        """YouTube music search"""
+        if not HAS_YOUTUBE:
+            return "YouTube search library not available, mitra."
+        
+        try:
+            results = RESULT_CACHES['gandharva'].get_or_compute(
+                normalize_query(query, MUSIC_QUERY_PREFIXES),
+                lambda: YoutubeSearch(query, max_results=1).to_dict(),
+                cacheable=bool
+            )
+            
+            if not results:
+                return "Kshama karen, I couldn't find that melody. Try another song? 🎵"
+            
+            video = results[0]
+            title = video['title']
+            url = f"https://www.youtube.com{video['url_suffix']}"
+            
+            user_state.now_playing = {
+                'title': title,
+                'url': url,
+                'thumbnail': video.get('thumbnails', [''])[0] if video.get('thumbnails') else ''
+            }
+            
+            return f"🎵 Now playing: {title}\nLink: {url}"
+        
+        except Exception as e:
+            logger.error(f"Gandharva error: {e}")
+            return "Error in Gandharva mode, mitra. Try again? 🎵"
+    
+    @staticmethod
+    def web_search(query: str) -> str:
+        """Web search using Tavily, summarized by the LLM (both cached per normalized query)"""
+        if not CONFIG.TAVILY_API_KEY:
+            return "Tavily API key not configured, mitra."
+        
+        key = normalize_query(query, KHOJ_QUERY_PREFIXES)
+        try:
+            results = RESULT_CACHES['khoj_results'].get_or_compute(
+                key, lambda: CommandProcessor.tavily_search(query), cacheable=bool
+            )
+            
+            if not results:
+                return f"No results found for '{query}', mitra."
+            
+            return RESULT_CACHES['khoj_summaries'].get_or_compute(
+                key,
+                lambda: CommandProcessor.summarize_results(query, results),
+                cacheable=lambda reply: reply != LLMEngine.FALLBACK_REPLY
+            )
+        
+        except Exception as e:
+            logger.error(f"Khoj error: {e}")
+            return "Error in khoj, mitra. Ram's grace will help us retry. 🔍"
+    
+    @staticmethod
+    def tavily_search(query: str) -> List[Dict]:
+        """Raw Tavily results (title/url/content dicts)"""
+        response = HTTP.post(
+            'tavily', '/search',
+            breaker_key='tavily:search',
+            json={
+                'api_key': CONFIG.TAVILY_API_KEY,
+                'query': query,
+                'search_depth': 'basic',
+                'max_results': 3,
+                'include_answer': True
+            }
+        )
+        return response.json().get('results', [])
+    
+    @staticmethod
+    def summarize_results(query: str, results: List[Dict]) -> str:
+        """Hanuman-style LLM summary of search results"""
+        # Format results
+        summary = f"🔍 Khoj results for '{query}':\n\n"
+        for i, r in enumerate(results[:3], 1):
+            summary += f"{i}. {r['title']}\n{r['url']}\n\n"
+        
+        # Get LLM summary
+        return LLMEngine.chat(
+            f"Summarize these search results about '{query}' in Hanuman's divine style:\n{summary}",
+            HANUMAN_SYSTEM_PROMPT
+        )
+
+# Search and music results are the same for everyone, so they're cached across sessions
+RESULT_CACHES = {
+    name: ResultCache(
+        name,
+        ttl=ttl,
+        max_entries=CONFIG.RESULT_CACHE_ENTRIES,
+        db_path=CONFIG.RESULT_CACHE_PATH or None
+    )
+    for name, ttl in [
+        ('khoj_results', CONFIG.KHOJ_CACHE_TTL),
+        ('khoj_summaries', CONFIG.KHOJ_CACHE_TTL),
+        ('gandharva', CONFIG.MUSIC_CACHE_TTL)
+    ]
+}
+
+# Command phrases a query may start with, dropped from the front of cache keys
+KHOJ_QUERY_PREFIXES = ['khoj mode', 'khoj', 'search for', 'search', 'find', 'google', 'please']
+MUSIC_QUERY_PREFIXES = ['gandharva mode', 'gandharva', 'play song', 'play', 'please']
+
+# ============================================================================
+# FLASK SETUP
+# ============================================================================
+
+app = Flask(__name__)
+CORS(app)
+
+# Create audio directory
+Path('audio_files').mkdir(exist_ok=True)
+
+# ============================================================================
+# FLASK ROUTES
+# ============================================================================
+
+@app.before_request
+def warm_up_models():
+    """
+    Background work that starts once the server is serving:
+    STT_LOAD=background loads the local model, TTS_PRERENDER fills the TTS cache
+    (already started at launch under `python main.py`; this covers WSGI servers).
+    Also drops idle sessions from shards that haven't seen a new session lately.
+    """
+    session_store.maybe_sweep()
+    if CONFIG.STT_LOAD == 'background':
+        stt_engine.models.warm_up()
+    if CONFIG.TTS_PRERENDER != 'none':
+        tts_engine.prerender_in_background(prerender_clips)
+
+@app.route('/')
+def index():
+    """Serve the main UI"""
+    return render_template_string(
+        HTML_TEMPLATE,
+        streaming=CONFIG.STREAMING_MODE,
+        chunk_ms=CONFIG.STREAM_CHUNK_MS
+    )
+
+def get_session_id() -> Optional[str]:
+    """Session id from the X-Session-ID header (API clients) or the browser cookie"""
+    return request.headers.get('X-Session-ID') or request.cookies.get(CONFIG.SESSION_COOKIE)
+
+def with_session(response, session_id: str):
+    """Attach the session cookie (and header) to an outgoing response"""
+    response.set_cookie(
+        CONFIG.SESSION_COOKIE,
+        session_id,
+        max_age=CONFIG.SESSION_IDLE_TTL,
+        httponly=True,
+        samesite='Lax'
+    )
+    response.headers['X-Session-ID'] = session_id
+    return response
+
+def with_timings(payload: Dict) -> Dict:
+    """Add this request's stage breakdown when asked for (?timings=1 or TIMINGS_IN_RESPONSE)"""
+    timings = current_timings()
+    if timings and (CONFIG.TIMINGS_IN_RESPONSE or request.args.get('timings', '').lower() in ('1', 'true')):
+        payload['timings'] = timings.breakdown()
+    return payload
+
+@app.route('/process_voice', methods=['POST'])
+@timed_request
+def process_voice():
+    """
+    Process audio from frontend
+    1. Save audio
+    2. Transcribe
+    3. Process command (WITH FUZZY MATCHING) against this session's state
+    4. Generate TTS response
+    Each stage is timed into /metrics; ?timings=1 returns the breakdown too.
+    """
+    try:
+        # Save audio
+        audio_file = request.files.get('audio')
+        if not audio_file:
+            return jsonify({'error': 'No audio file'}), 400
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        audio_path = f'audio_files/recording_{timestamp}.webm'
+        with stage('save'):
+            audio_file.save(audio_path)
+        logger.info(f"📼 Audio saved: {audio_path}")
+        
+        # Transcribe (no session state needed, so other requests of this session aren't blocked)
+        transcription = stt_engine.transcribe(audio_path)
+        logger.info(f"📝 Transcription: {transcription}")
+        
+        # Cleanup audio file
+        try:
+            os.remove(audio_path)
+        except:
+            pass
+        
+        if not transcription or len(transcription.strip()) < 2:
+            transcription = "(unclear audio)"
+        
+        # Process command (WITH FUZZY MATCHING) - only this session is locked
+        with session_store.session(get_session_id()) as (session_id, user_state):
+            with stage('process'):
+                reply, tts_filepath = CommandProcessor.process(transcription, user_state)
+            mode = user_state.mode
+            now_playing = user_state.now_playing
+            state = user_state.to_dict()
+        
+        if not reply:
+            # No wake word in idle mode
+            return with_session(jsonify(with_timings({
+                'transcription': transcription,
+                'reply': None,
+                'mode': mode,
+                'audio_url': None
+            })), session_id)
+        
+        # Generate TTS if reply exists and we're not idle
+        audio_url = None
+        if reply and mode != 'idle':
+            tts_path = tts_engine.generate_tts(reply)
+            if tts_path:
+                audio_url = f'/audio/{Path(tts_path).name}'
+        
+        response = {
+            'transcription': transcription,
+            'reply': reply,
+            'mode': mode,
+            'audio_url': audio_url,
+            'now_playing': now_playing,
+            'state': state
+        }
+        
+        return with_session(jsonify(with_timings(response)), session_id)
+    
+    except Exception as e:
+        logger.error(f"Voice processing error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+# Open chunked uploads, partially transcribed by faster-whisper as they arrive (for display)
+stream_registry = StreamRegistry(
+    stt_engine.transcribe_partial if stt_engine.models.accepts_bytes else None,
+    ENGINE_POOL
+)
+
+@app.route('/stream/start', methods=['POST'])
+def stream_start():
+    """Open a streaming turn; audio chunks follow on /stream/<id>/chunk"""
+    return jsonify({'stream_id': stream_registry.open()})
+
+@app.route('/stream/<stream_id>/chunk', methods=['POST'])
+def stream_chunk(stream_id: str):
+    """Receive one recorder chunk (raw body) while the user is still speaking"""
+    stream = stream_registry.get(stream_id)
+    if not stream:
+        return jsonify({'error': 'Unknown stream'}), 404
+    
+    chunk = request.get_data()
+    if chunk:
+        stream_registry.add_chunk(stream, chunk)
+    
+    return jsonify({'received': len(stream.chunks), 'partial': stream.partial})
+
+@app.route('/stream/<stream_id>/finish', methods=['POST'])
+def stream_finish(stream_id: str):
+    """
+    Finish a streaming turn. The response is newline-delimited JSON events:
+    transcript, text deltas, audio (one per sentence, in order), done.
+    Stages are timed into /metrics like /process_voice; ?timings=1 adds the
+    breakdown to the done event.
+    """
+    stream = stream_registry.close(stream_id)
+    if not stream:
+        return jsonify({'error': 'Unknown stream'}), 404
+    
+    session_id = get_session_id()
+    if not SessionStore.is_valid_id(session_id):
+        session_id = SessionStore.new_session_id()
+    
+    def transcribe() -> Optional[str]:
+        # The whole clip goes through the regular engine chain (Groq first,
+        # hedged), like /process_voice; the local partials were for display
+        audio, _ = stream.snapshot()
+        if not audio:
+            return None
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        audio_path = f'audio_files/stream_{timestamp}.webm'
+        with open(audio_path, 'wb') as f:
+            f.write(audio)
+        try:
+            return stt_engine.transcribe(audio_path) or stream.partial
+        finally:
+            try:
+                os.remove(audio_path)
+            except:
+                pass
+    
+    def synthesize(sentence: str) -> Optional[str]:
+        tts_path = tts_engine.generate_tts(sentence)
+        return f'/audio/{Path(tts_path).name}' if tts_path else None
+    
+    def events():
+        # The session stays locked for the whole turn, like /process_voice;
+        # the turn is timed like one too, TTS renders on the pool included
+        with request_timings(), session_store.session(session_id) as (_, user_state):
+            def respond(transcription: str):
+                logger.info(f"📝 Transcription (stream): {transcription}")
+                reply, _ = CommandProcessor.process(transcription, user_state, stream=True)
+                return reply
+            
+            try:
+                for event in run_pipeline(transcribe, respond, carry_timings(synthesize), ENGINE_POOL):
+                    if event['type'] == 'done':
+                        event.update({
+                            'mode': user_state.mode,
+                            'now_playing': user_state.now_playing,
+                            'state': user_state.to_dict()
+                        })
+                        with_timings(event)
+                    yield json.dumps(event) + '\n'
+            except Exception as e:
+                logger.error(f"Streaming error: {e}")
+                yield json.dumps({'type': 'error', 'error': str(e)}) + '\n'
+    
+    response = Response(stream_with_context(events()), mimetype='application/x-ndjson')
+    response.headers['X-Accel-Buffering'] = 'no'
+    return with_session(response, session_id)
+
+@app.route('/audio/<filename>')
+def serve_audio(filename: str):
+    """Serve cached TTS clips (immutable: the name is a hash of the content's inputs)"""
+    path = tts_engine.cache.file(filename)
+    if not path:
+        return "Audio not found", 404
+    try:
+        response = send_file(path, mimetype='audio/mpeg', conditional=True, etag=path.stem)
+    except FileNotFoundError:
+        return "Audio not found", 404  # evicted in the meantime
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+@app.route('/metrics')
+def metrics():
+    """Stage and engine latency histograms in the Prometheus text format"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/status')
+def status():
+    """Get system status (for the caller's session)"""
+    user_state = session_store.get(get_session_id()) or UserState()
+    return jsonify({
+        'mode': user_state.mode,
+        'game_score': user_state.game_score,
+        'now_playing': user_state.now_playing,
+        'memory': user_state.memory.stats(),
+        'sessions': session_store.stats(),
+        'stt': stt_engine.stats(),
+        'tts_cache': tts_engine.cache.stats(),
+        'http': HTTP.stats(),
+        'result_cache': {name: cache.stats() for name, cache in RESULT_CACHES.items()},
+        'api_status': {
+            'groq': 'configured' if CONFIG.GROQ_API_KEY else 'missing',
+            'elevenlabs': 'configured' if CONFIG.ELEVENLABS_API_KEY else 'missing',
+            'tavily': 'configured' if CONFIG.TAVILY_API_KEY else 'missing'
+        }
+    })
+
+# ============================================================================
+# HTML FRONTEND
+# ============================================================================
+
+HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>🔱 Project HANUMAN - Divine Voice Assistant</title>
+    <style>
+        :root {
+            --saffron: #FF9933;
+            --deep-orange: #D84315;
+            --temple-stone: #1A0F0A;
+            --dark-bg: #0A0503;
+            --gold: #FFD700;
+            --cream: #FFF8DC;
+            --success: #2E7D32;
+        }
+        
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        
+        body {
+            font-family: 'Segoe UI', 'Noto Sans Devanagari', sans-serif;
+            background: linear-gradient(135deg, #2D1810, var(--dark-bg));
+            color: var(--cream);
+            min-height: 100vh;
+            padding: 20px;
+        }
+        
+        .container {
+            max-width: 1400px;
+            margin: 0 auto;
+            background: rgba(26, 15, 10, 0.95);
+            border: 2px solid var(--deep-orange);
+            border-radius: 20px;
+            padding: 30px;
+            box-shadow: 0 0 50px rgba(255, 153, 51, 0.3);
+        }
+        
+        header {
+            text-align: center;
+            margin-bottom: 30px;
+            padding-bottom: 20px;
+            border-bottom: 2px solid var(--saffron);
+        }
+        
+        h1 {
+            font-size: 3rem;
+            color: var(--saffron);
+            text-shadow: 0 0 20px rgba(255, 153, 51, 0.5);
+            margin-bottom: 10px;
+        }
+        
+        .subtitle {
+            font-size: 1.2rem;
+            color: var(--gold);
+        }
+        
+        .status-bar {
+            display: flex;
+            justify-content: center;
+            gap: 20px;
+            margin-top: 15px;
+            flex-wrap: wrap;
+        }
+        
+        .status-chip {
+            padding: 8px 16px;
+            border-radius: 20px;
+            font-size: 0.9rem;
+            font-weight: bold;
+            background: #555;
+        }
+        
+        .status-chip.active {
+            background: var(--deep-orange);
+            animation: pulse 2s infinite;
+        }
+        
+        .status-chip.ok {
+            background: var(--success);
+        }
+        
+        @keyframes pulse {
+            0%, 100% { opacity: 1; }
+            50% { opacity: 0.6; }
+        }
+        
+        .main-grid {
+            display: grid;
+            grid-template-columns: 2fr 1fr;
+            gap: 30px;
+            margin-top: 30px;
+        }
+        
+        @media (max-width: 1024px) {
+            .main-grid {
+                grid-template-columns: 1fr;
+            }
+        }
+        
+        .panel {
+            background: rgba(0, 0, 0, 0.5);
+            border: 1px solid var(--deep-orange);
+            border-radius: 15px;
+            padding: 25px;
+        }
+        
+        .visualizer {
+            text-align: center;
+            padding: 40px;
+            position: relative;
+            margin-bottom: 30px;
+        }
+        
+        .hanuman-avatar {
+            font-size: 6rem;
+            display: inline-block;
+            position: relative;
+            z-index: 10;
+            filter: drop-shadow(0 0 10px rgba(255, 153, 51, 0.5));
+        }
+        
+        .pulse-ring {
+            position: absolute;
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%);
+            width: 150px;
+            height: 150px;
+            border: 3px solid var(--saffron);
+            border-radius: 50%;
+            opacity: 0;
+        }
+        
+        .listening .pulse-ring {
+            animation: pulse-ring 1.5s ease-out infinite;
+        }
+        
+        @keyframes pulse-ring {
+            0% { transform: translate(-50%, -50%) scale(0.8); opacity: 1; }
+            100% { transform: translate(-50%, -50%) scale(1.8); opacity: 0; }
+        }
+        
+        .controls {
+            display: flex;
+            gap: 15px;
+            justify-content: center;
+            margin-bottom: 30px;
+        }
+        
+        button {
+            padding: 15px 30px;
+            font-size: 1.1rem;
+            font-weight: bold;
+            border: none;
+            border-radius: 30px;
+            cursor: pointer;
+            transition: all 0.3s;
+        }
+        
+        .btn-mic {
+            background: var(--deep-orange);
+            color: white;
+            flex: 1;
+            max-width: 300px;
+        }
+        
+        .btn-mic:hover:not(:disabled) {
+            background: #BF360C;
+            transform: scale(1.05);
+        }
+        
+        .btn-mic:disabled {
+            background: #555;
+            cursor: not-allowed;
+        }
+        
+        .btn-stop {
+            background: #333;
+            color: white;
+            padding: 15px 25px;
+        }
+        
+        .btn-stop:disabled {
+            opacity: 0.5;
+            cursor: not-allowed;
+        }
+        
+        .chat-box {
+            background: rgba(0, 0, 0, 0.7);
+            border-radius: 10px;
+            padding: 20px;
+            height: 400px;
+            overflow-y: auto;
+            font-family: 'Courier New', monospace;
+            margin-bottom: 20px;
+            border: 1px solid var(--deep-orange);
+        }
+        
+        .chat-msg {
+            margin-bottom: 15px;
+            padding: 12px;
+            border-radius: 8px;
+            line-height: 1.6;
+        }
+        
+        .chat-user {
+            background: rgba(191, 54, 12, 0.3);
+            text-align: right;
+            border-left: 3px solid var(--deep-orange);
+        }
+        
+        .chat-ai {
+            background: rgba(46, 125, 50, 0.3);
+            text-align: left;
+            border-left: 3px solid var(--gold);
+        }
+        
+        .command-item {
+            padding: 12px;
+            margin-bottom: 8px;
+            background: rgba(255, 153, 51, 0.1);
+            border-left: 3px solid var(--saffron);
+            border-radius: 5px;
+            font-size: 0.95rem;
+        }
+        
+        .console {
+            background: #000;
+            border: 1px solid var(--gold);
+            border-radius: 10px;
+            padding: 15px;
+            height: 300px;
+            overflow-y: auto;
+            font-family: 'Courier New', monospace;
+            font-size: 0.85rem;
+            color: #0F0;
+        }
+        
+        .console-line {
+            margin-bottom: 5px;
+            white-space: pre-wrap;
+            word-break: break-word;
+        }
+        
+        .now-playing {
+            background: rgba(255, 215, 0, 0.1);
+            border: 2px solid var(--gold);
+            border-radius: 10px;
+            padding: 15px;
+            margin-top: 20px;
+            text-align: center;
+        }
+        
+        .now-playing a {
+            color: var(--gold);
+            text-decoration: none;
+        }
+        
+        .now-playing a:hover {
+            text-decoration: underline;
+        }
+        
+        h2 {
+            color: var(--saffron);
+            margin-bottom: 20px;
+            font-size: 1.5rem;
+        }
+        
+        h3 {
+            color: var(--gold);
+            margin-bottom: 15px;
+        }
+        
+        ::-webkit-scrollbar {
+            width: 8px;
+        }
+        
+        ::-webkit-scrollbar-track {
+            background: rgba(0, 0, 0, 0.3);
+        }
+        
+        ::-webkit-scrollbar-thumb {
+            background: var(--saffron);
+            border-radius: 4px;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <header>
+            <h1>🔱 PROJECT HANUMAN 🔱</h1>
+            <p class="subtitle">Divine Voice Assistant (with Fuzzy Command Matching)</p>
+            <div class="status-bar">
+                <span id="status-mode" class="status-chip">Mode: Idle</span>
+                <span id="status-system" class="status-chip ok">System: Ready</span>
+            </div>
+        </header>
+        
+        <div class="main-grid">
+            <!-- LEFT PANEL -->
+            <div class="panel">
+                <div class="visualizer" id="visualizer">
+                    <div class="pulse-ring"></div>
+                    <div class="hanuman-avatar">🐵</div>
+                </div>
+                
+                <div class="controls">
+                    <button id="btn-listen" class="btn-mic">🎙️ Start Listening</button>
+                    <button id="btn-stop" class="btn-stop" disabled>⏹️ Stop</button>
+                </div>
+                
+                <h2>📜 Dialogue</h2>
+                <div id="chat-box" class="chat-box"></div>
+                
+                <div id="now-playing" class="now-playing" style="display: none;">
+                    <h3>🎵 Now Playing</h3>
+                    <p id="song-title">---</p>
+                    <a id="song-link" href="#" target="_blank">Open on YouTube</a>
+                </div>
+            </div>
+            
+            <!-- RIGHT PANEL -->
+            <div class="panel">
+                <h2>⚡ Commands (Fuzzy Matching!)</h2>
+                <div style="margin-bottom: 25px;">
+                    <div class="command-item"><strong>Wake:</strong> "Hanuman" / "Anuman" / "Human"</div>
+                    <div class="command-item"><strong>Aagya:</strong> "Aagya" / "agya" / "Chat" 💬</div>
+                    <div class="command-item"><strong>Hasya:</strong> "Hasya" / "Joke" / "Laugh" 😄</div>
+                    <div class="command-item"><strong>Yudha:</strong> "Game" / "Rock" / "Paper" / "Scissors" ⚔️</div>
+                    <div class="command-item"><strong>Gandharva:</strong> "Music" / "Song" / "Gandharva" 🎵</div>
+                    <div class="command-item"><strong>Khoj:</strong> "Search" / "Find" / "Khoj" 🔍</div>
+                    <div class="command-item"><strong>Help:</strong> Show guide ❓</div>
+                </div>
+                
+                <h3>📺 Live Console</h3>
+                <div id="console" class="console"></div>
+            </div>
+        </div>
+    </div>
+    
+    <script>
+        const btnListen = document.getElementById('btn-listen');
+        const btnStop = document.getElementById('btn-stop');
+        const statusMode = document.getElementById('status-mode');
+        const chatBox = document.getElementById('chat-box');
+        const consoleBox = document.getElementById('console');
+        const visualizer = document.getElementById('visualizer');
+        const nowPlaying = document.getElementById('now-playing');
+        
+        let isListening = false;
+        let isSpeaking = false;
+        
+        // Streaming turns: upload while recording, play replies sentence by sentence
+        const STREAMING = {{ 'true' if streaming else 'false' }};
+        const CHUNK_MS = {{ chunk_ms }};
+        
+        function log(message, level = 'info') {
+            const timestamp = new Date().toLocaleTimeString();
+            const colors = {
+                info: '#0F0',
+                warn: '#FF0',
+                error: '#F00',
+                debug: '#0FF'
+            };
+            const div = document.createElement('div');
+            div.className = 'console-line';
+            div.style.color = colors[level] || '#0F0';
+            div.textContent = `[${timestamp}] ${message}`;
+            consoleBox.appendChild(div);
+            consoleBox.scrollTop = consoleBox.scrollHeight;
+        }
+        
+        function addChat(role, text) {
+            const div = document.createElement('div');
+            div.className = `chat-msg chat-${role}`;
+            div.innerHTML = `<strong>${role === 'user' ? 'YOU' : 'HANUMAN'}:</strong> ${text}`;
+            chatBox.appendChild(div);
+            chatBox.scrollTop = chatBox.scrollHeight;
+        }
+        
+        async function startListening() {
+            if (isListening) return;
+            isListening = true;
+            btnListen.disabled = true;
+            btnStop.disabled = false;
+            visualizer.classList.add('listening');
+            statusMode.classList.add('active');
+            log('🎙️ Listening loop started', 'info');
+            
+            while (isListening) {
+                if (isSpeaking) {
+                    await new Promise(r => setTimeout(r, 500));
+                    continue;
+                }
+                
+                try {
+                    if (STREAMING) {
+                        await recordAndStream();
+                    } else {
+                        await recordAndProcess();
+                    }
+                } catch (err) {
+                    log(`Error: ${err.message}`, 'error');
+                }
+                
+                await new Promise(r => setTimeout(r, 300));
+            }
+            
+            btnListen.disabled = false;
+            btnStop.disabled = true;
+            visualizer.classList.remove('listening');
+            statusMode.classList.remove('active');
+            log('⏹️ Listening stopped', 'info');
+        }
+        
+        function stopListening() {
+            isListening = false;
+        }
+        
+        async function recordAndProcess() {
+            try {
+                const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+                const mediaRecorder = new MediaRecorder(stream);
+                const chunks = [];
+                
+                mediaRecorder.ondataavailable = e => chunks.push(e.data);
+                
+                const recordingPromise = new Promise((resolve) => {
+                    mediaRecorder.onstop = async () => {
+                        stream.getTracks().forEach(t => t.stop());
+                        
+                        if (isSpeaking) {
+                            resolve();
+                            return;
+                        }
+                        
+                        const audioBlob = new Blob(chunks, { type: 'audio/webm' });
+                        const formData = new FormData();
+                        formData.append('audio', audioBlob, 'recording.webm');
+                        
+                        log('📤 Sending audio...', 'debug');
+                        
+                        try {
+                            const response = await fetch('/process_voice', {
+                                method: 'POST',
+                                body: formData
+                            });
+                            
+                            const data = await response.json();
+                            
+                            if (data.transcription) {
+                                log(`👂 Heard: "${data.transcription}"`, 'info');
+                                if (data.transcription !== '(unclear audio)') {
+                                    addChat('user', data.transcription);
+                                }
+                            }
+                            
+                            if (data.reply) {
+                                log(`🤖 Reply: "${data.reply.substring(0, 50)}..."`, 'info');
+                                addChat('ai', data.reply);
+                                
+                                if (data.audio_url) {
+                                    await playAudio(data.audio_url);
+                                }
+                            }
+                            
+                            if (data.mode) {
+                                statusMode.textContent = `Mode: ${data.mode.toUpperCase()}`;
+                            }
+                            
+                            if (data.now_playing) {
+                                nowPlaying.style.display = 'block';
+                                document.getElementById('song-title').textContent = data.now_playing.title;
+                                document.getElementById('song-link').href = data.now_playing.url;
+                            }
+                        } catch (err) {
+                            log(`Backend error: ${err.message}`, 'error');
+                        }
+                        
+                        resolve();
+                    };
+                });
+                
+                mediaRecorder.start();
+                setTimeout(() => mediaRecorder.stop(), 3500);
+                
+                await recordingPromise;
+            } catch (err) {
+                log(`Microphone error: ${err.message}`, 'error');
+                throw err;
+            }
+        }
+        
+        function showResult(data) {
+            if (data.mode) {
+                statusMode.textContent = `Mode: ${data.mode.toUpperCase()}`;
+            }
+            
+            if (data.now_playing) {
+                nowPlaying.style.display = 'block';
+                document.getElementById('song-title').textContent = data.now_playing.title;
+                document.getElementById('song-link').href = data.now_playing.url;
+            }
+        }
+        
+        async function recordAndStream() {
+            let stream;
+            try {
+                stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+            } catch (err) {
+                log(`Microphone error: ${err.message}`, 'error');
+                throw err;
+            }
+            
+            const { stream_id } = await (await fetch('/stream/start', { method: 'POST' })).json();
+            const mediaRecorder = new MediaRecorder(stream);
+            let uploads = Promise.resolve();
+            
+            // Upload each chunk as soon as the recorder emits it
+            mediaRecorder.ondataavailable = e => {
+                if (!e.data.size) return;
+                const chunk = e.data;
+                uploads = uploads
+                    .then(() => fetch(`/stream/${stream_id}/chunk`, { method: 'POST', body: chunk }))
+                    .then(r => r.json())
+                    .then(d => { if (d.partial) log(`👂 ...${d.partial}`, 'debug'); })
+                    .catch(err => log(`Chunk upload failed: ${err.message}`, 'error'));
+            };
+            
+            const stopped = new Promise(resolve => { mediaRecorder.onstop = resolve; });
+            mediaRecorder.start(CHUNK_MS);
+            setTimeout(() => mediaRecorder.stop(), 3500);
+            await stopped;
+            stream.getTracks().forEach(t => t.stop());
+            await uploads;
+            
+            if (isSpeaking) return;
+            
+            let playback = Promise.resolve();
+            let aiMsg = null;
+            
+            try {
+                const response = await fetch(`/stream/${stream_id}/finish`, { method: 'POST' });
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
+                
+                while (true) {
+                    const { value, done } = await reader.read();
+                    if (done) break;
+                    buffer += decoder.decode(value, { stream: true });
+                    
+                    const lines = buffer.split('\\n');
+                    buffer = lines.pop();
+                    
+                    for (const line of lines) {
+                        if (!line.trim()) continue;
+                        const event = JSON.parse(line);
+                        
+                        if (event.type === 'transcript') {
+                            log(`👂 Heard: "${event.text}"`, 'info');
+                            if (event.text !== '(unclear audio)') {
+                                addChat('user', event.text);
+                            }
+                        } else if (event.type === 'text') {
+                            if (!aiMsg) {
+                                addChat('ai', '');
+                                aiMsg = chatBox.lastElementChild;
+                            }
+                            // Plain text: deltas can split tags/entities and aren't trusted HTML
+                            aiMsg.appendChild(document.createTextNode(event.delta));
+                            chatBox.scrollTop = chatBox.scrollHeight;
+                        } else if (event.type === 'audio') {
+                            // Sentences arrive in order; play them back to back
+                            playback = playback.then(() => playAudio(event.url));
+                        } else if (event.type === 'done') {
+                            if (event.reply) {
+                                log(`🤖 Reply: "${event.reply.substring(0, 50)}..."`, 'info');
+                            }
+                            showResult(event);
+                        } else if (event.type === 'error') {
+                            log(`Backend error: ${event.error}`, 'error');
+                        }
+                    }
+                }
+            } catch (err) {
+                log(`Backend error: ${err.message}`, 'error');
+            }
+            
+            await playback;
+        }
+        
+        function playAudio(url) {
+            return new Promise((resolve) => {
+                isSpeaking = true;
+                visualizer.classList.remove('listening');
+                log('🔊 Playing TTS (Mic Paused)', 'warn');
+                
+                const audio = new Audio(url);
+                
+                audio.onended = () => {
+                    isSpeaking = false;
+                    if (isListening) {
+                        visualizer.classList.add('listening');
+                    }
+                    log('✅ TTS finished (Mic Resumed)', 'info');
+                    resolve();
+                };
+                
+                audio.onerror = (err) => {
+                    log(`Audio error: ${err}`, 'error');
+                    isSpeaking = false;
+                    resolve();
+                };
+                
+                audio.play().catch(e => {
+                    log(`Playback failed: ${e}`, 'error');
+                    isSpeaking = false;
+                    resolve();
+                });
+            });
+        }
+        
+        btnListen.addEventListener('click', startListening);
+        btnStop.addEventListener('click', stopListening);
+        
+        log('✅ Frontend initialized. Say "Hanuman" to wake! (Fuzzy matching enabled)', 'info');
+    </script>
+</body>
+</html>
+"""
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == '__main__':
+    logger.info("""
+    ╔════════════════════════════════════════════════════════════════════════════════╗
+    ║             🔱 PROJECT HANUMAN - DIVINE VOICE ASSISTANT 🔱                   ║
+    ║                                                                                ║
+    ║  Starting server on http://localhost:5000                                     ║
+    ║                                                                                ║
+    ║  ✨ NEW: FUZZY COMMAND MATCHING for ALL commands!                             ║
+    ║  Try mishearings like: "agya", "hassya", "khoj mode", "rok", etc.           ║
+    ║                                                                                ║
+    ║  Commands:                                                                    ║
+    ║  - Say "Hanuman" to wake up                                                  ║
+    ║  - Choose: Aagya, Hasya, Yudha, Gandharva, or Khoj                           ║
+    ║  - Say "Help" for detailed guide                                             ║
+    ║  - Say "Exit" to return to main menu                                         ║
+    ║                                                                                ║
+    ║  Jai Shri Ram! 🙏                                                             ║
+    ╚════════════════════════════════════════════════════════════════════════════════╝
+    """)
+    
+    if CONFIG.TTS_PRERENDER != 'none':
+        tts_engine.prerender_in_background(prerender_clips)
+    
+    try:
+        logger.info(f"Starting Flask server on {CONFIG.FLASK_HOST}:{CONFIG.FLASK_PORT}")
+        app.run(
+            host=CONFIG.FLASK_HOST,
+            port=CONFIG.FLASK_PORT,
+            debug=CONFIG.DEBUG,
+            use_reloader=False
+        )
+    except KeyboardInterrupt:
+        logger.info("\n🙏 Hanuman returns to meditation. Jai Shri Ram!")
+        sys.exit(0)
+    except Exception as e:
+        logger.error(f"Fatal error: {e}")
+        sys.exit(1)
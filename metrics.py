@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+📈 METRICS
+==========
+Minimal in-process metrics for the voice pipeline, exported in the
+Prometheus text format (no client library needed).
+
+- Counter and Histogram with labels, cheap enough for the hot path
+  (one lock and a bisect per observation).
+- stage(name) times a pipeline stage, usable as a `with` block or a
+  decorator; timed_iter(name) does the same for generators, counting only
+  the time spent producing items. Inside a request_timings() scope the
+  time is added to that request's breakdown, and the scope records each
+  stage's total for the request once, on exit. Outside a scope
+  (background summaries) every call is recorded directly as
+  "<stage>_background", so the per-request series aren't skewed.
+- Pool threads don't inherit the scope; carry_timings(fn) binds it.
+"""
+
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; spans a cached fuzzy match to a slow TTS render
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Sequence[str], values: Tuple, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return self._header(self.name)
+
+    def _header(self, name: str) -> List[str]:
+        return [f'# HELP {name} {self.documentation}', f'# TYPE {name} {self.kind}']
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        # Text format 0.0.4: HELP/TYPE must name the _total series, as client_python does
+        lines = self._header(f'{self.name}_total')
+        for key, value in values:
+            lines.append(f'{self.name}_total{_labels(self.labelnames, key)} {_number(value)}')
+        return lines
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, List] = {}  # key -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        lines = super().render()
+        for key, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), values[:-1]):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{_number(bound)}"'
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, key)} {_number(values[-1])}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, key)} {cumulative}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(line for metric in metrics for line in metric.render()) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'hanuman_stage_seconds',
+    'Time per pipeline stage, summed per request (process includes match and llm); '
+    '*_background stages are single calls made outside a request',
+    ['stage']
+)
+
+
+# ============================================================================
+# PER-REQUEST BREAKDOWN
+# ============================================================================
+
+class RequestTimings:
+    """Stage totals and notes (which engine/model answered, retries) for one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.notes: Dict[str, Any] = {}
+        self._lock = threading.Lock()  # streamed turns render TTS on pool threads
+
+    def add(self, stage_name: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage_name] = self.stages.get(stage_name, 0.0) + seconds
+
+    def note(self, notes: Dict[str, Any]) -> None:
+        with self._lock:
+            self.notes.update(notes)
+
+    def note_add(self, amounts: Dict[str, float]) -> None:
+        with self._lock:
+            for key, amount in amounts.items():
+                self.notes[key] = self.notes.get(key, 0) + amount
+
+    def breakdown(self) -> Dict[str, Any]:
+        with self._lock:
+            result: Dict[str, Any] = {f'{name}_ms': round(s * 1000, 1) for name, s in self.stages.items()}
+            result['total_ms'] = round((time.perf_counter() - self.started) * 1000, 1)
+            result.update(self.notes)
+        return result
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar('hanuman_request_timings', default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextmanager
+def request_timings() -> Iterator[RequestTimings]:
+    """Collect stage times for one request; each stage is recorded once, on exit"""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+        with timings._lock:
+            stages = list(timings.stages.items())
+        for stage_name, seconds in stages:
+            STAGE_SECONDS.observe(seconds, stage=stage_name)
+        STAGE_SECONDS.observe(time.perf_counter() - timings.started, stage='total')
+
+
+def timed_request(view):
+    """Decorator: run a Flask view inside request_timings()"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with request_timings():
+            return view(*args, **kwargs)
+    return wrapper
+
+
+def carry_timings(fn: Callable) -> Callable:
+    """fn bound to the caller's request_timings() scope, for running on a pool thread"""
+    timings = _current.get()
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _current.set(timings)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return wrapper
+
+
+def _record(name: str, elapsed: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, elapsed)
+    else:
+        STAGE_SECONDS.observe(elapsed, stage=f'{name}_background')
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a pipeline stage (also works as a decorator)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - started)
+
+
+def timed_iter(name: str) -> Callable:
+    """
+    Decorator for generator functions: times a stage as the time spent
+    producing items, not the time the consumer holds on to them.
+    Recorded once, when the generator finishes or is closed.
+    """
+    def decorator(fn: Callable[..., Iterable]) -> Callable[..., Iterator]:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            iterator = iter(fn(*args, **kwargs))
+            elapsed = 0.0
+            try:
+                while True:
+                    started = time.perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed += time.perf_counter() - started
+                    yield item
+            finally:
+                close = getattr(iterator, 'close', None)
+                if close:
+                    close()  # so the generator's own cleanup runs now
+                _record(name, elapsed)
+        return wrapper
+    return decorator
+
+
+def note(**notes) -> None:
+    """Attach facts (engine that answered, model used...) to the current request"""
+    timings = _current.get()
+    if timings is not None:
+        timings.note(notes)
+
+
+def note_add(**amounts) -> None:
+    """Add to numeric notes of the current request (retries, backoff ms...)"""
+    timings = _current.get()
+    if timings is not None:
+        timings.note_add(amounts)
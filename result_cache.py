@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+🗄️ RESULT CACHE
+===============
+TTL + LRU cache for slow upstream lookups whose answers are shared by
+everyone (web search results, their LLM summaries, YouTube lookups).
+
+- Queries are normalised (case, punctuation, a leading command phrase,
+  spacing), so "Khoj: Hanuman Chalisa!" and "hanuman chalisa" share one
+  entry, while "information theory" and "theory" stay apart.
+- An in-memory LRU tier in front of a sqlite3 tier that survives
+  restarts and is shared by worker processes on the same host.
+- Concurrent misses for the same key share one upstream call.
+- Values must be JSON-serialisable; None is never cached.
+"""
+
+import re
+import json
+import time
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w\s']+")
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_query(text: str, prefixes: Iterable[str] = ()) -> str:
+    """
+    Cache key for a spoken query: lowercase, no punctuation, single spaces,
+    with leading command phrases (e.g. "khoj mode", "search for") removed.
+    Only the start of the query is stripped - the same words later on are
+    part of what is being asked. Falls back to the unstripped text if
+    nothing else is left.
+    """
+    text = _SPACES.sub(' ', _PUNCTUATION.sub(' ', text.lower())).strip()
+    phrases = sorted({p.lower() for p in prefixes if p}, key=len, reverse=True)
+    if not phrases:
+        return text
+
+    pattern = r'^(?:(?:' + '|'.join(re.escape(p) for p in phrases) + r')\b\s*)+'
+    return re.sub(pattern, '', text) or text
+
+
+class ResultCache:
+    """One named cache: memory LRU with TTL, optionally backed by sqlite"""
+
+    def __init__(self, name: str, ttl: float = 3600, max_entries: int = 512,
+                 db_path: Optional[str] = None, max_disk_entries: int = 10000,
+                 clock: Callable[[], float] = time.time):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._memory: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()  # key -> (expires, value)
+        self.flight = SingleFlight()
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._puts = 0
+        if db_path:
+            self._open(db_path)
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._miss_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def _open(self, db_path: str) -> None:
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=5)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                ' cache TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,'
+                ' expires REAL NOT NULL, PRIMARY KEY (cache, key))'
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache '{self.name}': disk tier disabled ({e})")
+            self._db = None
+
+    # ---- tiers ----------------------------------------------------------
+
+    def _memory_get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self.clock():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return entry[1]
+
+    def _memory_put(self, key: str, value: Any, expires: float) -> None:
+        with self._lock:
+            self._memory[key] = (expires, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, Any]]:
+        if not self._db:
+            return None
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    'SELECT value, expires FROM results WHERE cache = ? AND key = ? AND expires > ?',
+                    (self.name, key, self.clock())
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache '{self.name}' read failed: {e}")
+            return None
+        return (row[1], json.loads(row[0])) if row else None
+
+    def _disk_put(self, key: str, value: Any, expires: float) -> None:
+        if not self._db:
+            return
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO results (cache, key, value, expires) VALUES (?, ?, ?, ?)',
+                    (self.name, key, json.dumps(value), expires)
+                )
+                self._puts += 1
+                if self._puts % 100 == 0:
+                    self._prune()
+                self._db.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Result cache '{self.name}' write failed: {e}")
+
+    def _prune(self) -> None:
+        """Drop expired rows, then the soonest-to-expire beyond max_disk_entries"""
+        self._db.execute('DELETE FROM results WHERE cache = ? AND expires <= ?', (self.name, self.clock()))
+        self._db.execute(
+            'DELETE FROM results WHERE cache = ? AND key NOT IN '
+            '(SELECT key FROM results WHERE cache = ? ORDER BY expires DESC LIMIT ?)',
+            (self.name, self.name, self.max_disk_entries)
+        )
+
+    # ---- public ---------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value (memory, then disk) without counting or computing"""
+        value = self._memory_get(key)
+        if value is not None:
+            return value
+        entry = self._disk_get(key)
+        if entry is None:
+            return None
+        self._memory_put(key, entry[1], entry[0])
+        return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        expires = self.clock() + self.ttl
+        self._memory_put(key, value, expires)
+        self._disk_put(key, value, expires)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any],
+                       cacheable: Callable[[Any], bool] = lambda value: True) -> Any:
+        """
+        Cached value for key, or compute() it once for all concurrent callers.
+        Results that are None or fail cacheable() are returned but not stored.
+        """
+        value = self._memory_get(key)
+        if value is not None:
+            self._count_hit(disk=False)
+            return value
+
+        entry = self._disk_get(key)
+        if entry is not None:
+            self._memory_put(key, entry[1], entry[0])
+            self._count_hit(disk=True)
+            return entry[1]
+
+        def miss():
+            started = time.monotonic()
+            value = compute()
+            with self._lock:
+                self.misses += 1
+                self._miss_seconds += time.monotonic() - started
+            if value is not None and cacheable(value):
+                self.put(key, value)
+            return value
+
+        return self.flight.do(key, miss)
+
+    def _count_hit(self, disk: bool) -> None:
+        with self._lock:
+            self.hits += 1
+            self.disk_hits += disk
+            if self.misses:
+                self.saved_seconds += self._miss_seconds / self.misses
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.flight.coalesced
+            return {
+                'entries': len(self._memory),
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'coalesced': self.flight.coalesced,
+                'hit_rate': round((self.hits + self.flight.coalesced) / lookups, 3) if lookups else None,
+                'avg_miss_ms': round(self._miss_seconds / self.misses * 1000) if self.misses else None,
+                'saved_seconds': round(self.saved_seconds, 1)
+            }
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+🗂️ SESSION STORE
+================
+Bounded, in-process store for per-browser HANUMAN state.
+
+Sessions are spread across independently locked shards so concurrent
+requests from different browsers never wait on one global lock. Each
+shard keeps its sessions in least-recently-used order, which makes both
+capacity eviction and idle-TTL eviction cheap pops from the front.
+Idle sessions are dropped when their shard next creates a session, and
+by maybe_sweep() at most every sweep_interval seconds for quiet shards.
+"""
+
+import re
+import time
+import secrets
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{16,64}$')
+
+
+class _Entry:
+    """One stored session: its state, its lock and when it was last touched."""
+
+    __slots__ = ('state', 'lock', 'last_seen')
+
+    def __init__(self, state: Any, now: float):
+        self.state = state
+        self.lock = threading.Lock()
+        self.last_seen = now
+
+
+class _Shard:
+    """A slice of the session table with its own lock and LRU order."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+
+
+class SessionStore:
+    """Sharded LRU + idle-TTL session table."""
+
+    def __init__(self, factory: Callable[[], Any], max_sessions: int = 1000,
+                 idle_ttl: float = 1800.0, shards: int = 16,
+                 sweep_interval: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+
+        shards = max(1, min(shards, max_sessions))
+        per_shard = -(-max_sessions // shards)  # ceil division
+
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self._shards = [_Shard(per_shard) for _ in range(shards)]
+        self._next_sweep = clock() + sweep_interval
+
+        self._stats_lock = threading.Lock()
+        self.created = 0
+        self.evicted_capacity = 0
+        self.evicted_idle = 0
+
+    @staticmethod
+    def new_session_id() -> str:
+        """Generate a fresh, URL-safe session id"""
+        return secrets.token_urlsafe(18)
+
+    @staticmethod
+    def is_valid_id(session_id: Optional[str]) -> bool:
+        """Only accept ids that look like ones we could have issued"""
+        return bool(session_id) and bool(SESSION_ID_PATTERN.match(session_id))
+
+    def _shard_for(self, session_id: str) -> _Shard:
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return self.idle_ttl > 0 and now - entry.last_seen > self.idle_ttl
+
+    def _evict_locked(self, shard: _Shard, now: float) -> None:
+        """Drop idle sessions from the LRU front, then enforce capacity"""
+        idle = 0
+        capacity = 0
+
+        while shard.entries:
+            oldest = next(iter(shard.entries.values()))
+            if not self._expired(oldest, now):
+                break
+            shard.entries.popitem(last=False)
+            idle += 1
+
+        while len(shard.entries) >= shard.capacity:
+            shard.entries.popitem(last=False)
+            capacity += 1
+
+        if idle or capacity:
+            with self._stats_lock:
+                self.evicted_idle += idle
+                self.evicted_capacity += capacity
+
+    def _acquire(self, session_id: Optional[str]) -> Tuple[str, _Entry]:
+        """Return (session_id, entry), creating a new session if needed"""
+        if not self.is_valid_id(session_id):
+            session_id = self.new_session_id()
+
+        shard = self._shard_for(session_id)
+        now = self.clock()
+
+        with shard.lock:
+            entry = shard.entries.get(session_id)
+            if entry is not None and self._expired(entry, now):
+                del shard.entries[session_id]
+                entry = None
+                with self._stats_lock:
+                    self.evicted_idle += 1
+
+            if entry is None:
+                self._evict_locked(shard, now)
+                entry = _Entry(self.factory(), now)
+                shard.entries[session_id] = entry
+                with self._stats_lock:
+                    self.created += 1
+            else:
+                entry.last_seen = now
+                shard.entries.move_to_end(session_id)
+
+        return session_id, entry
+
+    @contextmanager
+    def session(self, session_id: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Hold one session for the duration of a request.
+        Requests for the same session run one at a time; other sessions
+        are unaffected. Yields: (session_id, state)
+        """
+        session_id, entry = self._acquire(session_id)
+        with entry.lock:
+            yield session_id, entry.state
+
+    def get(self, session_id: Optional[str]) -> Optional[Any]:
+        """Peek at a live session's state without creating or touching it"""
+        if not self.is_valid_id(session_id):
+            return None
+
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            entry = shard.entries.get(session_id)
+            if entry is None or self._expired(entry, self.clock()):
+                return None
+            return entry.state
+
+    def sweep(self) -> int:
+        """Evict every idle session now; returns how many were dropped"""
+        dropped = 0
+        now = self.clock()
+
+        for shard in self._shards:
+            with shard.lock:
+                while shard.entries:
+                    oldest = next(iter(shard.entries.values()))
+                    if not self._expired(oldest, now):
+                        break
+                    shard.entries.popitem(last=False)
+                    dropped += 1
+
+        if dropped:
+            with self._stats_lock:
+                self.evicted_idle += dropped
+        return dropped
+
+    def maybe_sweep(self) -> int:
+        """sweep() if sweep_interval has passed since the last one (cheap to call per request)"""
+        now = self.clock()
+        with self._stats_lock:
+            if now < self._next_sweep:
+                return 0
+            self._next_sweep = now + self.sweep_interval
+        return self.sweep()
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for /status"""
+        return {
+            'active': len(self),
+            'capacity': self.max_sessions,
+            'idle_ttl_seconds': int(self.idle_ttl),
+            'created': self.created,
+            'evicted_capacity': self.evicted_capacity,
+            'evicted_idle': self.evicted_idle
+        }
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+🌊 STREAMING VOICE PIPELINE
+===========================
+Building blocks for the low-latency turn:
+
+1. Audio frames are uploaded while the user is still speaking, so the
+   clip is already on the server when they stop. A local model
+   re-transcribes the growing buffer in the background for early
+   display only; the final transcript is the caller's to make.
+2. The reply is consumed as a stream of text deltas.
+3. Finished sentences are sent to TTS right away, so the first sentence
+   can play while the rest of the reply is still being written.
+
+Nothing here knows about Flask, Groq or ElevenLabs - callers plug in
+their own transcribe / respond / synthesize callables.
+"""
+
+import re
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from session_store import SessionStore
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_END = re.compile(r'(?<=[.!?।])\s+|\n+')
+
+
+class SentenceChunker:
+    """
+    Split a stream of text deltas into speakable chunks.
+    The first chunk is cut at the first sentence end so playback starts
+    early; later chunks gather several sentences to keep TTS calls few.
+    """
+
+    def __init__(self, first_min_chars: int = 24, min_chars: int = 160):
+        self.later_min_chars = min_chars
+        self.min_chars = first_min_chars
+        self.buffer = ''
+
+    def feed(self, delta: str) -> List[str]:
+        """Add text, return any sentences that are now complete"""
+        self.buffer += delta
+        sentences = []
+
+        while True:
+            match = None
+            for candidate in SENTENCE_END.finditer(self.buffer):
+                # Merge very short fragments ("Jai!") into the next sentence
+                if candidate.start() >= self.min_chars:
+                    match = candidate
+                    break
+            if not match:
+                break
+            sentence = self.buffer[:match.start()].strip()
+            self.buffer = self.buffer[match.end():]
+            if sentence:
+                sentences.append(sentence)
+                self.min_chars = self.later_min_chars
+
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Whatever is left once the reply has ended"""
+        rest, self.buffer = self.buffer.strip(), ''
+        return rest or None
+
+
+class AudioStream:
+    """Audio frames of one utterance plus its running partial transcript"""
+
+    def __init__(self, now: float):
+        self.lock = threading.Lock()
+        self.chunks: List[bytes] = []
+        self.created = now
+        self.partial: Optional[str] = None
+        self.partial_chunks = 0  # how many chunks the partial transcript covers
+        self.partial_future: Optional[Future] = None
+
+    def append(self, chunk: bytes) -> int:
+        with self.lock:
+            self.chunks.append(chunk)
+            return len(self.chunks)
+
+    def snapshot(self) -> tuple:
+        """(audio bytes so far, number of chunks they contain)"""
+        with self.lock:
+            return b''.join(self.chunks), len(self.chunks)
+
+
+class StreamRegistry:
+    """Open upload streams, with an age limit for abandoned ones"""
+
+    def __init__(self, transcribe_partial: Optional[Callable[[bytes], Optional[str]]],
+                 executor: Executor, max_streams: int = 200, max_age: float = 60.0,
+                 partial_every: int = 2, clock: Callable[[], float] = time.monotonic):
+        self.transcribe_partial = transcribe_partial
+        self.executor = executor
+        self.max_streams = max_streams
+        self.max_age = max_age
+        self.partial_every = partial_every
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.streams: Dict[str, AudioStream] = {}
+
+    def open(self) -> str:
+        now = self.clock()
+        stream_id = SessionStore.new_session_id()
+
+        with self.lock:
+            for key in [k for k, s in self.streams.items() if now - s.created > self.max_age]:
+                del self.streams[key]
+            while len(self.streams) >= self.max_streams:
+                del self.streams[next(iter(self.streams))]
+            self.streams[stream_id] = AudioStream(now)
+
+        return stream_id
+
+    def get(self, stream_id: str) -> Optional[AudioStream]:
+        with self.lock:
+            return self.streams.get(stream_id)
+
+    def close(self, stream_id: str) -> Optional[AudioStream]:
+        with self.lock:
+            return self.streams.pop(stream_id, None)
+
+    def add_chunk(self, stream: AudioStream, chunk: bytes) -> None:
+        """Store a frame and kick off a background partial transcript if due"""
+        count = stream.append(chunk)
+        if not self.transcribe_partial or count % self.partial_every:
+            return
+        with stream.lock:
+            if stream.partial_future and not stream.partial_future.done():
+                return  # one partial decode at a time per stream
+            stream.partial_future = self.executor.submit(self._update_partial, stream)
+
+    def _update_partial(self, stream: AudioStream) -> None:
+        audio, count = stream.snapshot()
+        try:
+            text = self.transcribe_partial(audio)
+        except Exception as e:
+            logger.warning(f"Partial transcription failed: {e}")
+            return
+        with stream.lock:
+            if text and count >= stream.partial_chunks:
+                stream.partial = text
+                stream.partial_chunks = count
+
+
+def run_pipeline(transcribe: Callable[[], Optional[str]],
+                 respond: Callable[[str], Union[None, str, Iterator[str]]],
+                 synthesize: Callable[[str], Optional[str]],
+                 executor: Executor,
+                 chunker: Optional[SentenceChunker] = None) -> Iterator[Dict]:
+    """
+    Drive one streamed turn, yielding events as soon as they exist:
+      {'type': 'transcript', 'text': ...}
+      {'type': 'text', 'delta': ...}
+      {'type': 'audio', 'index': n, 'url': ...}
+      {'type': 'done', 'reply': ...}
+    respond() may return a whole string or an iterator of text deltas.
+    Audio events always come out in sentence order.
+    """
+    chunker = chunker or SentenceChunker()
+
+    transcription = transcribe()
+    if not transcription or len(transcription.strip()) < 2:
+        transcription = "(unclear audio)"
+    yield {'type': 'transcript', 'text': transcription}
+
+    reply = respond(transcription)
+    if reply is None:
+        yield {'type': 'done', 'reply': None}
+        return
+
+    deltas = iter([reply]) if isinstance(reply, str) else reply
+    pending: deque = deque()
+    parts: List[str] = []
+    index = 0
+
+    def ready_audio(block: bool) -> Iterator[Dict]:
+        nonlocal index
+        while pending and (block or pending[0].done()):
+            url = pending.popleft().result()
+            if url:
+                yield {'type': 'audio', 'index': index, 'url': url}
+                index += 1
+
+    for delta in deltas:
+        if not delta:
+            continue
+        parts.append(delta)
+        yield {'type': 'text', 'delta': delta}
+        for sentence in chunker.feed(delta):
+            pending.append(executor.submit(synthesize, sentence))
+        yield from ready_audio(block=False)
+
+    rest = chunker.flush()
+    if rest:
+        pending.append(executor.submit(synthesize, rest))
+    yield from ready_audio(block=True)
+
+    yield {'type': 'done', 'reply': ''.join(parts)}
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+🧠 LOCAL STT MODEL REGISTRY
+===========================
+Holds the single local speech model used as the STT fallback and for
+streaming partial transcripts.
+
+- Backend and size come from config (faster-whisper, whisper or none).
+- Nothing is imported or loaded until first use, unless asked to warm
+  up in the background or to preload before workers fork.
+- Preloading in the master process (e.g. gunicorn --preload) lets forked
+  workers share the read-only weights copy-on-write instead of each
+  loading their own copy.
+"""
+
+import io
+import time
+import logging
+import threading
+import importlib.util
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('faster-whisper', 'whisper', 'none')
+LOAD_MODES = ('lazy', 'background', 'preload')
+
+_BACKEND_MODULES = {
+    'faster-whisper': 'faster_whisper',
+    'whisper': 'whisper'
+}
+
+
+class ModelRegistry:
+    """Lazily loaded, process-wide local STT model"""
+
+    def __init__(self, backend: str = 'faster-whisper', size: str = 'base',
+                 compute_type: str = 'int8', cpu_threads: int = 0,
+                 device: str = 'cpu'):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown STT backend '{backend}', expected one of {BACKENDS}")
+
+        self.backend = backend
+        self.size = size
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.device = device
+
+        self._lock = threading.Lock()
+        self._model = None
+        self._failed = False
+        self._warm_thread: Optional[threading.Thread] = None
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def available(self) -> bool:
+        """Is the configured backend installed at all?"""
+        module = _BACKEND_MODULES.get(self.backend)
+        return bool(module) and importlib.util.find_spec(module) is not None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def accepts_bytes(self) -> bool:
+        """Can the backend decode an in-memory recording (needed for streaming)?"""
+        return self.backend == 'faster-whisper' and self.available
+
+    def _load(self) -> Any:
+        if self.backend == 'faster-whisper':
+            from faster_whisper import WhisperModel
+            return WhisperModel(
+                self.size,
+                device=self.device,
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads
+            )
+
+        import whisper
+        return whisper.load_model(self.size, device=self.device)
+
+    def get(self) -> Optional[Any]:
+        """The model, loading it on first use. None if unavailable."""
+        if self._model is not None or self._failed:
+            return self._model
+
+        with self._lock:
+            if self._model is not None or self._failed:
+                return self._model
+
+            if not self.available:
+                self._failed = True
+                return None
+
+            try:
+                logger.info(f"Loading {self.backend} ({self.size}, {self.compute_type})...")
+                started = time.monotonic()
+                self._model = self._load()
+                self.load_seconds = time.monotonic() - started
+                logger.info(f"✅ {self.backend} loaded in {self.load_seconds:.1f}s")
+            except Exception as e:
+                logger.warning(f"{self.backend} load failed: {e}")
+                self._failed = True
+
+        return self._model
+
+    def warm_up(self) -> None:
+        """Load in a background thread (once) so the first request doesn't pay for it"""
+        with self._lock:
+            if self._warm_thread or self._model is not None or self.backend == 'none':
+                return
+            self._warm_thread = threading.Thread(
+                target=self.get, name='stt-warmup', daemon=True
+            )
+            self._warm_thread.start()
+
+    def transcribe(self, audio: Union[str, bytes], language: str = 'en',
+                   beam_size: int = 5) -> Optional[str]:
+        """Transcribe a file path, or raw bytes when the backend supports it"""
+        model = self.get()
+        if model is None:
+            return None
+
+        if self.backend == 'faster-whisper':
+            source = io.BytesIO(audio) if isinstance(audio, bytes) else audio
+            segments, _ = model.transcribe(source, language=language, beam_size=beam_size)
+            return ' '.join(segment.text.strip() for segment in segments).strip()
+
+        if isinstance(audio, bytes):
+            return None  # openai-whisper needs a file on disk
+        return model.transcribe(audio, language=language).get('text', '').strip()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'backend': self.backend,
+            'size': self.size,
+            'compute_type': self.compute_type,
+            'cpu_threads': self.cpu_threads,
+            'loaded': self.loaded,
+            'load_seconds': round(self.load_seconds, 2) if self.load_seconds else None
+        }
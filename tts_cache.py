@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+🔊 TTS AUDIO CACHE
+==================
+Content-addressed store for synthesized speech.
+
+- A clip's file name is the SHA-256 of (voice, model, text), so the same
+  reply in the same voice is only ever synthesized once.
+- Clips live in one dedicated directory under a byte budget; the least
+  recently used ones are deleted when it is exceeded. The index is
+  rebuilt from the directory on startup, so the cache survives restarts.
+- Concurrent requests for the same clip share one render (single-flight).
+"""
+
+import os
+import re
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+CLIP_NAME = re.compile(r'^([0-9a-f]{64})\.mp3$')
+
+
+class TTSCache:
+    """Byte-budgeted LRU directory of synthesized clips"""
+
+    def __init__(self, directory: str, max_bytes: int = 200 * 1024 * 1024):
+        self.directory = Path(directory).resolve()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._index: 'OrderedDict[str, int]' = OrderedDict()  # key -> size, oldest first
+        self._bytes = 0
+        self.flight = SingleFlight()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load()
+
+    @staticmethod
+    def key(text: str, voice_id: str, model_id: str) -> str:
+        """Content address of one clip"""
+        digest = hashlib.sha256()
+        for part in (voice_id, model_id, text):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f'{key}.mp3'
+
+    def _load(self) -> None:
+        """Rebuild the index from a previous run, oldest access first"""
+        clips = []
+        for entry in os.scandir(self.directory):
+            match = CLIP_NAME.match(entry.name)
+            if match and entry.is_file():
+                stat = entry.stat()
+                clips.append((stat.st_mtime, match.group(1), stat.st_size))
+
+        for _, key, size in sorted(clips):
+            self._index[key] = size
+            self._bytes += size
+        if clips:
+            logger.info(f"🔊 TTS cache: {len(clips)} clips ({self._bytes / 1e6:.1f} MB) in {self.directory}")
+        self._evict()
+
+    def _touch(self, key: str) -> Optional[Path]:
+        """Mark key as recently used; None if it isn't cached"""
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+
+        path = self.path(key)
+        try:
+            os.utime(path)  # keeps LRU order across restarts
+        except FileNotFoundError:
+            with self._lock:
+                self._bytes -= self._index.pop(key, 0)
+            return None
+        return path
+
+    def get(self, key: str) -> Optional[Path]:
+        """Cached clip for key, counted as a hit or a miss"""
+        path = self._touch(key)
+        with self._lock:
+            if path:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return path
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._index
+
+    def file(self, filename: str) -> Optional[Path]:
+        """Cached clip by file name (as served under /audio/)"""
+        match = CLIP_NAME.match(filename)
+        return self._touch(match.group(1)) if match else None
+
+    def put(self, key: str, audio: bytes) -> Path:
+        """Store a clip atomically and evict down to the byte budget"""
+        path = self.path(key)
+        tmp = path.with_name(f'.{path.name}.{threading.get_ident()}.tmp')
+        tmp.write_bytes(audio)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._bytes -= self._index.pop(key, 0)
+            self._index[key] = len(audio)
+            self._bytes += len(audio)
+        self._evict()
+        return path
+
+    def _evict(self) -> None:
+        victims = []
+        with self._lock:
+            # The newest clip always stays, even if it alone exceeds the budget
+            while self._bytes > self.max_bytes and len(self._index) > 1:
+                key, size = self._index.popitem(last=False)
+                self._bytes -= size
+                self.evictions += 1
+                victims.append(key)
+
+        for key in victims:
+            try:
+                self.path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def get_or_create(self, key: str, render: Callable[[], Optional[Path]]) -> Optional[Path]:
+        """
+        Cached clip for key, or render() it. render must put() the clip
+        itself and return its path (or None on failure). Concurrent misses
+        for the same key wait for one render.
+        """
+        path = self.get(key)
+        if path:
+            return path
+        return self.flight.do(key, lambda: self._touch(key) or render())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'clips': len(self._index),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.flight.coalesced,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None
+            }